@@ -3,6 +3,7 @@ from flask import Flask
 from flask_cors import CORS
 from modules.routes.chat import chat_bp
 from modules.routes.session import session_bp
+from modules.routes.db import db_bp
 
 app = Flask(__name__)
 CORS(app, supports_credentials=True)
@@ -20,6 +21,7 @@ app.config["PORT"] = int(os.getenv("PORT", 30000))
 # 블루프린트 등록
 app.register_blueprint(chat_bp)
 app.register_blueprint(session_bp)
+app.register_blueprint(db_bp)
 
 if __name__ == "__main__":
     if not app.config["OPENAI_API_KEY"]:
@@ -1,33 +1,31 @@
 import pandas as pd
-from typing import Optional, List
-from modules.algo.core import ValueBasedAlgo
+from typing import Literal, Dict, Any
+from modules.algo.core import IndicatorAlgo
 
 
-class MovingAverage(ValueBasedAlgo):
+class MovingAverage(IndicatorAlgo):
 
     def __init__(
         self,
-        train_start_date: str,
-        train_end_date: str,
-        valid_start_date: str,
-        valid_end_date: str,
-        indicator_type: str = "ma",
+        window: int = 20,
+        method: Literal["sma", "ema"] = "sma",
         **kwargs
     ):
-        super().__init__(
-            train_start_date,
-            train_end_date,
-            valid_start_date,
-            valid_end_date,
-            indicator_type,
-            **kwargs
-        )
+        """
+        이동평균 대비 현재 가격의 괴리율 (price / MA - 1) 로 점수 계산
+        :param window: 이동평균 기간
+        :param method: sma (단순) 또는 ema (지수)
+        """
+        if method not in ("sma", "ema"):
+            raise ValueError(f"Invalid method: {method}")
+        super().__init__(indicator_type=method, window=window, **kwargs)
+        self.window = window
+        self.method = method
 
-    def prepare_data(self, data: pd.DataFrame) -> pd.DataFrame:
-        pass
+    def indicator_params(self) -> Dict[str, Any]:
+        if self.method == "ema":
+            return {"span": self.window}
+        return {"window": self.window}
 
-    def calculate_values(self, data: pd.DataFrame) -> pd.DataFrame:
-        pass
-
-    def select_stocks(self, calculated_values: pd.DataFrame) -> List[str]:
-        pass
+    def score(self, data: pd.DataFrame, indicator: pd.DataFrame) -> pd.DataFrame:
+        return data / indicator - 1
@@ -0,0 +1,176 @@
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+import pandas as pd
+from modules.data.dtypes import memory_mb
+from modules.fingerprint import fingerprint_frame, fingerprint_params
+from modules.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class IndicatorCache:
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls) -> "IndicatorCache":
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    @classmethod
+    def configure(cls, **kwargs) -> "IndicatorCache":
+        """전역 캐시를 새 설정으로 교체합니다. (ex: disk_path 지정)"""
+        with cls._instance_lock:
+            cls._instance = cls(**kwargs)
+            return cls._instance
+
+    def __init__(
+        self,
+        max_memory_mb: float = 512,
+        disk_path: Optional[str] = None,
+        max_disk_mb: float = 4096,
+    ):
+        """
+        지표 계산 결과 캐시. 메모리(LRU) -> 디스크(LRU) 2단계로 동작합니다.
+        키는 (지표 이름, 파라미터, 데이터 fingerprint, 기간) 입니다.
+        :param max_memory_mb: 메모리 캐시 최대 크기
+        :param disk_path: 디스크 캐시 경로. None 이면 메모리 캐시만 사용
+        :param max_disk_mb: 디스크 캐시 최대 크기
+        """
+        self.max_memory_mb = max_memory_mb
+        self.disk_path = disk_path
+        self.max_disk_mb = max_disk_mb
+
+        self._memory: "OrderedDict[str, Any]" = OrderedDict()
+        self._sizes: Dict[str, float] = {}
+        self._memory_size = 0.0
+        self._lock = threading.RLock()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+
+        if disk_path:
+            os.makedirs(disk_path, exist_ok=True)
+
+    @staticmethod
+    def make_key(indicator: str, params: Dict[str, Any], data: pd.DataFrame) -> str:
+        date_range = (
+            [str(data.index[0]), str(data.index[-1])] if len(data.index) else [None, None]
+        )
+        return fingerprint_params([indicator, params, fingerprint_frame(data), date_range])
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return self._memory[key]
+
+        value = self._read_disk(key)
+        if value is not None:
+            with self._lock:
+                self.stats["disk_hits"] += 1
+            self._put_memory(key, value)
+            return value
+
+        with self._lock:
+            self.stats["misses"] += 1
+        return None
+
+    def put(self, key: str, value: Any):
+        self._put_memory(key, value)
+        self._write_disk(key, value)
+
+    def get_or_compute(
+        self,
+        indicator: str,
+        params: Dict[str, Any],
+        data: pd.DataFrame,
+        compute: Callable[[], Any],
+    ) -> Any:
+        key = self.make_key(indicator, params, data)
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._sizes.clear()
+            self._memory_size = 0.0
+
+    def _size_mb(self, value: Any) -> float:
+        if isinstance(value, (pd.DataFrame, pd.Series)):
+            return memory_mb(value)
+        return 0.0
+
+    def _put_memory(self, key: str, value: Any):
+        size = self._size_mb(value)
+        if size > self.max_memory_mb:
+            return
+        with self._lock:
+            if key in self._memory:
+                self._memory_size -= self._sizes[key]
+            self._memory[key] = value
+            self._memory.move_to_end(key)
+            self._sizes[key] = size
+            self._memory_size += size
+            while self._memory_size > self.max_memory_mb and self._memory:
+                evicted, _ = self._memory.popitem(last=False)
+                self._memory_size -= self._sizes.pop(evicted)
+                logger.debug(f"Evicted indicator cache entry from memory: {evicted}")
+
+    def _disk_file(self, key: str) -> str:
+        return os.path.join(self.disk_path, f"{key}.pkl")
+
+    def _read_disk(self, key: str) -> Optional[Any]:
+        if not self.disk_path or not os.path.exists(self._disk_file(key)):
+            return None
+        try:
+            with open(self._disk_file(key), "rb") as file:
+                value = pickle.load(file)
+            os.utime(self._disk_file(key))  # LRU 순서 갱신
+            return value
+        except (OSError, pickle.PickleError, EOFError) as e:
+            logger.warning(f"Failed to read indicator cache {key}: {e}")
+            return None
+
+    def _write_disk(self, key: str, value: Any):
+        if not self.disk_path:
+            return
+        file_path = self._disk_file(key)
+        tmp_path = f"{file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as file:
+                pickle.dump(value, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, file_path)
+        except OSError as e:
+            logger.warning(f"Failed to write indicator cache {key}: {e}")
+            return
+        self._evict_disk()
+
+    def _evict_disk(self):
+        entries = []
+        for file in os.listdir(self.disk_path):
+            if file.endswith(".pkl"):
+                path = os.path.join(self.disk_path, file)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        total_mb = sum(size for _, size, _ in entries) / 1024 ** 2
+        for _, size, path in sorted(entries):
+            if total_mb <= self.max_disk_mb:
+                break
+            try:
+                os.remove(path)
+                total_mb -= size / 1024 ** 2
+            except FileNotFoundError:
+                continue
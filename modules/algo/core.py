@@ -1,13 +1,34 @@
 from abc import ABC, abstractmethod
 import pandas as pd
 from typing import Dict
-from typing import Any
+from typing import Any, Callable
+from modules.algo.cache import IndicatorCache
+from modules.algo.indicators import compute_indicator
 
 
 class ValueBasedAlgo(ABC):
     def __init__(self, indicator_type: str, **kwargs):
         self.indicator_type = indicator_type
         self.params = kwargs
+        self.use_cache = True  # 지표 결과 캐시(IndicatorCache) 사용 여부
+
+    def cached(
+        self,
+        name: str,
+        params: Dict[str, Any],
+        data: pd.DataFrame,
+        compute: Callable[[], pd.DataFrame],
+    ) -> pd.DataFrame:
+        """
+        (지표 이름, 파라미터, 데이터) 가 같으면 전역 IndicatorCache 의 결과를 재사용합니다.
+        :param name: 지표 이름
+        :param params: 지표 파라미터
+        :param data: 입력 데이터
+        :param compute: 캐시에 없을 때 실행할 계산 함수
+        """
+        if not self.use_cache:
+            return compute()
+        return IndicatorCache.get_instance().get_or_compute(name, params, data, compute)
 
     @abstractmethod
     def prepare_data(self, data: pd.DataFrame) -> pd.DataFrame:
@@ -52,3 +73,43 @@ class ValueBasedAlgo(ABC):
         """
         prepared_data = self.prepare_data(data)
         return self.calculate_values(prepared_data)
+
+
+class IndicatorAlgo(ValueBasedAlgo):
+    """
+    벡터화 지표 엔진(modules.algo.indicators) 기반 알고리즘.
+    서브클래스는 indicator_params 와 score 만 정의하면 (date x symbol) 행렬 전체를
+    NumPy 로 한 번에 계산합니다.
+    """
+
+    def indicator_params(self) -> Dict[str, Any]:
+        return dict(self.params)
+
+    def score(self, data: pd.DataFrame, indicator: pd.DataFrame) -> pd.DataFrame:
+        """
+        지표 값으로 종목 점수 계산 (높을수록 선호). 기본은 지표 값 그대로 사용
+        :param data: 가격 데이터
+        :param indicator: 지표 값
+        """
+        return indicator
+
+    def prepare_data(self, data: pd.DataFrame) -> pd.DataFrame:
+        params = self.indicator_params()
+        indicator = self.cached(
+            self.indicator_type,
+            params,
+            data,
+            lambda: compute_indicator(self.indicator_type, data, **params),
+        )
+        return self.score(data, indicator)
+
+    def calculate_values(self, data: pd.DataFrame) -> pd.Series:
+        # 마지막 날짜의 점수
+        return data.iloc[-1] if not data.empty else pd.Series(dtype=float)
+
+    def rolling_values(self, data: pd.DataFrame, train_length: int) -> pd.DataFrame:
+        """
+        모든 날짜의 점수 행렬. 지표의 계산 구간이 train_length 이하이면
+        각 행은 해당 날짜로 끝나는 학습 구간의 calculate_values 결과와 같습니다.
+        """
+        return self.prepare_data(data)
@@ -0,0 +1,240 @@
+import numpy as np
+import pandas as pd
+from typing import Callable, Dict, Optional, Tuple, Union
+from modules.data.dtypes import preserve_dtypes
+
+TRADING_DAYS = 252
+
+# (date x symbol) 행렬 단위의 벡터화 지표 계산 함수 모음.
+# 모든 함수는 (T x N) 행렬을 받아 같은 모양의 float64 ndarray 를 반환하며 NaN 을 허용합니다.
+ArrayLike = Union[np.ndarray, pd.DataFrame]
+
+
+def _as_2d(values: ArrayLike) -> np.ndarray:
+    values = np.asarray(values, dtype=np.float64)
+    return values[:, None] if values.ndim == 1 else values
+
+
+def _window_sum(a: np.ndarray, window: int) -> np.ndarray:
+    """각 시점으로 끝나는 window 행 합계. 앞쪽 window-1 행은 NaN"""
+    c = np.zeros((a.shape[0] + 1, a.shape[1]))
+    np.cumsum(a, axis=0, out=c[1:])
+    out = np.full(a.shape, np.nan)
+    if a.shape[0] >= window:
+        out[window - 1:] = c[window:] - c[:-window]
+    return out
+
+
+def sma(values: ArrayLike, window: int, min_periods: Optional[int] = None) -> np.ndarray:
+    """
+    단순 이동평균. 구간 내 관측 수가 min_periods (기본: window) 미만이면 NaN
+    """
+    values = _as_2d(values)
+    min_periods = window if min_periods is None else min_periods
+    mask = ~np.isnan(values)
+    with np.errstate(invalid="ignore"):
+        center = np.nanmean(values, axis=0) if mask.any() else 0.0
+    count = _window_sum(mask.astype(np.float64), window)
+    total = _window_sum(np.where(mask, values - center, 0.0), window)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        out = total / count + center
+    out[~(count >= min_periods)] = np.nan
+    return out
+
+
+def ema(values: ArrayLike, span: Optional[int] = None, alpha: Optional[float] = None) -> np.ndarray:
+    """
+    지수 이동평균 (pandas ewm(adjust=False, ignore_na=True) 와 같은 재귀식).
+    시간 방향으로만 반복하고 종목 방향은 벡터 연산합니다. NaN 은 직전 값을 유지합니다.
+    """
+    if alpha is None:
+        if span is None:
+            raise ValueError("Either span or alpha must be given")
+        alpha = 2.0 / (span + 1.0)
+    values = _as_2d(values)
+    out = np.full(values.shape, np.nan)
+    prev = np.full(values.shape[1], np.nan)
+    for t in range(values.shape[0]):
+        row = values[t]
+        prev = np.where(
+            np.isnan(row), prev, np.where(np.isnan(prev), row, alpha * row + (1 - alpha) * prev)
+        )
+        out[t] = prev
+    return out
+
+
+def rate_of_change(values: ArrayLike, period: int) -> np.ndarray:
+    """period 행 전 대비 변화율"""
+    values = _as_2d(values)
+    out = np.full(values.shape, np.nan)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        out[period:] = values[period:] / values[:-period] - 1
+    return out
+
+
+def rsi(values: ArrayLike, window: int = 14) -> np.ndarray:
+    """Wilder 방식 RSI (0~100)"""
+    values = _as_2d(values)
+    diff = np.full(values.shape, np.nan)
+    diff[1:] = values[1:] - values[:-1]
+    gain = ema(np.where(diff > 0, diff, np.where(np.isnan(diff), np.nan, 0.0)), alpha=1.0 / window)
+    loss = ema(np.where(diff < 0, -diff, np.where(np.isnan(diff), np.nan, 0.0)), alpha=1.0 / window)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        out = 100 - 100 / (1 + gain / loss)
+    out[loss == 0] = 100.0
+    out[np.isnan(gain) | np.isnan(loss)] = np.nan
+    # 초기 window 구간은 불안정하므로 제외
+    count = _window_sum((~np.isnan(diff)).astype(np.float64), window)
+    out[~(count >= window)] = np.nan
+    return out
+
+
+def rolling_volatility(
+    values: ArrayLike, window: int, annualize: bool = True
+) -> np.ndarray:
+    """일간 수익률의 이동 표준편차 (ddof=1)"""
+    values = _as_2d(values)
+    returns = rate_of_change(values, 1)
+    mask = ~np.isnan(returns)
+    r = np.where(mask, returns, 0.0)
+    n = _window_sum(mask.astype(np.float64), window)
+    s = _window_sum(r, window)
+    ss = _window_sum(r * r, window)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        var = (ss - s * s / n) / (n - 1)
+        out = np.sqrt(np.maximum(var, 0.0))
+    out[~(n >= window)] = np.nan
+    return out * np.sqrt(TRADING_DAYS) if annualize else out
+
+
+def trend_regression(values: np.ndarray, min_periods: int = 3) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (T x N) 행렬의 각 열을 표준화한 뒤 시간 인덱스에 대해 선형회귀한 기울기와 r² 를
+    행렬 연산으로 한 번에 계산합니다. NaN 은 제외하고 관측된 위치만 사용합니다.
+    :param values: (T x N) 값 행렬
+    :param min_periods: 열별 최소 관측 수. 부족하면 NaN
+    :return: (slope, r_squared) 각각 길이 N
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim == 1:
+        values = values[:, None]
+    mask = ~np.isnan(values)
+    n = mask.sum(axis=0)
+    x = np.arange(values.shape[0], dtype=np.float64)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        if n.min(initial=values.shape[0]) == values.shape[0]:
+            # 결측이 없는 경우: x 는 모든 열에 공통이므로 행렬-벡터 곱으로 계산
+            dx = x - x.mean()
+            dy = values - values.mean(axis=0)
+            sxx = np.full(values.shape[1], dx @ dx)
+            sxy = dx @ dy
+            syy = np.einsum("ij,ij->j", dy, dy)
+        else:
+            x = x[:, None]
+            x_mean = (x * mask).sum(axis=0) / n
+            y_mean = np.where(mask, values, 0.0).sum(axis=0) / n
+            dx = np.where(mask, x - x_mean, 0.0)
+            dy = np.where(mask, values - y_mean, 0.0)
+            sxx = np.einsum("ij,ij->j", dx, dx)
+            sxy = np.einsum("ij,ij->j", dx, dy)
+            syy = np.einsum("ij,ij->j", dy, dy)
+
+        # 표준화 (모표준편차) 된 y 에 대한 기울기 = 원래 기울기 / std(y)
+        slope = sxy / sxx / np.sqrt(syy / n)
+        r_squared = sxy * sxy / (sxx * syy)
+
+    invalid = (n < min_periods) | (syy == 0)
+    slope[invalid] = np.nan
+    r_squared[invalid] = np.nan
+    return slope, r_squared
+
+
+def rolling_trend_regression(
+    values: np.ndarray, length: int, min_periods: int = 3, block_size: int = 512
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    trend_regression 을 모든 시점에 대해 (각 시점으로 끝나는 length 행 구간) 계산합니다.
+    회귀에 필요한 합계를 누적합으로 구하므로 전체 계산량은 O(T*N) 입니다.
+    메모리를 제한하기 위해 열을 block_size 단위로 나누어 계산합니다.
+    :param values: (T x N) 값 행렬
+    :param length: 회귀 구간 길이 (행 수)
+    :param min_periods: 구간 내 최소 관측 수. 부족하면 NaN
+    :param block_size: 한 번에 계산할 열 수
+    :return: (slope, r_squared) 각각 (T x N), 구간이 부족한 앞쪽 length-1 행은 NaN
+    """
+    values = np.asarray(values)
+    if values.ndim == 1:
+        values = values[:, None]
+    n_rows, n_cols = values.shape
+    slope = np.full((n_rows, n_cols), np.nan)
+    r_squared = np.full((n_rows, n_cols), np.nan)
+    if n_rows < length:
+        return slope, r_squared
+
+    j = np.arange(n_rows, dtype=np.float64)[:, None]
+
+    def window_sum(a: np.ndarray) -> np.ndarray:
+        return _window_sum(a, length)[length - 1:]
+
+    for start in range(0, n_cols, block_size):
+        block = np.asarray(values[:, start:start + block_size], dtype=np.float64)
+        mask = ~np.isnan(block)
+        # 누적합의 자릿수 손실을 줄이기 위해 열 평균을 빼서 계산 (기울기, r² 는 불변)
+        with np.errstate(invalid="ignore"):
+            center = np.nanmean(block, axis=0) if mask.any() else 0.0
+        y = np.where(mask, block - center, 0.0)
+        m = mask.astype(np.float64)
+        jm = j * m
+
+        n = window_sum(m)
+        sy = window_sum(y)
+        sj = window_sum(jm)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            sxx = window_sum(j * jm) - sj * sj / n
+            syy = window_sum(y * y) - sy * sy / n
+            sxy = window_sum(j * y) - sj * sy / n
+
+            block_slope = sxy / sxx / np.sqrt(syy / n)
+            block_r2 = sxy * sxy / (sxx * syy)
+
+        invalid = (n < min_periods) | ~(syy > 0) | ~(sxx > 0)
+        block_slope[invalid] = np.nan
+        block_r2[invalid] = np.nan
+        slope[length - 1:, start:start + block_size] = block_slope
+        r_squared[length - 1:, start:start + block_size] = block_r2
+
+    return slope, r_squared
+
+
+def rolling_regression(values: ArrayLike, window: int, min_periods: int = 3) -> np.ndarray:
+    """
+    이동 구간 추세 점수: 표준화 기울기 (연율화) x r²
+    """
+    slope, r_squared = rolling_trend_regression(_as_2d(values), window, min_periods)
+    return slope * np.sqrt(TRADING_DAYS) * r_squared
+
+
+INDICATORS: Dict[str, Callable[..., np.ndarray]] = {
+    "sma": sma,
+    "ema": ema,
+    "rsi": rsi,
+    "volatility": rolling_volatility,
+    "roc": rate_of_change,
+    "regression": rolling_regression,
+}
+
+
+def compute_indicator(name: str, data: pd.DataFrame, **params) -> pd.DataFrame:
+    """
+    (date x symbol) DataFrame 에 지표를 계산합니다.
+    :param name: INDICATORS 의 지표 이름
+    :param data: 가격 데이터
+    :param params: 지표 파라미터
+    :return: 같은 index / columns 의 DataFrame (compact 모드의 float32 유지)
+    """
+    if name not in INDICATORS:
+        raise ValueError(f"Unknown indicator: {name}. Use one of {list(INDICATORS)}")
+    values = INDICATORS[name](data.to_numpy(), **params)
+    result = pd.DataFrame(values, index=data.index, columns=data.columns)
+    return preserve_dtypes(result, data)
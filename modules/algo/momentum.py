@@ -1,38 +1,265 @@
+import os
+import pickle
+import warnings
 import numpy as np
 import pandas as pd
-from scipy import stats
+from typing import Optional
 from modules.algo.core import ValueBasedAlgo
+from modules.algo.indicators import (
+    TRADING_DAYS,
+    trend_regression,
+    rolling_trend_regression,
+)
+from modules.data.dtypes import preserve_dtypes
+
+
+def normalize_scores(scores: np.ndarray) -> np.ndarray:
+    """
+    행(시점)별로 평균 ± 3 표준편차로 clip 한 뒤 0~1 로 min-max 정규화합니다.
+    :param scores: (D x N) 점수 행렬
+    """
+    with np.errstate(invalid="ignore", divide="ignore"), warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        mean = np.nanmean(scores, axis=1, keepdims=True)
+        std = np.nanstd(scores, axis=1, ddof=1, keepdims=True)
+        clipped = np.clip(scores, mean - 3 * std, mean + 3 * std)
+        min_scores = np.nanmin(clipped, axis=1, keepdims=True)
+        max_scores = np.nanmax(clipped, axis=1, keepdims=True)
+        return (clipped - min_scores) / (max_scores - min_scores)
 
 
 class MomentumAlgo(ValueBasedAlgo):
-    def __init__(self, window: int = 20, **kwargs):
+    def __init__(self, window: int = 20, min_periods: Optional[int] = None, **kwargs):
+        """
+        :param window: 이동평균 기간
+        :param min_periods: 점수 계산에 필요한 종목별 최소 관측 수. None 이면 max(3, window)
+        """
         super().__init__(indicator_type="momentum", window=window, **kwargs)
         self.window = window
+        self.min_periods = min_periods if min_periods is not None else max(3, window)
+
+    def _smooth(self, data: pd.DataFrame) -> pd.DataFrame:
+        # rolling 결과는 float64 이므로 원본 dtype (compact 모드의 float32) 으로 되돌림
+        return self.cached(
+            "sma",
+            {"window": self.window},
+            data,
+            lambda: preserve_dtypes(data.rolling(window=self.window).mean(), data),
+        )
 
     def prepare_data(self, data: pd.DataFrame) -> pd.DataFrame:
-        smoothed_data = data.rolling(window=self.window).mean()
-        return smoothed_data.dropna()
+        smoothed_data = self._smooth(data)
+        # 상장 이전 구간(NaN)이 있는 종목 때문에 전체 행이 잘리지 않도록 모두 NaN 인 행만 제거
+        return smoothed_data.dropna(how="all")
 
     def calculate_values(self, data: pd.DataFrame) -> pd.Series:
+        slope, r_squared = trend_regression(data.to_numpy(), self.min_periods)
+        annualized_slope = slope * np.sqrt(TRADING_DAYS)
+        momentum_scores = annualized_slope * r_squared
+        return pd.Series(normalize_scores(momentum_scores[None, :])[0], index=data.columns)
 
-        def momentum(ts: np.ndarray) -> float:
-            ts_normalized = (ts - np.mean(ts)) / np.std(ts)
-            x = np.arange(len(ts_normalized))
-            slope, _, r_value, _, _ = stats.linregress(x, ts_normalized)
-            annualized_slope = slope * np.sqrt(252)
-            score = annualized_slope * (r_value**2)
-            return score
+    def rolling_values(self, data: pd.DataFrame, train_length: int) -> pd.DataFrame:
+        """
+        모든 날짜에 대해 그 날짜로 끝나는 train_length 행 구간을 학습 데이터로 했을 때의
+        calculate_values(prepare_data(...)) 결과를 한 번에 계산합니다.
+        리밸런싱 날짜의 점수는 결과의 행 조회로 얻을 수 있습니다.
+        :param data: (date x symbol) 가격 데이터 (전체 기간)
+        :param train_length: 학습 구간 행 수
+        :return: (date x symbol) 점수 행렬. 구간이 부족한 날짜는 NaN
+        """
+        length = train_length - self.window + 1
+        if length < 1:
+            raise ValueError(f"train_length ({train_length}) must be >= window ({self.window})")
+        smoothed = self._smooth(data).to_numpy(dtype=float)
+        slope, r_squared = rolling_trend_regression(smoothed, length, self.min_periods)
+        scores = normalize_scores(slope * np.sqrt(TRADING_DAYS) * r_squared)
+        return pd.DataFrame(scores, index=data.index, columns=data.columns)
 
-        momentum_scores = data.apply(momentum, raw=True)
 
-        momentum_scores = np.clip(
-            momentum_scores,
-            momentum_scores.mean() - 3 * momentum_scores.std(),
-            momentum_scores.mean() + 3 * momentum_scores.std(),
-        )
+class MomentumState:
+    def __init__(self, window: int, min_periods: int, columns: pd.Index, length: int):
+        """
+        MomentumAlgo 점수의 증분 계산 상태.
+        이동평균에 필요한 마지막 window 행(tail ring buffer)과 회귀 구간의 이동평균(smoothed ring buffer),
+        회귀 합계만 들고 있어 새 거래일 한 행이 들어오면 O(N) 으로 갱신합니다. from_frame 으로 생성합니다.
+        :param length: 회귀 구간 길이 (이동평균 행 수)
+        """
+        self.window = window
+        self.min_periods = min_periods
+        self.columns = columns
+        self.length = length
+
+    @classmethod
+    def from_frame(cls, algo: "MomentumAlgo", data: pd.DataFrame) -> "MomentumState":
+        """
+        학습 구간 전체로 상태를 새로 계산합니다. O(T*N)
+        :param algo: 점수를 계산할 알고리즘 (window, min_periods)
+        :param data: 학습 구간 (date x symbol) 가격 데이터
+        """
+        if len(data) < algo.window:
+            raise ValueError(f"Not enough rows ({len(data)}) for window {algo.window}")
+        state = cls(algo.window, algo.min_periods, data.columns, len(data) - algo.window + 1)
+
+        tail = data.iloc[-algo.window:].to_numpy(dtype=np.float64)
+        state.tail = np.array(tail, copy=True)  # 마지막 window 행 (ring buffer)
+        state.tail_head = 0  # tail 에서 가장 오래된 행 위치
+        state.tail_index = data.index[-algo.window:]
+        observed = ~np.isnan(tail)
+        state.price_sum = np.where(observed, tail, 0.0).sum(axis=0)
+        state.price_count = observed.sum(axis=0)
+
+        smoothed = data.rolling(window=algo.window).mean().to_numpy(dtype=np.float64)[algo.window - 1:]
+        state.smoothed = np.array(smoothed, copy=True)  # 회귀 구간의 이동평균 (ring buffer)
+        state.head = 0  # smoothed 에서 가장 오래된 행 위치
+        state.step = len(smoothed)  # 다음 행의 시간 인덱스
+
+        mask = ~np.isnan(smoothed)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            state.center = np.where(mask.any(axis=0), np.nanmean(smoothed, axis=0), 0.0)
+        j = np.arange(len(smoothed), dtype=np.float64)[:, None]
+        y = np.where(mask, smoothed - state.center, 0.0)
+        m = mask.astype(np.float64)
+        state.n = m.sum(axis=0)
+        state.sj = (j * m).sum(axis=0)
+        state.sjj = (j * j * m).sum(axis=0)
+        state.sy = y.sum(axis=0)
+        state.syy = (y * y).sum(axis=0)
+        state.sjy = (j * y).sum(axis=0)
+        return state
+
+    @property
+    def last_index(self) -> pd.Timestamp:
+        """상태에 반영된 마지막 거래일"""
+        return self.tail_index[-1]
+
+    def _seam(self, data: pd.DataFrame) -> int:
+        """data 에서 마지막 반영 거래일의 행 위치. 없으면 -1"""
+        position = int(data.index.searchsorted(self.last_index))
+        if position >= len(data) or data.index[position] != self.last_index:
+            return -1
+        return position
+
+    def can_advance(self, data: pd.DataFrame) -> bool:
+        """
+        data 가 현재 학습 구간 뒤에 새 거래일을 이어 붙인 구간인지 이음매만 확인합니다.
+        (종목 집합이 같고, 마지막 window 행의 날짜와 값이 같고, 새 행 수가 회귀 구간 길이 이하) O(window*N)
+        data 는 학습 구간 전체이거나, 이음매(마지막 window 행) 이후만 있는 최근 구간이어도 됩니다.
+        """
+        if len(data.columns) != len(self.columns) or not data.columns.isin(self.columns).all():
+            return False
+        position = self._seam(data)
+        start = position - self.window + 1
+        if position < 0 or start < 0 or len(data) - 1 - position > self.length:
+            return False
+        if not data.index[start:position + 1].equals(self.tail_index):
+            return False
+        # 종목 순서는 데이터를 불러온 순서에 따라 다를 수 있으므로 상태의 종목 순서로 맞춤
+        seam = data.iloc[start:position + 1].reindex(columns=self.columns).to_numpy(dtype=np.float64)
+        return np.array_equal(seam, np.roll(self.tail, -self.tail_head, axis=0), equal_nan=True)
+
+    def advance(self, data: pd.DataFrame):
+        """
+        can_advance 를 만족하는 data 의 새 행들을 상태에 반영합니다. 새 행마다 O(N)
+        """
+        position = self._seam(data)
+        new_rows = data.iloc[position + 1:].reindex(columns=self.columns).to_numpy(dtype=np.float64)
+        for row in new_rows:
+            # 이동평균 구간에서 빠지는 행: tail 에서 가장 오래된 행
+            leaving = self.tail[self.tail_head]
+            observed, left = ~np.isnan(row), ~np.isnan(leaving)
+            self.price_sum += np.where(observed, row, 0.0) - np.where(left, leaving, 0.0)
+            self.price_count += observed.astype(int) - left.astype(int)
+            self.tail[self.tail_head] = row
+            self.tail_head = (self.tail_head + 1) % self.window
+            with np.errstate(invalid="ignore"):
+                smoothed = np.where(self.price_count == self.window, self.price_sum / self.window, np.nan)
+            self._push(smoothed)
+        if len(new_rows):
+            self.tail_index = self.tail_index.append(data.index[position + 1:])[-self.window:]
+
+    def _push(self, smoothed: np.ndarray):
+        # 가장 오래된 이동평균 행을 회귀 합계에서 빼고 새 행을 더함
+        old = self.smoothed[self.head]
+        old_mask = ~np.isnan(old)
+        j_old = float(self.step - self.length)
+        y_old = np.where(old_mask, old - self.center, 0.0)
+        m_old = old_mask.astype(np.float64)
+
+        mask = ~np.isnan(smoothed)
+        j_new = float(self.step)
+        y_new = np.where(mask, smoothed - self.center, 0.0)
+        m_new = mask.astype(np.float64)
+
+        self.n += m_new - m_old
+        self.sj += j_new * m_new - j_old * m_old
+        self.sjj += j_new * j_new * m_new - j_old * j_old * m_old
+        self.sy += y_new - y_old
+        self.syy += y_new * y_new - y_old * y_old
+        self.sjy += j_new * y_new - j_old * y_old
+
+        self.smoothed[self.head] = smoothed
+        self.head = (self.head + 1) % self.length
+        self.step += 1
+
+    def values(self) -> pd.Series:
+        """
+        현재 학습 구간의 MomentumAlgo.calculate_values 결과
+        """
+        n = self.n
+        with np.errstate(invalid="ignore", divide="ignore"):
+            sxx = self.sjj - self.sj * self.sj / n
+            syy = self.syy - self.sy * self.sy / n
+            sxy = self.sjy - self.sj * self.sy / n
+            slope = sxy / sxx / np.sqrt(syy / n)
+            r_squared = sxy * sxy / (sxx * syy)
+        invalid = (n < self.min_periods) | ~(syy > 0) | ~(sxx > 0)
+        slope[invalid] = np.nan
+        r_squared[invalid] = np.nan
+        scores = slope * np.sqrt(TRADING_DAYS) * r_squared
+        return pd.Series(normalize_scores(scores[None, :])[0], index=self.columns)
+
+    def save(self, path: str):
+        """
+        smoothed ring buffer 는 {path}.npy (memory-map) 에, 나머지 상태는 {path}.pkl 에 저장합니다.
+        load 로 연 상태는 바뀐 ring buffer 행만 파일에 기록되므로 저장도 새 행 수에 비례합니다.
+        """
+        ring_path = path + ".npy"
+        if isinstance(self.smoothed, np.memmap) and os.path.abspath(self.smoothed.filename) == os.path.abspath(ring_path):
+            self.smoothed.flush()
+        else:
+            np.save(path + ".tmp.npy", np.ascontiguousarray(self.smoothed))
+            os.replace(path + ".tmp.npy", ring_path)
+            self.smoothed = np.load(ring_path, mmap_mode="r+")
+        with open(path + ".pkl.tmp", "wb") as file:
+            pickle.dump(
+                {key: value for key, value in self.__dict__.items() if key != "smoothed"},
+                file,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        os.replace(path + ".pkl.tmp", path + ".pkl")
 
-        min_scores = momentum_scores.min()
-        max_scores = momentum_scores.max()
-        normalized_momentum = (momentum_scores - min_scores) / (max_scores - min_scores)
+    @classmethod
+    def load(cls, path: str) -> Optional["MomentumState"]:
+        """
+        save 로 저장한 상태. 없거나 읽을 수 없으면 None
+        """
+        if not os.path.exists(path + ".pkl") or not os.path.exists(path + ".npy"):
+            return None
+        with open(path + ".pkl", "rb") as file:
+            attributes = pickle.load(file)
+        state = cls.__new__(cls)
+        state.__dict__.update(attributes)
+        state.smoothed = np.load(path + ".npy", mmap_mode="r+")
+        if state.smoothed.shape != (state.length, len(state.columns)):
+            return None
+        return state
 
-        return normalized_momentum
+    @staticmethod
+    def invalidate(path: str):
+        """
+        memory-map 된 ring buffer 를 고치기 전에 호출합니다.
+        갱신 도중 중단되어 ring buffer 와 합계가 어긋나면 다음 실행에서 load 되지 않고 전체 재계산됩니다.
+        """
+        if os.path.exists(path + ".pkl"):
+            os.remove(path + ".pkl")
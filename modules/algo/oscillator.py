@@ -0,0 +1,48 @@
+import pandas as pd
+from typing import Dict, Any
+from modules.algo.core import IndicatorAlgo
+
+
+class RSIAlgo(IndicatorAlgo):
+
+    def __init__(self, window: int = 14, **kwargs):
+        """
+        RSI 가 높은 종목을 선호
+        :param window: RSI 기간
+        """
+        super().__init__(indicator_type="rsi", window=window, **kwargs)
+        self.window = window
+
+    def indicator_params(self) -> Dict[str, Any]:
+        return {"window": self.window}
+
+
+class RateOfChangeAlgo(IndicatorAlgo):
+
+    def __init__(self, period: int = 20, **kwargs):
+        """
+        period 거래일 수익률이 높은 종목을 선호
+        :param period: 수익률 계산 기간
+        """
+        super().__init__(indicator_type="roc", period=period, **kwargs)
+        self.period = period
+
+    def indicator_params(self) -> Dict[str, Any]:
+        return {"period": self.period}
+
+
+class VolatilityAlgo(IndicatorAlgo):
+
+    def __init__(self, window: int = 20, **kwargs):
+        """
+        변동성이 낮은 종목을 선호 (점수 = -연율화 변동성)
+        :param window: 변동성 계산 기간
+        """
+        super().__init__(indicator_type="volatility", window=window, **kwargs)
+        self.window = window
+
+    def indicator_params(self) -> Dict[str, Any]:
+        return {"window": self.window}
+
+    def score(self, data: pd.DataFrame, indicator: pd.DataFrame) -> pd.DataFrame:
+        return -indicator
@@ -0,0 +1,205 @@
+import os
+import json
+import pickle
+import concurrent.futures
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from modules.fingerprint import fingerprint_params
+from modules.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class Stage:
+    def __init__(
+        self,
+        name: str,
+        func: Callable[..., Any],
+        deps: Sequence[str] = (),
+        fingerprint: Optional[Callable[..., Any]] = None,
+        cache: bool = False,
+    ):
+        """
+        DAG 의 한 단계
+        :param name: stage 이름 (DAG 내에서 유일)
+        :param func: 실행 함수. 의존 stage 의 출력이 이름을 키로 하는 kwargs 로 전달된다
+        :param deps: 의존하는 stage 이름 목록
+        :param fingerprint: 입력 fingerprint 함수 (func 와 같은 kwargs). None 이면 항상 실행
+        :param cache: 출력 결과를 디스크에 저장하여 skip 시 재사용할지 여부
+        """
+        self.name = name
+        self.func = func
+        self.deps = list(deps)
+        self.fingerprint = fingerprint
+        self.cache = cache
+
+    def __repr__(self):
+        return f"Stage({self.name}, deps={self.deps})"
+
+
+class DAGRunner:
+    def __init__(
+        self,
+        stages: List[Stage],
+        state_dir: Optional[str] = None,
+        max_workers: Optional[int] = None,
+    ):
+        """
+        의존 관계가 선언된 stage 들을 실행하는 DAG 실행기.
+        독립적인 stage 는 병렬로 실행되며, 출력은 메모리로 다음 stage 에 전달된다.
+        입력 fingerprint 가 이전 실행과 같으면 stage 를 건너뛴다.
+        :param stages: stage 목록
+        :param state_dir: fingerprint 및 캐시 출력을 저장할 경로. None 이면 skip 하지 않음
+        :param max_workers: 동시에 실행할 최대 stage 수
+        """
+        self.stages = {stage.name: stage for stage in stages}
+        if len(self.stages) != len(stages):
+            raise ValueError("Stage names must be unique")
+        for stage in stages:
+            for dep in stage.deps:
+                if dep not in self.stages:
+                    raise ValueError(f"Unknown dependency '{dep}' in stage '{stage.name}'")
+        self.order = self._topological_order()
+        self.state_dir = state_dir
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+
+        self._state: Dict[str, str] = self._load_state()
+        self.outputs: Dict[str, Any] = {}
+        self.skipped: List[str] = []
+        self.failed: Dict[str, Exception] = {}
+
+    def _topological_order(self) -> List[str]:
+        order, visiting, visited = [], set(), set()
+
+        def visit(name: str):
+            if name in visited:
+                return
+            if name in visiting:
+                raise ValueError(f"Cycle detected at stage '{name}'")
+            visiting.add(name)
+            for dep in self.stages[name].deps:
+                visit(dep)
+            visiting.discard(name)
+            visited.add(name)
+            order.append(name)
+
+        for name in self.stages:
+            visit(name)
+        return order
+
+    @property
+    def _state_path(self) -> str:
+        return os.path.join(self.state_dir, "dag_state.json")
+
+    def _cache_path(self, name: str) -> str:
+        return os.path.join(self.state_dir, f"{name}.pkl")
+
+    def _load_state(self) -> Dict[str, str]:
+        if self.state_dir is None or not os.path.exists(self._state_path):
+            return {}
+        try:
+            with open(self._state_path, "r", encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to load DAG state, running all stages: {e}")
+            return {}
+
+    def _save_state(self):
+        if self.state_dir is None:
+            return
+        os.makedirs(self.state_dir, exist_ok=True)
+        with open(self._state_path, "w", encoding="utf-8") as file:
+            json.dump(self._state, file, indent=2)
+
+    def _stage_key(self, stage: Stage, inputs: Dict[str, Any]) -> Optional[str]:
+        if stage.fingerprint is None or self.state_dir is None:
+            return None
+        return fingerprint_params([stage.name, stage.fingerprint(**inputs)])
+
+    def _run_stage(self, name: str) -> Any:
+        stage = self.stages[name]
+        inputs = {dep: self.outputs.get(dep) for dep in stage.deps}
+        key = self._stage_key(stage, inputs)
+
+        if key is not None and self._state.get(name) == key:
+            if not stage.cache:
+                logger.info(f"Stage '{name}' unchanged, skipping")
+                self.skipped.append(name)
+                return None
+            if os.path.exists(self._cache_path(name)):
+                logger.info(f"Stage '{name}' unchanged, loading cached output")
+                with open(self._cache_path(name), "rb") as file:
+                    output = pickle.load(file)
+                self.skipped.append(name)
+                return output
+
+        logger.info(f"Running stage '{name}'")
+        output = stage.func(**inputs)
+
+        if key is not None:
+            # stage 가 자신의 입력(파일 등)을 변경할 수 있으므로 실행 후 fingerprint 를 저장
+            key = self._stage_key(stage, inputs)
+            if stage.cache:
+                os.makedirs(self.state_dir, exist_ok=True)
+                with open(self._cache_path(name), "wb") as file:
+                    pickle.dump(output, file)
+            self._state[name] = key
+        return output
+
+    def run(self, targets: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        DAG 실행
+        :param targets: 실행할 stage 목록 (의존 stage 포함). None 이면 전체 실행
+        :return: stage 이름 -> 출력
+        """
+        required = self._required_stages(targets) if targets else set(self.order)
+        pending = [name for name in self.order if name in required]
+        running: Dict[concurrent.futures.Future, str] = {}
+        done = set()
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while pending or running:
+                for name in list(pending):
+                    deps = self.stages[name].deps
+                    if any(dep in self.failed for dep in deps):
+                        logger.error(f"Stage '{name}' not run: upstream stage failed")
+                        self.failed[name] = RuntimeError("Upstream stage failed")
+                        pending.remove(name)
+                    elif all(dep in done for dep in deps):
+                        running[executor.submit(self._run_stage, name)] = name
+                        pending.remove(name)
+
+                if not running:
+                    continue
+
+                finished, _ = concurrent.futures.wait(
+                    running, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                for future in finished:
+                    name = running.pop(future)
+                    try:
+                        self.outputs[name] = future.result()
+                        done.add(name)
+                    except Exception as e:
+                        logger.error(f"Stage '{name}' failed: {e}", exc_info=True)
+                        self.failed[name] = e
+                        self._state.pop(name, None)
+
+        self._save_state()
+        logger.info(
+            f"DAG completed: {len(done)} stages done "
+            f"({len(self.skipped)} skipped), {len(self.failed)} failed"
+        )
+        return self.outputs
+
+    def _required_stages(self, targets: List[str]) -> set:
+        required = set()
+        stack = list(targets)
+        while stack:
+            name = stack.pop()
+            if name in required:
+                continue
+            if name not in self.stages:
+                raise ValueError(f"Unknown stage '{name}'")
+            required.add(name)
+            stack.extend(self.stages[name].deps)
+        return required
@@ -1,60 +1,314 @@
-import pandas as pd
-import glob
 import os
-from typing import Optional
-from typing import List
+import json
+import pandas as pd
+from typing import Optional, Sequence, Dict, Any, List, Tuple
+from filelock import FileLock
+from modules.data.calendar import DEFAULT_CALENDAR, TradingCalendar
+from modules.data.core import CHUNK_FILE_PATTERN
+from modules.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 집계 주기 -> pandas resample rule
+RESAMPLE_RULES = {
+    "1D": "1D",
+    "1W": "W",
+    "1M": "ME",
+}
+
+# OHLCV 컬럼별 집계 방법
+OHLCV_AGG = {
+    "open": "first",
+    "high": "max",
+    "low": "min",
+    "close": "last",
+    "volume": "sum",
+}
+
+
+def _merge_bar(bar: Dict[str, Any], other: Dict[str, Any]) -> Dict[str, Any]:
+    """같은 구간의 두 bar 를 합칩니다. other 가 시간상 뒤쪽 bar 입니다."""
+    merged = dict(bar)
+    for column, value in other.items():
+        if column not in merged or pd.isna(merged[column]):
+            merged[column] = value
+        elif pd.isna(value):
+            continue
+        elif OHLCV_AGG[column] == "max":
+            merged[column] = max(merged[column], value)
+        elif OHLCV_AGG[column] == "min":
+            merged[column] = min(merged[column], value)
+        elif OHLCV_AGG[column] == "last":
+            merged[column] = value
+        elif OHLCV_AGG[column] == "sum":
+            merged[column] = merged[column] + value
+    return merged
+
+
+class OHLCVBarBuilder:
+    def __init__(self, freq: str, partial: Optional[Dict[str, Any]] = None):
+        """
+        한 주기의 OHLCV bar 를 스트리밍으로 만듭니다.
+        마지막(진행 중인) bar 하나만 메모리에 유지합니다.
+        UTC 시각 그대로 구간을 나누므로, 입력 index 는 거래소 현지 날짜 라벨이어야 합니다.
+        (TradingCalendar.to_session_labels 결과 또는 이 builder 가 만든 1D bar)
+        :param freq: 1D, 1W, 1M
+        :param partial: 이전 실행에서 저장된 진행 중 bar ({"label": ..., "open": ...})
+        """
+        if freq not in RESAMPLE_RULES:
+            raise ValueError(f"Unsupported freq: {freq}. Use one of {list(RESAMPLE_RULES)}")
+        self.freq = freq
+        self.partial = partial
+
+    def update(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        시간순으로 정렬된 하위 주기 데이터를 반영합니다.
+        :param data: date index, OHLCV 컬럼
+        :return: 이번 update 로 완성된 bar 들
+        """
+        columns = [c for c in OHLCV_AGG if c in data.columns]
+        if data.empty or not columns:
+            return pd.DataFrame(columns=columns)
+
+        resampler = data[columns].resample(RESAMPLE_RULES[self.freq])
+        bars = resampler.agg({c: OHLCV_AGG[c] for c in columns})
+        # 거래가 없는 구간(주말, 휴일)은 bar 를 만들지 않음
+        bars = bars[resampler.size() > 0]
+        if bars.empty:
+            return bars
+
+        records = [
+            (label.isoformat(), row)
+            for label, row in zip(bars.index, bars.to_dict("records"))
+        ]
+        if self.partial is not None:
+            label, row = records[0]
+            partial_label = self.partial["label"]
+            partial_row = {k: v for k, v in self.partial.items() if k != "label"}
+            if label == partial_label:
+                records[0] = (label, _merge_bar(partial_row, row))
+            else:
+                records.insert(0, (partial_label, partial_row))
+
+        label, row = records.pop()
+        self.partial = {"label": label, **row}
+        return self._to_frame(records, bars.columns)
+
+    def _to_frame(self, records: List[Tuple[str, Dict]], columns) -> pd.DataFrame:
+        frame = pd.DataFrame([row for _, row in records], columns=list(columns))
+        frame.index = pd.DatetimeIndex([label for label, _ in records], name="date")
+        return frame
+
+    def partial_frame(self) -> pd.DataFrame:
+        if self.partial is None:
+            return pd.DataFrame()
+        row = {k: v for k, v in self.partial.items() if k != "label"}
+        return self._to_frame([(self.partial["label"], row)], row.keys())
 
 
 class Aggregation:
 
+    STATE_FILE = ".aggregation_state.json"
+
     def __init__(
             self,
-            db_connector: str,
-            root_path: str,
-            save_path: str,
-            freq: str = "1D",
+            db_connector=None,
+            root_path: str = "data",
+            save_path: str = "data/aggregated",
+            freqs: Sequence[str] = ("1D", "1W", "1M"),
+            db_freq: str = "1D",
+            use_file_lock: bool = True,
+            calendar: Optional[TradingCalendar] = None,
     ):
-
+        """
+        저장된 가격 데이터(종목별 chunk csv)를 chunk 단위로 읽어
+        1D/1W/1M OHLCV bar 를 만듭니다.
+        1D bar 는 원본에서, 상위 주기 bar 는 완성된 1D bar 에서 누적 갱신됩니다.
+        종목별 처리 위치(watermark)와 진행 중인 bar 를 저장하므로
+        다음 실행에서는 새로 들어온 chunk 만 처리합니다.
+        :param db_connector: insert(data, symbol) 를 제공하는 DB connector (선택)
+        :param root_path: 종목별 하위 디렉토리가 있는 데이터 경로 (ex: data/KOR)
+        :param save_path: 집계 결과 저장 경로 (save_path/{freq}/{symbol}.csv)
+        :param freqs: 집계 주기 목록
+        :param db_freq: DB 에 기록할 주기
+        :param use_file_lock: 원본 csv 를 읽을 때 파일 잠금 사용 여부
+        :param calendar: 거래소 달력 (ex: get_calendar("KRX")). bar 는 거래소 현지 날짜 기준으로 나뉨
+        """
         self.db_connector = db_connector
         self.root_path = root_path
-        self.freq = freq  # 1D, 1W, 1M, -> 1D
         self.save_path = save_path
+        self.freqs = list(freqs)  # 1D, 1W, 1M
+        self.db_freq = db_freq
+        self.use_file_lock = use_file_lock
+        self.calendar = calendar or DEFAULT_CALENDAR
+
+        if "1D" not in self.freqs:
+            self.freqs.insert(0, "1D")
+
+        self.symbols = sorted(
+            d for d in os.listdir(self.root_path)
+            if os.path.isdir(os.path.join(self.root_path, d)) and not d.startswith(".")
+        ) if os.path.isdir(self.root_path) else []
+
+        self._state_path = os.path.join(self.save_path, self.STATE_FILE)
+        self._state: Dict[str, Dict[str, Any]] = self._load_state()
 
-        self.file_list = glob.glob(
-            os.path.join(self.root_path, "/*.csv"))
+    def _load_state(self) -> Dict[str, Dict[str, Any]]:
+        if not os.path.exists(self._state_path):
+            return {}
+        with open(self._state_path, "r", encoding="utf-8") as file:
+            return json.load(file)
 
-        self.df_list = Optional[List] = None
+    def _save_state(self):
+        os.makedirs(self.save_path, exist_ok=True)
+        tmp_path = self._state_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(self._state, file, indent=2, default=float)
+        os.replace(tmp_path, self._state_path)
 
-    def run(self):
-        for file in self.file_list:
-            df = pd.read_csv(file, index_col=0)
-            if not pd.api.types.is_datetime64_dtype(df.dtypes):
-                df.index = pd.to_datetime(df.index)
-            df = df.resample(self.freq).mean().ffill()
-            self.df_list.append(df)
+    def _chunk_files(self, symbol: str) -> List[str]:
+        """
+        chunk 파일을 날짜 순서(월 시작일, chunk 번호)로 정렬합니다.
+        이름 문자열 순서로는 chunk10 이 chunk2 보다 앞서므로 watermark 에 걸려 행이 빠질 수 있습니다.
+        이름 형식이 다른 파일은 첫 행의 날짜로 정렬합니다.
+        """
+        symbol_path = os.path.join(self.root_path, symbol)
+        keyed = []
+        for file in os.listdir(symbol_path):
+            if not file.endswith(".csv"):
+                continue
+            file_path = os.path.join(symbol_path, file)
+            match = CHUNK_FILE_PATTERN.match(file)
+            if match:
+                key = (pd.Timestamp(match.group(1), tz="UTC"), int(match.group(2)))
+            else:
+                key = (self._first_date(file_path), 0)
+            keyed.append((key, file_path))
+        return [file_path for _, file_path in sorted(keyed)]
 
-    def write_to_db(self):
-        for df in self.df_list:
+    def _first_date(self, file_path: str) -> pd.Timestamp:
+        chunk = pd.read_csv(file_path, usecols=lambda c: c.lower() == "date", nrows=1)
+        if chunk.empty:
+            return pd.Timestamp.max.tz_localize("UTC")
+        return pd.to_datetime(chunk.iloc[0, 0], utc=True)
+
+    def _read_chunk(self, file_path: str) -> pd.DataFrame:
+        lock = FileLock(file_path + ".lock", timeout=60) if self.use_file_lock else None
+        if lock:
+            with lock:
+                df = pd.read_csv(file_path)
+        else:
+            df = pd.read_csv(file_path)
+        df.columns = df.columns.str.lower()
+        if "date" not in df.columns:
+            logger.warning(f"'date' column not found in {file_path}")
+            return pd.DataFrame()
+        df["date"] = pd.to_datetime(df["date"], utc=True)
+        df = df.set_index("date").sort_index()
+        return df[~df.index.duplicated(keep="last")]
+
+    def run(self) -> Dict[str, int]:
+        """
+        모든 종목을 집계합니다.
+        :return: 종목별 새로 완성된 1D bar 수
+        """
+        summary = {}
+        for symbol in self.symbols:
             try:
-                db = self.db_connector
-                db.conn()
-                db.insert_table(df)
+                summary[symbol] = self.run_symbol(symbol)
             except Exception as e:
-                print(e)
-            finally:
-                db.close()
-
-    def write_to_pc(self):
-        if len(self.file_list) == len(self.df_list):
-            for df, file_path in zip(self.df_list, self.file_list):
-                file_name = os.path.basename(file_path)
-                save_path = os.path.join(
-                    self.save_path, file_name
-                )
-                df.to_csv(save_path)
-        else:
-            raise Exception("불러온 파일과 파일 리스트가 다릅니다")
+                logger.error(f"Aggregation failed for {symbol}: {e}", exc_info=True)
+        self._save_state()
+        logger.info(f"Aggregated {len(summary)} symbols: {sum(summary.values())} new daily bars")
+        return summary
 
+    def run_symbol(self, symbol: str) -> int:
+        state = self._state.get(symbol, {})
+        watermark = pd.Timestamp(state["watermark"]) if state.get("watermark") else None
+        builders = {
+            freq: OHLCVBarBuilder(freq, state.get("partial", {}).get(freq))
+            for freq in self.freqs
+        }
+        offsets = dict(state.get("offsets", {}))
 
+        n_daily = 0
+        for file_path in self._chunk_files(symbol):
+            chunk = self._read_chunk(file_path)
+            if watermark is not None:
+                chunk = chunk[chunk.index > watermark]
+            if chunk.empty:
+                continue
+            watermark = chunk.index[-1]
 
+            # ex: KRX 는 KST 자정(전날 15:00 UTC)에 저장되므로 UTC 그대로 집계하면 하루/한 주/한 달 앞 bar 로 묶임
+            chunk = chunk.set_axis(self.calendar.to_session_labels(chunk.index), axis=0)
+            daily = builders["1D"].update(chunk)
+            n_daily += len(daily)
+            completed = {"1D": daily}
+            for freq in self.freqs:
+                if freq != "1D":
+                    completed[freq] = builders[freq].update(daily)
+
+            for freq, bars in completed.items():
+                if not bars.empty:
+                    self.write_to_pc(symbol, freq, bars, offsets)
+                    if freq == self.db_freq:
+                        self.write_to_db(symbol, bars)
+
+        # 진행 중인 bar 는 파일 끝에 임시로 기록하고, 다음 실행에서 덮어씀
+        daily_partial = builders["1D"].partial_frame()
+        for freq, builder in builders.items():
+            if freq == "1D":
+                provisional = daily_partial
+            else:
+                # 상위 주기의 임시 bar 에는 진행 중인 1D bar 까지 반영 (상태는 변경하지 않음)
+                preview = OHLCVBarBuilder(freq, dict(builder.partial) if builder.partial else None)
+                provisional = pd.concat(
+                    [preview.update(daily_partial), preview.partial_frame()]
+                ) if not daily_partial.empty else builder.partial_frame()
+            self.write_to_pc(symbol, freq, provisional, offsets, provisional=True)
+
+        self._state[symbol] = {
+            "watermark": watermark.isoformat() if watermark is not None else None,
+            "partial": {freq: builder.partial for freq, builder in builders.items()},
+            "offsets": offsets,
+        }
+        logger.info(f"{symbol}: {n_daily} new daily bars aggregated")
+        return n_daily
+
+    def write_to_db(self, symbol: str, bars: pd.DataFrame):
+        if self.db_connector is None:
+            return
+        try:
+            self.db_connector.insert(bars.reset_index(), symbol)
+        except Exception as e:
+            logger.error(f"Failed to write {symbol} bars to db: {e}")
+
+    def write_to_pc(
+            self,
+            symbol: str,
+            freq: str,
+            bars: pd.DataFrame,
+            offsets: Dict[str, int],
+            provisional: bool = False,
+    ):
+        """
+        bar 를 save_path/{freq}/{symbol}.csv 에 이어 씁니다.
+        이전에 임시로 기록된 진행 중 bar 는 잘라낸 뒤 기록합니다.
+        """
+        save_dir = os.path.join(self.save_path, freq)
+        os.makedirs(save_dir, exist_ok=True)
+        file_path = os.path.join(save_dir, f"{symbol}.csv")
 
+        exists = os.path.exists(file_path)
+        with open(file_path, "r+" if exists else "w", encoding="utf-8", newline="") as file:
+            if exists and freq in offsets:
+                file.seek(offsets.pop(freq))
+                file.truncate()
+            else:
+                file.seek(0, os.SEEK_END)
+            if bars.empty:
+                return
+            if provisional:
+                offsets[freq] = file.tell()
+            bars.to_csv(file, header=file.tell() == 0, index=True)
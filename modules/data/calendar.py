@@ -0,0 +1,233 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterable, List, Optional, Tuple
+from modules.logger import get_logger
+
+logger = get_logger(__name__)
+
+FILL_METHODS = ("ffill", "none")
+
+
+class TradingCalendar:
+    def __init__(
+        self,
+        tz: str = "UTC",
+        weekmask: str = "Mon Tue Wed Thu Fri",
+        holidays: Optional[Iterable] = None,
+    ):
+        """
+        거래소 거래일 달력.
+        거래일은 종목들의 실제 거래 날짜(거래소 현지 날짜 기준) 합집합에서
+        weekmask 와 holidays 에 해당하지 않는 날짜로 정의합니다.
+        :param tz: 거래소 시간대 (ex: Asia/Seoul, America/New_York)
+        :param weekmask: 거래 요일
+        :param holidays: 추가로 제외할 휴장일 목록
+        """
+        self.tz = tz
+        self.weekmask = weekmask
+        self.holidays = pd.DatetimeIndex(pd.to_datetime(list(holidays or []))).normalize()
+        self._weekdays = {
+            ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"].index(day)
+            for day in weekmask.split()
+        }
+
+    def to_session_labels(self, index: pd.DatetimeIndex) -> pd.DatetimeIndex:
+        """
+        시각 인덱스를 거래소 현지 날짜로 바꾼 뒤, 그 날짜의 UTC 자정 라벨로 반환합니다.
+        (ex: 2024-07-01 00:00 KST -> 2024-07-01 00:00 UTC)
+        """
+        index = pd.DatetimeIndex(index)
+        if index.tz is None:
+            index = index.tz_localize("UTC")
+        return index.tz_convert(self.tz).tz_localize(None).normalize().tz_localize("UTC")
+
+    def sessions(self, observed: pd.DatetimeIndex) -> pd.DatetimeIndex:
+        """
+        관측된 날짜 라벨(to_session_labels 결과)에서 거래일만 남깁니다.
+        """
+        observed = pd.DatetimeIndex(observed).unique().sort_values()
+        mask = observed.dayofweek.isin(self._weekdays)
+        if len(self.holidays):
+            mask &= ~observed.tz_localize(None).isin(self.holidays)
+        return observed[mask]
+
+    def session_range(self, start, end) -> pd.DatetimeIndex:
+        """
+        weekmask 와 holidays 로 만든 start ~ end 거래일 라벨 (관측 데이터가 없을 때 사용)
+        """
+        days = pd.bdate_range(
+            pd.Timestamp(start).tz_localize(None) if pd.Timestamp(start).tz else start,
+            pd.Timestamp(end).tz_localize(None) if pd.Timestamp(end).tz else end,
+            freq="C",
+            weekmask=self.weekmask,
+            holidays=list(self.holidays),
+        )
+        return days.normalize().tz_localize("UTC")
+
+    def day_index(self) -> "TradingDayIndex":
+        """
+        1970-01-01 ~ 1년 뒤까지의 거래일 인덱스 (한 번만 계산)
+        """
+        if getattr(self, "_day_index", None) is None:
+            end = pd.Timestamp.now(tz="UTC").normalize() + pd.Timedelta(days=366)
+            self._day_index = TradingDayIndex(self.session_range("1970-01-01", end), self)
+        return self._day_index
+
+
+class TradingDayIndex:
+    def __init__(self, sessions: pd.DatetimeIndex, calendar: Optional[TradingCalendar] = None):
+        """
+        거래일 라벨 -> 행 위치 조회용 인덱스.
+        실행일을 searchsorted 로 정수 행 위치로 바꾸므로 학습/검증 구간을 iloc 위치 슬라이스로 얻을 수 있고,
+        관측된 거래일 기준이므로 휴장일 주변에서도 구간 길이가 거래일 수와 일치합니다.
+        :param sessions: 정렬된 거래일 라벨 (ex: 정렬된 가격 데이터의 index)
+        :param calendar: 실행 시각을 거래소 현지 날짜로 바꿀 때 사용할 달력
+        """
+        self.sessions = sessions if isinstance(sessions, pd.DatetimeIndex) else pd.DatetimeIndex(sessions)
+        self.calendar = calendar
+
+    def __len__(self):
+        return len(self.sessions)
+
+    def locate(self, date) -> int:
+        """
+        date (의 거래소 현지 날짜) 보다 앞선 거래일 수. 즉 date 당일 이전 마지막 거래일의 위치 + 1
+        """
+        date = pd.Timestamp(date)
+        if self.calendar is not None and date.tz is not None:
+            label = self.calendar.to_session_labels(pd.DatetimeIndex([date]))[0]
+        else:
+            label = (date.tz_localize("UTC") if date.tz is None else date.tz_convert("UTC")).normalize()
+        if self.sessions.tz is None:
+            label = label.tz_localize(None)
+        return int(self.sessions.searchsorted(label, side="left"))
+
+    def window_bounds(
+        self, execute_date, train_period: int, valid_period: int
+    ) -> Tuple[Tuple[int, int], Tuple[int, int]]:
+        """
+        실행일 직전 거래일까지 valid_period + 1 거래일을 검증 구간, 그 앞 train_period + 1 거래일을 학습 구간으로 하는
+        [start, stop) 행 위치. (기존 BDay 기반 구간과 같은 거래일 수)
+        :return: ((train_start, train_stop), (valid_start, valid_stop))
+        """
+        valid_stop = self.locate(execute_date)
+        valid_start = max(valid_stop - valid_period - 1, 0)
+        train_stop = valid_start
+        train_start = max(train_stop - train_period - 1, 0)
+        return (train_start, train_stop), (valid_start, valid_stop)
+
+
+# 거래소 정보가 없을 때 사용하는 UTC 평일 달력
+DEFAULT_CALENDAR = TradingCalendar()
+
+# 거래소별 달력
+MARKET_CALENDARS = {
+    "KRX": TradingCalendar(tz="Asia/Seoul"),
+    "NYSE": TradingCalendar(tz="America/New_York"),
+    "NASDAQ": TradingCalendar(tz="America/New_York"),
+}
+
+
+def get_calendar(market: Optional[str] = None) -> TradingCalendar:
+    if market is None:
+        return DEFAULT_CALENDAR
+    if market.upper() not in MARKET_CALENDARS:
+        logger.warning(f"Unknown market '{market}', using UTC weekday calendar")
+        return DEFAULT_CALENDAR
+    return MARKET_CALENDARS[market.upper()]
+
+
+class PanelBuilder:
+    def __init__(
+        self,
+        calendar: Optional[TradingCalendar] = None,
+        fill_method: str = "ffill",
+        fill_limit: Optional[int] = None,
+    ):
+        """
+        종목별 가격 Series 를 받는 즉시 거래일 라벨로 변환해 두었다가
+        build() 에서 거래일 x 종목 행렬로 한 번에 정렬합니다.
+        데이터 로딩과 정렬 준비를 겹쳐 실행할 수 있습니다.
+        :param calendar: 거래소 달력. None 이면 UTC 평일 달력
+        :param fill_method: "ffill" (직전 거래일 값으로 채움) 또는 "none"
+        :param fill_limit: ffill 최대 연속 채움 수
+        """
+        if fill_method not in FILL_METHODS:
+            raise ValueError(f"Invalid fill_method: {fill_method}. Use one of {FILL_METHODS}")
+        self.calendar = calendar or TradingCalendar()
+        self.fill_method = fill_method
+        self.fill_limit = fill_limit
+        self._columns: List[pd.Series] = []
+        self.coverage = pd.DataFrame()
+
+    def __len__(self):
+        return len(self._columns)
+
+    def add(self, symbol: str, series: pd.Series):
+        labels = self.calendar.to_session_labels(series.index)
+        series = pd.Series(series.values, index=labels, name=symbol)
+        # 같은 거래일에 여러 값이 있으면 마지막 값 사용
+        self._columns.append(series[~labels.duplicated(keep="last")])
+
+    def build(self) -> pd.DataFrame:
+        if not self._columns:
+            return pd.DataFrame()
+
+        observed = pd.concat(self._columns, axis=1, sort=True)
+        sessions = self.calendar.sessions(observed.index)
+        data = observed.reindex(sessions)
+
+        observed_mask = data.notna()
+        if self.fill_method == "ffill":
+            data = data.ffill(limit=self.fill_limit)
+
+        self.coverage = _coverage_report(observed_mask)
+        return data
+
+
+def align_prices(
+    prices: Dict[str, pd.Series],
+    calendar: Optional[TradingCalendar] = None,
+    fill_method: str = "ffill",
+    fill_limit: Optional[int] = None,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    종목별 가격 Series 를 거래일 x 종목 행렬로 정렬합니다.
+    과거 방향 채우기(bfill)는 하지 않으므로 상장 이전 구간은 NaN 으로 남습니다.
+    :param prices: symbol -> 가격 Series (DatetimeIndex)
+    :param calendar: 거래소 달력. None 이면 UTC 평일 달력
+    :param fill_method: "ffill" (직전 거래일 값으로 채움) 또는 "none"
+    :param fill_limit: ffill 최대 연속 채움 수
+    :return: (정렬된 가격 행렬, 종목별 coverage 리포트)
+    """
+    builder = PanelBuilder(calendar, fill_method=fill_method, fill_limit=fill_limit)
+    for symbol, series in prices.items():
+        builder.add(symbol, series)
+    return builder.build(), builder.coverage
+
+
+def _coverage_report(observed_mask: pd.DataFrame) -> pd.DataFrame:
+    """
+    종목별 첫 거래일 이후 거래일 대비 실제 관측 비율
+    """
+    mask = observed_mask.to_numpy()
+    n_sessions = mask.shape[0]
+    has_data = mask.any(axis=0)
+    first = mask.argmax(axis=0)
+    last = n_sessions - 1 - mask[::-1].argmax(axis=0)
+    n_observed = mask.sum(axis=0)
+    n_expected = np.where(has_data, n_sessions - first, 0)
+
+    index = observed_mask.index
+    return pd.DataFrame(
+        {
+            "first_date": index[first].where(has_data),
+            "last_date": index[last].where(has_data),
+            "n_observed": n_observed,
+            "n_sessions": n_expected,
+            "coverage": np.divide(
+                n_observed, n_expected, out=np.zeros(len(n_observed)), where=n_expected > 0
+            ),
+        },
+        index=observed_mask.columns,
+    )
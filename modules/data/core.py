@@ -1,17 +1,24 @@
 from abc import ABCMeta, abstractmethod
 import os
+import re
 import pandas as pd
 import pytz
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from datetime import datetime, timedelta
 from filelock import FileLock
 from contextlib import nullcontext
+from modules.data.dtypes import compact_frame
 from modules.logger import get_logger
 
 logger = get_logger(__name__)
 
+# _get_file_path 가 만드는 chunk 파일 이름 ({월 시작일}_chunk{번호}.csv)
+CHUNK_FILE_PATTERN = re.compile(r"^(\d{4}-\d{2}-\d{2})_chunk(\d+)\.csv$")
+
 
 class DataProvider(metaclass=ABCMeta):
+    market: Optional[str] = None  # 거래소 (거래일 달력 선택에 사용)
+
     def __init__(self, start_date: Optional[str] = None, end_date: Optional[str] = None):
         self._start_date = start_date
         self._end_date = end_date
@@ -51,11 +58,13 @@ class DataPipeline(metaclass=ABCMeta):
         base_path: str,
         use_file_lock: bool = True,
         cache_days: int = 7,
+        compact: bool = False,
     ):
         self.data_provider = data_provider
         self.base_path = base_path
         self.use_file_lock = use_file_lock
         self.cache_days = cache_days
+        self.compact_dtypes = compact  # float32 / int32 / category dtype 으로 읽기 (compact() 메서드와 구분)
         os.makedirs(base_path, exist_ok=True)
         self._cached_data = self._load_cache() if data_provider is None else pd.DataFrame()
         logger.info(f"DataPipeline initialized with base_path: {base_path}, use_file_lock: {use_file_lock}, cache_days: {cache_days}")
@@ -66,6 +75,7 @@ class DataPipeline(metaclass=ABCMeta):
             "base_path": self.base_path,
             "use_file_lock": self.use_file_lock,
             "cache_days": self.cache_days,
+            "compact": self.compact_dtypes,
         }
         logger.debug(f"DataPipeline parameters: {params}")
         return params
@@ -82,12 +92,15 @@ class DataPipeline(metaclass=ABCMeta):
         end_date = pd.Timestamp.now(tz=pytz.UTC).date()
         start_date = end_date - timedelta(days=self.cache_days)
         logger.info(f"Loading cache from {start_date} to {end_date}")
-        return self._load_date_range(start_date, end_date)
+        # save() 로 다시 저장되는 데이터이므로 원본 dtype 으로 읽음
+        return self._load_date_range(start_date, end_date, compact=False)
 
-    def _load_date_range(self, start_date: datetime.date, end_date: datetime.date) -> pd.DataFrame:
+    def _load_date_range(
+        self, start_date: datetime.date, end_date: datetime.date, compact: Optional[bool] = None
+    ) -> pd.DataFrame:
         logger.info(f"Loading data range from {start_date} to {end_date}")
         all_data = [
-            self._read_csv(self._get_file_path(current_date.date(), chunk_num))
+            self._read_csv(self._get_file_path(current_date.date(), chunk_num), compact)
             for current_date in pd.date_range(start_date, end_date, freq="MS")
             for chunk_num in range(1000)
             if os.path.exists(self._get_file_path(current_date.date(), chunk_num))
@@ -103,13 +116,19 @@ class DataPipeline(metaclass=ABCMeta):
         month_start = date.replace(day=1)
         return os.path.join(self.base_path, f"{month_start}_chunk{chunk_num}.csv")
 
-    def _read_csv(self, file_path: str) -> pd.DataFrame:
+    def _read_csv(self, file_path: str, compact: Optional[bool] = None) -> pd.DataFrame:
+        """
+        :param compact: 메모리 절약형 dtype 변환 여부. None 이면 self.compact_dtypes
+            저장 파일에 다시 쓰는 경로에서는 False 로 원본 dtype 을 유지해야 합니다.
+        """
         logger.debug(f"Reading CSV file: {file_path}")
         with FileLock(file_path + ".lock", timeout=60) if self.use_file_lock else nullcontext():
             data = pd.read_csv(file_path)
         if "date" in data.columns:
             data["date"] = pd.to_datetime(data["date"], utc=True)
-            return data.set_index("date")
+            data = data.set_index("date")
+            compact = self.compact_dtypes if compact is None else compact
+            return compact_frame(data) if compact else data
         else:
             logger.warning(f"'date' column not found in {file_path}")
             return pd.DataFrame()
@@ -133,13 +152,16 @@ class DataPipeline(metaclass=ABCMeta):
             logger.debug(f"Saved chunk {chunk_num} to {file_path}")
             chunk_num += 1
 
-    def get_all_data(self) -> pd.DataFrame:
+    def get_all_data(self, compact: Optional[bool] = None) -> pd.DataFrame:
+        """
+        :param compact: 메모리 절약형 dtype 변환 여부. None 이면 self.compact_dtypes
+        """
         if not os.path.exists(self.base_path):
             logger.warning(f"No data directory at {self.base_path}")
             return pd.DataFrame()
 
         all_data = [
-            self._read_csv(os.path.join(root, file))
+            self._read_csv(os.path.join(root, file), compact)
             for root, _, files in os.walk(self.base_path)
             for file in files
             if file.endswith(".csv")
@@ -153,7 +175,7 @@ class DataPipeline(metaclass=ABCMeta):
 
     def get_data_range(self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> pd.DataFrame:
         logger.info(f"Getting data range from {start_date} to {end_date}")
-        all_data = self.get_all_data()
+        all_data = self._read_since(start_date) if start_date else self.get_all_data()
         if all_data.empty:
             logger.warning(f"No data found in the range {start_date} to {end_date}")
             return pd.DataFrame()
@@ -165,6 +187,35 @@ class DataPipeline(metaclass=ABCMeta):
         logger.info(f"Returned data range with shape {all_data.shape}")
         return all_data
 
+    def _read_since(self, start_date, compact: Optional[bool] = None) -> pd.DataFrame:
+        """
+        start_date 이후 행이 들어 있는 chunk 파일만 읽습니다.
+        chunk 파일은 시간 순서로 쌓이고 이름의 월 이후 날짜만 담으므로, 마지막 월부터 거꾸로 읽다가
+        start_date 이전부터 시작하는 월에서 멈춥니다. (최근 구간만 필요할 때 전체 이력을 읽지 않음)
+        마지막 월은 항상 읽으므로 start_date 이후 데이터가 없어도 마지막 저장 행은 포함됩니다.
+        :param compact: 메모리 절약형 dtype 변환 여부. None 이면 self.compact_dtypes
+        """
+        start = pd.Timestamp(start_date)
+        start = start.tz_localize(pytz.UTC) if start.tz is None else start.tz_convert(pytz.UTC)
+        months: Dict[str, List[str]] = {}
+        for file_path in self.chunk_files():
+            match = CHUNK_FILE_PATTERN.match(os.path.basename(file_path))
+            months.setdefault(match.group(1) if match else "", []).append(file_path)
+
+        frames = []
+        for month in sorted(months, reverse=True):
+            month_data = [
+                data for data in (self._read_csv(file_path, compact) for file_path in months[month])
+                if not data.empty
+            ]
+            frames.extend(reversed(month_data))
+            if any(data.index.min() <= start for data in month_data):
+                break
+        if not frames:
+            return pd.DataFrame()
+        logger.info(f"Loaded {len(frames)} recent data chunks since {start}")
+        return pd.concat(frames[::-1]).sort_index().drop_duplicates(keep="last")
+
     def get_latest_n_days(self, n: int) -> pd.DataFrame:
         end_date = pd.Timestamp.now(tz=pytz.UTC)
         start_date = end_date - timedelta(days=n)
@@ -187,9 +238,64 @@ class DataPipeline(metaclass=ABCMeta):
                 except ValueError:
                     continue  # 날짜 형식이 아닌 디렉토리는 무시
 
+    def compact(self) -> int:
+        """
+        저장된 chunk 파일들을 월 단위 파일 하나씩으로 다시 씁니다.
+        append 로 생긴 중복 날짜는 마지막 값만 남깁니다.
+        :return: 압축 후 파일 수
+        """
+        files = [
+            os.path.join(root, file)
+            for root, _, names in os.walk(self.base_path)
+            for file in names
+            if file.endswith(".csv")
+        ]
+        if not files:
+            logger.info(f"Nothing to compact in {self.base_path}")
+            return 0
+
+        # 다시 저장하므로 compact 설정과 관계없이 원본 dtype 으로 읽음 (float32 로 저장되면 정밀도 손실)
+        data = pd.concat([self._read_csv(file, compact=False) for file in files]).sort_index()
+        data = data[~data.index.duplicated(keep="last")]
+
+        new_files = []
+        for month_start, month_data in data.groupby(data.index.strftime("%Y-%m-01")):
+            file_path = os.path.join(self.base_path, f"{month_start}_chunk0.csv")
+            tmp_path = file_path + ".tmp"
+            with FileLock(file_path + ".lock", timeout=60) if self.use_file_lock else nullcontext():
+                month_data.to_csv(tmp_path, index=True)
+                os.replace(tmp_path, file_path)
+            new_files.append(file_path)
+
+        for file in set(files) - set(new_files):
+            with FileLock(file + ".lock", timeout=60) if self.use_file_lock else nullcontext():
+                os.remove(file)
+
+        logger.info(
+            f"Compacted {len(files)} files into {len(new_files)} monthly files "
+            f"({len(data)} rows) in {self.base_path}"
+        )
+        return len(new_files)
+
+    def chunk_files(self) -> List[str]:
+        """
+        저장된 chunk 파일 경로를 (월 시작일, chunk 번호) 순서로 반환합니다. 파일은 읽지 않습니다.
+        이름 형식이 다른 csv 는 앞쪽에 경로 순서로 둡니다.
+        """
+        keyed = []
+        for root, _, names in os.walk(self.base_path):
+            for name in names:
+                if not name.endswith(".csv"):
+                    continue
+                match = CHUNK_FILE_PATTERN.match(name)
+                key = (match.group(1), int(match.group(2))) if match else ("", -1)
+                keyed.append((key, os.path.join(root, name)))
+        return [file_path for _, file_path in sorted(keyed)]
+
     def get_latest_date(self) -> Optional[datetime.date]:
         logger.info("Getting latest date")
-        all_data = self.get_all_data()
+        # 마지막 저장 행은 가장 최근 월의 chunk 파일에 있으므로 그 월만 읽음
+        all_data = self._read_since(pd.Timestamp.max)
         if not all_data.empty:
             latest_date = all_data.index.max().date()
             logger.info(f"Latest date: {latest_date}")
@@ -19,6 +19,7 @@ class ProviderDataPipeline(DataPipeline):
         cache_days: int = 7,
         fetch_interval: int = 60,
         chunk_size: int = 10000,
+        compact: bool = False,
     ):
         """
         실시간 데이터 파이프라인 초기화
@@ -28,8 +29,9 @@ class ProviderDataPipeline(DataPipeline):
         :param cache_days: 메모리에 캐시할 날짜 수
         :param fetch_interval: 데이터 가져오기 간격 (초)
         :param chunk_size: 데이터를 저장할 청크 크기
+        :param compact: 저장된 데이터를 float32 / int32 / category dtype 으로 읽을지 여부
         """
-        super().__init__(data_provider, base_path, use_file_lock, cache_days)
+        super().__init__(data_provider, base_path, use_file_lock, cache_days, compact)
         self.fetch_interval = fetch_interval
         self.chunk_size = chunk_size
         self._current_date = pd.Timestamp.now(tz=pytz.UTC).date()
@@ -37,6 +39,9 @@ class ProviderDataPipeline(DataPipeline):
             f"ProviderDataPipeline initialized for {data_provider.symbol if data_provider else 'Unknown'}"
         )
 
+    def _cache_start(self) -> pd.Timestamp:
+        return pd.Timestamp.now(tz=pytz.UTC) - timedelta(days=self.cache_days)
+
     def fetch_data(self, **kwargs) -> pd.DataFrame:
         """새로운 데이터를 가져와 저장하고 캐시를 업데이트합니다."""
         if self.data_provider is None:
@@ -44,7 +49,8 @@ class ProviderDataPipeline(DataPipeline):
             return pd.DataFrame()
 
         logger.info(f"Fetching new data for {self.data_provider.symbol}")
-        self._cached_data = self.get_all_data()
+        # 마지막 저장일과 cache_days 캐시만 필요하므로 최근 chunk 만 읽음 (save() 로 다시 저장되므로 원본 dtype)
+        self._cached_data = self._read_since(self._cache_start(), compact=False)
         new_data = self.data_provider.get_data()
 
         if not new_data.empty:
@@ -64,11 +70,8 @@ class ProviderDataPipeline(DataPipeline):
                 self._cached_data = pd.concat(
                     [self._cached_data, new_data]
                 ).sort_index()
-                cutoff_date = pd.Timestamp.now(tz=pytz.UTC) - timedelta(
-                    days=self.cache_days
-                )
                 self._cached_data = self._cached_data.loc[
-                    self._cached_data.index >= cutoff_date
+                    self._cached_data.index >= self._cache_start()
                 ]
                 logger.info(f"Updated cache with {len(new_data)} new rows")
         else:
@@ -104,7 +107,7 @@ class ProviderDataPipeline(DataPipeline):
     def fetch_start(self, **kwargs):
         """데이터 가져오기를 시작합니다."""
         logger.info(f"Starting data fetch for {self.data_provider.symbol}")
-        self._cached_data = self.get_all_data()
+        self._cached_data = self._read_since(self._cache_start(), compact=False)  # save() 로 다시 저장됨
         if self._cached_data.empty:
             logger.info("No existing data, fetching all data")
             self._cached_data = self.data_provider.get_data()
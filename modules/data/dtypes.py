@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+from typing import Union
+from modules.logger import get_logger
+
+logger = get_logger(__name__)
+
+VOLUME_COLUMNS = ("volume",)
+INT32 = np.iinfo(np.int32)
+INT64 = np.iinfo(np.int64)
+
+
+def _volume_dtype(values: pd.Series):
+    """
+    거래량 컬럼의 정수 dtype. 모든 값이 정수이고 범위 안일 때만 반환하고, 아니면 None (float64 유지)
+    """
+    observed = values.dropna()
+    if pd.api.types.is_float_dtype(observed.dtype):
+        if not np.isfinite(observed).all() or not (observed == np.floor(observed)).all():
+            return None
+    nullable = len(observed) < len(values)
+    low, high = (observed.min(), observed.max()) if len(observed) else (0, 0)
+    if INT32.min <= low and high <= INT32.max:
+        return "Int32" if nullable else np.int32
+    if INT64.min <= low and high < INT64.max:  # float 비교라 INT64.max 는 경계에서 반올림되므로 제외
+        return "Int64" if nullable else np.int64
+    return None
+
+
+def compact_frame(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    메모리 절약형 dtype 으로 변환합니다.
+    float -> float32, volume -> int32 (범위를 넘으면 int64, NaN 이 있으면 nullable),
+    문자열(object) -> category
+    소수점이 있거나 정수 범위를 넘는 거래량은 잘리지 않도록 float64 로 유지합니다.
+    저장 파일에 다시 쓸 데이터에는 사용하지 마세요. (float32 로 정밀도가 줄어듦)
+    :param data: 원본 DataFrame
+    :return: 변환된 DataFrame
+    """
+    dtypes = {}
+    for column, dtype in data.dtypes.items():
+        if column in VOLUME_COLUMNS and pd.api.types.is_numeric_dtype(dtype):
+            volume_dtype = _volume_dtype(data[column])
+            if volume_dtype is not None:
+                dtypes[column] = volume_dtype
+        elif pd.api.types.is_float_dtype(dtype):
+            dtypes[column] = np.float32
+        elif pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype):
+            dtypes[column] = "category"
+    return data.astype(dtypes) if dtypes else data
+
+
+def preserve_dtypes(result: pd.DataFrame, like: pd.DataFrame) -> pd.DataFrame:
+    """
+    rolling 등 연산으로 float64 로 올라간 결과를 원본 float dtype 으로 되돌립니다.
+    """
+    float_dtypes = {
+        column: dtype
+        for column, dtype in like.dtypes.items()
+        if column in result.columns
+        and pd.api.types.is_float_dtype(dtype)
+        and result[column].dtype != dtype
+    }
+    return result.astype(float_dtypes) if float_dtypes else result
+
+
+def memory_mb(data: Union[pd.DataFrame, pd.Series]) -> float:
+    return float(np.sum(data.memory_usage(deep=True, index=True))) / 1024 ** 2
+
+
+def log_memory(stage: str, data: Union[pd.DataFrame, pd.Series]):
+    dtypes = data.dtypes.unique() if isinstance(data, pd.DataFrame) else [data.dtype]
+    logger.info(
+        f"[memory] {stage}: shape {data.shape}, {memory_mb(data):.2f} MB, "
+        f"dtypes {sorted(map(str, dtypes))}"
+    )
@@ -14,6 +14,8 @@ class FinanceDataReader(DataProvider):
     default time zone : UTC
     """
 
+    market = "KRX"
+
     def __init__(
         self,
         symbol: str,
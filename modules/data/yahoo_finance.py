@@ -14,6 +14,8 @@ class YahooFinance(DataProvider):
     default time zone : UTC
     """
 
+    market = "NYSE"
+
     def __init__(
         self,
         symbol: str,
@@ -1,19 +1,55 @@
 import os
+import csv
+import time
+import tempfile
 import pandas as pd
 import pymysql
+from typing import Optional
 from db_connector import DBConnector
+from connection_pool import ConnectionPool, mysql_connect
+
+INSERT_COLUMNS = (
+    'asset_id', 'trade_date', 'open', 'high', 'low', 'close', 'volume',
+    'exchange', 'asset_type', 'national', 'asset_name'
+)
+INSERT_SQL = (
+    f"INSERT INTO AggregatedDataset ({', '.join(INSERT_COLUMNS)}) "
+    f"VALUES ({', '.join(['%s'] * len(INSERT_COLUMNS))})"
+)
+INSERT_METHODS = ('executemany', 'infile')
+
+def _is_default_server(config) -> bool:
+    """
+    config 가 기본 pool (db_config) 과 같은 서버/계정인지
+    """
+    from modules.db.db_config import db_config
+    return all(config[key] == db_config.get(key) for key in ('host', 'user', 'password', 'database', 'port'))
+
 
 class AggregatedDatasetDB(DBConnector):
-    def __init__(self, db_address, user_id, pw, db_name, port):
-        self.connection = pymysql.connect(
-            host=db_address,
-            user=user_id,
-            password=pw,
-            db=db_name,
-            port=port,
-            cursorclass=pymysql.cursors.DictCursor,
-            client_flag=pymysql.constants.CLIENT.MULTI_STATEMENTS
-        )
+    def __init__(self, db_address, user_id, pw, db_name, port, pool: Optional[ConnectionPool] = None,
+                 local_infile=False):
+        """
+        :param pool: 연결을 빌려올 pool. None 이면 서버 정보가 db_config 와 같을 때 기본 공유 pool
+            (ConnectionPool.get_instance) 을 쓰고, 다른 서버이거나 local_infile 이면 이 객체 전용 pool 을 만듦
+            (공유 pool 의 연결은 db_config 서버에 local_infile 없이 연결되므로)
+        :param local_infile: 전용 pool 연결에서 LOAD DATA LOCAL INFILE 허용 (insert 의 method='infile').
+            외부 pool 을 넘기면 그 연결의 설정을 알 수 없으므로 method='infile' 을 사용할 수 없음
+        """
+        config = {
+            'host': db_address,
+            'user': user_id,
+            'password': pw,
+            'database': db_name,
+            'port': port,
+            'local_infile': local_infile,
+        }
+        self._own_pool = pool is None and (local_infile or not _is_default_server(config))
+        self._local_infile = self._own_pool and local_infile
+        if self._own_pool:
+            # 이 객체가 연결 하나를 계속 빌려 쓰므로 전용 pool 은 연결 하나
+            pool = ConnectionPool(lambda: mysql_connect(config), min_size=1, max_size=1)
+        super().__init__(pool)
 
     def select(self, where: str = None):
         """
@@ -34,43 +70,113 @@ class AggregatedDatasetDB(DBConnector):
             print(f"Error executing select: {e}")
             return None
 
-    def insert(self, data, symbol):
+    def _records(self, data, symbol):
+        """
+        DataFrame 을 INSERT 할 행 tuple 목록으로 변환 (컬럼 단위 변환, NaN -> NULL)
+        """
+        frame = pd.DataFrame({
+            'asset_id': data.index + 1,  # 자동 증가 값 대신 인덱스 + 1 사용
+            'trade_date': pd.to_datetime(data['date']).dt.date,  # 시간 부분 제거
+            'open': data['open'],
+            'high': data['high'],
+            'low': data['low'],
+            'close': data['close'],
+            'volume': data['volume'],
+            'exchange': 'NASDAQ',  # 고정값으로 설정
+            'asset_type': 'EQUITY',  # 고정값으로 설정
+            'national': 'US',  # 고정값으로 설정
+            'asset_name': symbol  # 심볼명 설정
+        }, columns=INSERT_COLUMNS)
+        frame = frame.astype(object).where(frame.notna(), None)
+        return list(frame.itertuples(index=False, name=None))
+
+    def insert(self, data, symbol, batch_size=1000, method='executemany'):
         """
         Yahoo Finance 데이터를 AggregatedDataset 테이블에 삽입.
-        
+        batch_size 행씩 한 transaction 으로 넣습니다. batch 가 실패하면 rollback 한 뒤 그 batch 를 한 행씩 다시 넣으므로
+        (ex: 중복 키) 실패한 행만 빠지고, 다음 실행의 get_last_date 이전에 빈 구간이 생기지 않습니다.
+
         :param data: Yahoo Finance 데이터 DataFrame
         :param symbol: 심볼 이름
+        :param batch_size: 배치 크기 (transaction 단위)
+        :param method: 'executemany' (multi-row VALUES) 또는 'infile'
+            (LOAD DATA LOCAL INFILE. 이 객체의 전용 pool 을 local_infile=True 로 만든 경우만 가능)
+        :return: 삽입한 행 수
         """
+        if method not in INSERT_METHODS:
+            raise ValueError(f"Invalid insert method: {method}. Use one of {INSERT_METHODS}")
+        if method == 'infile' and not self._local_infile:
+            raise ValueError("method='infile' requires local_infile=True and the object's own connection pool")
         if data.empty:
             print(f"No data found for {symbol}")
-            return
-
-        data = data.copy()  # 경고를 피하기 위해 데이터의 복사본을 생성
-        data.loc[:, 'date'] = pd.to_datetime(data['date'])  # date 컬럼을 datetime 타입으로 변환
-
-        for index, row in data.iterrows():
-            record = {
-                'asset_id': index + 1,  # 자동 증가 값 대신 인덱스 + 1 사용
-                'trade_date': row['date'].date(),  # .date()를 사용하여 시간 부분 제거
-                'open': row['open'],
-                'high': row['high'],
-                'low': row['low'],
-                'close': row['close'],
-                'volume': row['volume'],
-                'exchange': 'NASDAQ',  # 고정값으로 설정
-                'asset_type': 'EQUITY',  # 고정값으로 설정
-                'national': 'US',  # 고정값으로 설정
-                'asset_name': symbol  # 심볼명 설정
-            }
+            return 0
+
+        records = self._records(data, symbol)
+        inserted = 0
+        for start in range(0, len(records), batch_size):
+            batch = records[start:start + batch_size]
             try:
                 with self.connection.cursor() as cursor:
-                    columns = ', '.join(record.keys())
-                    values = ', '.join(['%s'] * len(record))
-                    sql = f"INSERT INTO AggregatedDataset ({columns}) VALUES ({values});"
-                    cursor.execute(sql, tuple(record.values()))
-                    self.connection.commit()
-            except pymysql.MySQLError as e:
-                print(f"Error executing insert: {e}")
+                    if method == 'infile':
+                        rows = self._load_infile(cursor, batch)
+                    else:
+                        # pymysql 은 INSERT ... VALUES 의 executemany 를 multi-row VALUES 문으로 보냄
+                        rows = cursor.executemany(INSERT_SQL, batch)
+                self.connection.commit()
+            except (pymysql.MySQLError, OSError) as e:
+                print(f"Error executing insert (rows {start} to {start + len(batch)}), retrying row by row: {e}")
+                self._rollback()
+                rows = self._insert_rows(batch, start)
+            else:
+                if rows < len(batch):
+                    # LOAD DATA LOCAL INFILE 은 중복 키 행을 오류 없이 건너뜀
+                    print(f"Skipped {len(batch) - rows} rows (rows {start} to {start + len(batch)})")
+            inserted += rows
+        return inserted
+
+    def _insert_rows(self, batch, start):
+        """
+        batch 를 한 행씩 넣고 성공한 행 수를 반환합니다. (실패한 행만 건너뜀)
+        """
+        inserted = 0
+        for i, record in enumerate(batch, start=start):
+            try:
+                with self.connection.cursor() as cursor:
+                    cursor.execute(INSERT_SQL, record)
+                self.connection.commit()
+                inserted += 1
+            except (pymysql.MySQLError, OSError) as e:
+                print(f"Error executing insert (row {i}): {e}")
+                self._rollback()
+        return inserted
+
+    def _rollback(self):
+        """
+        실패한 transaction 을 rollback 합니다.
+        연결이 끊겨 rollback 도 실패하면 그 연결을 pool 에 반납(버려짐)하고 새 연결을 빌립니다.
+        """
+        try:
+            self.connection.rollback()
+        except Exception as e:
+            print(f"Error executing rollback, reconnecting: {e}")
+            self._pool.release(self.connection)
+            self.connection = self._pool.acquire()
+
+    def _load_infile(self, cursor, batch):
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', newline='', delete=False) as file:
+            csv.writer(file).writerows(
+                [r'\N' if value is None else value for value in record] for record in batch
+            )
+        try:
+            return cursor.execute(
+                "LOAD DATA LOCAL INFILE %s INTO TABLE AggregatedDataset "
+                "FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' "
+                "LINES TERMINATED BY '\\r\\n' "
+                f"({', '.join(INSERT_COLUMNS)});",
+                (file.name,)
+            )
+        finally:
+            os.remove(file.name)
 
     def update(self, data: dict, where: str):
         """
@@ -103,8 +209,9 @@ class AggregatedDatasetDB(DBConnector):
             print(f"Error executing delete: {e}")
 
     def close(self):
-        if self.connection:
-            self.connection.close()
+        super().close()
+        if self._own_pool:
+            self._pool.close()
 
 def get_last_date(db, symbol):
     """
@@ -120,27 +227,32 @@ def get_last_date(db, symbol):
         return pd.to_datetime(result[0]['last_date'], utc=True)  # UTC 시간대로 변환
     return None
 
-def batch_insert(db, data, symbol, batch_size=1000):
+def batch_insert(db, data, symbol, batch_size=1000, method='executemany'):
     """
-    데이터를 배치로 나누어 데이터베이스에 삽입.
+    데이터를 배치로 나누어 데이터베이스에 삽입하고 처리량을 출력.
     
     :param db: 데이터베이스 연결 객체
     :param data: 삽입할 데이터 DataFrame
     :param symbol: 심볼 이름
-    :param batch_size: 배치 크기
+    :param batch_size: 배치 크기 (transaction 단위)
+    :param method: 'executemany' 또는 'infile' (AggregatedDatasetDB.insert 참고)
+    :return: {'rows', 'seconds', 'rows_per_sec'}
     """
-    for start in range(0, len(data), batch_size):
-        end = start + batch_size
-        batch_data = data.iloc[start:end]
-        db.insert(batch_data, symbol)
-        print(f"Inserted batch {start} to {end} for symbol {symbol}")
+    started = time.perf_counter()
+    rows = db.insert(data, symbol, batch_size=batch_size, method=method)
+    seconds = time.perf_counter() - started
+    rows_per_sec = rows / seconds if seconds > 0 else 0.0
+    print(f"Inserted {rows} rows for symbol {symbol} in {seconds:.2f}s ({rows_per_sec:,.0f} rows/sec)")
+    return {'rows': rows, 'seconds': seconds, 'rows_per_sec': rows_per_sec}
 
-def main(data_path: str, db_config: dict):
+def main(data_path: str, db_config: dict, method: str = 'executemany', batch_size: int = 1000):
     """
     데이터 폴더 내의 모든 Yahoo Finance 데이터를 읽어 데이터베이스에 삽입.
     
     :param data_path: Yahoo Finance 데이터가 저장된 폴더 경로
     :param db_config: 데이터베이스 설정 딕셔너리
+    :param method: 'executemany' 또는 'infile' (AggregatedDatasetDB.insert 참고)
+    :param batch_size: 배치 크기 (transaction 단위)
     """
     # 데이터베이스 연결 설정
     db = AggregatedDatasetDB(
@@ -148,10 +260,13 @@ def main(data_path: str, db_config: dict):
         user_id=db_config['user_id'],
         pw=db_config['pw'],
         db_name=db_config['db_name'],
-        port=int(db_config.get('port', 3307))
+        port=int(db_config.get('port', 3307)),
+        local_infile=method == 'infile'
     )
 
     # 데이터 폴더 내의 모든 파일을 읽어 데이터베이스에 삽입
+    started = time.perf_counter()
+    total_rows = 0
     for country in ['KOR', 'USA']:
         country_path = os.path.join(data_path, country)
         if os.path.isdir(country_path):
@@ -159,20 +274,28 @@ def main(data_path: str, db_config: dict):
                 symbol_path = os.path.join(country_path, symbol)
                 if os.path.isdir(symbol_path):
                     last_date = get_last_date(db, symbol)
-                    for file in os.listdir(symbol_path):
-                        file_path = os.path.join(symbol_path, file)
-                        if file.endswith('.csv'):
-                            data = pd.read_csv(file_path).drop_duplicates(keep='last')
-                            data['date'] = pd.to_datetime(data['date'], utc=True)  # UTC 시간대로 변환
-                            if last_date:
-                                data = data[data['date'] > last_date]
-                            if not data.empty:
-                                try:
-                                    batch_insert(db, data, symbol)
-                                except Exception as e:
-                                    print(f"Error inserting data from {file}: {e}")
+                    files = [
+                        os.path.join(symbol_path, file)
+                        for file in sorted(os.listdir(symbol_path)) if file.endswith('.csv')
+                    ]
+                    if not files:
+                        continue
+                    # 종목의 파일을 합쳐 한 번에 batch 로 삽입
+                    data = pd.concat([pd.read_csv(file_path) for file_path in files])
+                    data = data.drop_duplicates(keep='last')
+                    data['date'] = pd.to_datetime(data['date'], utc=True)  # UTC 시간대로 변환
+                    if last_date:
+                        data = data[data['date'] > last_date]
+                    if not data.empty:
+                        try:
+                            total_rows += batch_insert(db, data, symbol, batch_size, method)['rows']
+                        except Exception as e:
+                            print(f"Error inserting data for {symbol}: {e}")
     db.close()
 
+    seconds = time.perf_counter() - started
+    print(f"Inserted {total_rows} rows in {seconds:.2f}s ({total_rows / seconds if seconds > 0 else 0:,.0f} rows/sec)")
+
 if __name__ == "__main__":
     db_config = {
         'db_address': 'project-db-campus.smhrd.com',
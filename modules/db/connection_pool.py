@@ -0,0 +1,304 @@
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+from modules.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def ping_connection(connection) -> bool:
+    """
+    연결이 살아 있는지 확인합니다. pymysql 연결은 ping, 그 외(ex: sqlite3)는 SELECT 1
+    """
+    try:
+        if hasattr(connection, "ping"):
+            connection.ping(reconnect=False)
+        else:
+            connection.execute("SELECT 1")
+        return True
+    except Exception:
+        return False
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+class ConnectionPool:
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls):
+        """
+        db_config 의 MySQL 서버에 연결하는 기본 pool
+        """
+        with cls._instance_lock:
+            if cls._instance is None:
+                from modules.db.db_config import db_config, pool_config
+                cls._instance = cls(lambda: mysql_connect(db_config), **pool_config)
+            return cls._instance
+
+    @classmethod
+    def instance_metrics(cls) -> Dict[str, Any]:
+        """
+        기본 pool 의 metrics. 아직 만들어지지 않았으면 연결하지 않고 빈 dict
+        """
+        with cls._instance_lock:
+            instance = cls._instance
+        return instance.metrics() if instance is not None else {}
+
+    def __init__(
+        self,
+        connect: Callable[[], Any],
+        min_size: int = 1,
+        max_size: int = 10,
+        recycle: Optional[float] = 3600,
+        timeout: Optional[float] = 30,
+        ping: Callable[[Any], bool] = ping_connection,
+    ):
+        """
+        thread-safe DB 연결 pool.
+        빌려줄 때 health check (ping) 를 하고, recycle 초보다 오래된 연결은 닫고 새로 만듭니다.
+        :param connect: 새 연결을 만드는 함수 (ex: lambda: pymysql.connect(...), lambda: sqlite3.connect(...))
+        :param min_size: 유지할 최소 연결 수 (생성 시 미리 연결하고, 연결을 버리면 다시 채움)
+        :param max_size: 최대 연결 수 (빌려준 연결 포함)
+        :param recycle: 연결 최대 사용 시간(초). None 이면 재생성하지 않음
+        :param timeout: 연결이 없을 때 기다릴 최대 시간(초). None 이면 무한 대기
+        :param ping: 연결 health check 함수
+        """
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError(f"Invalid pool size: min_size={min_size}, max_size={max_size}")
+        self._connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.recycle = recycle
+        self.timeout = timeout
+        self._ping = ping
+
+        self._idle: Deque[Tuple[Any, float]] = deque()  # (연결, 생성 시각)
+        self._created_at: Dict[int, float] = {}  # id(연결) -> 생성 시각 (빌려준 연결 포함)
+        self._pending = 0  # 생성 중인 연결 수
+        self._condition = threading.Condition()
+        self._closed = False
+        self._stats = {
+            "created": 0,
+            "closed": 0,
+            "acquired": 0,
+            "released": 0,
+            "recycled": 0,
+            "health_check_failures": 0,
+            "timeouts": 0,
+            "wait_seconds": 0.0,
+        }
+
+        with self._condition:
+            for _ in range(min_size):
+                self._idle.append(self._new_connection())
+
+    @property
+    def size(self) -> int:
+        """빌려준 연결과 생성 중인 연결을 포함한 현재 연결 수"""
+        return len(self._created_at) + self._pending
+
+    def _new_connection(self) -> Tuple[Any, float]:
+        connection = self._connect()
+        created_at = time.monotonic()
+        self._created_at[id(connection)] = created_at
+        self._stats["created"] += 1
+        return connection, created_at
+
+    def _discard(self, connection):
+        self._created_at.pop(id(connection), None)
+        self._stats["closed"] += 1
+        self._condition.notify()
+        try:
+            connection.close()
+        except Exception as e:
+            logger.debug(f"Failed to close connection: {e}")
+
+    def _expired(self, created_at: float) -> bool:
+        return self.recycle is not None and time.monotonic() - created_at > self.recycle
+
+    def acquire(self, timeout: Optional[float] = -1):
+        """
+        연결을 빌립니다. 사용 후 release 해야 합니다.
+        연결 생성과 health check 는 lock 밖에서 하므로 다른 thread 의 반납/대여를 막지 않습니다.
+        :param timeout: 최대 대기 시간(초). 생략하면 pool 의 timeout
+        """
+        timeout = self.timeout if timeout == -1 else timeout
+        started = time.monotonic()
+        deadline = None if timeout is None else started + timeout
+        discarded = False
+        while True:
+            connection, created_at = self._reserve(timeout, deadline)
+            if connection is None:
+                # 새 연결 자리만 예약된 상태
+                try:
+                    connection = self._connect()
+                finally:
+                    with self._condition:
+                        self._pending -= 1
+                        if connection is None:
+                            self._condition.notify()
+                with self._condition:
+                    self._created_at[id(connection)] = time.monotonic()
+                    self._stats["created"] += 1
+                    connection = self._checkout(connection, started)
+                break
+
+            if self._expired(created_at):
+                with self._condition:
+                    self._stats["recycled"] += 1
+                    self._discard(connection)
+                discarded = True
+            elif not self._ping(connection):
+                with self._condition:
+                    self._stats["health_check_failures"] += 1
+                    self._discard(connection)
+                discarded = True
+            else:
+                with self._condition:
+                    connection = self._checkout(connection, started)
+                break
+
+        if discarded:
+            self._replenish()
+        return connection
+
+    def _reserve(self, timeout: Optional[float], deadline: Optional[float]) -> Tuple[Any, float]:
+        """
+        쉬고 있는 연결을 꺼내거나 새 연결 자리를 예약합니다. (예약이면 (None, 0))
+        """
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Connection pool is closed")
+                if self._idle:
+                    return self._idle.pop()  # 최근에 반납된 연결부터 사용
+                if self.size < self.max_size:
+                    self._pending += 1
+                    return None, 0.0
+
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    self._stats["timeouts"] += 1
+                    raise PoolTimeout(
+                        f"No connection available within {timeout}s (max_size={self.max_size})"
+                    )
+                self._condition.wait(remaining)
+
+    def _replenish(self):
+        """
+        버려진 연결 때문에 min_size 보다 적어졌으면 새 연결을 만들어 채웁니다. (연결은 lock 밖에서)
+        연결에 실패하면 다음 대여 때 다시 만들도록 그대로 둡니다.
+        """
+        while True:
+            with self._condition:
+                if self._closed or self.size >= self.min_size:
+                    return
+                self._pending += 1
+            connection = None
+            try:
+                connection = self._connect()
+            except Exception as e:
+                logger.warning(f"Failed to replenish connection pool: {e}")
+                return
+            finally:
+                with self._condition:
+                    self._pending -= 1
+                    if connection is not None:
+                        created_at = time.monotonic()
+                        self._created_at[id(connection)] = created_at
+                        self._stats["created"] += 1
+                        self._idle.appendleft((connection, created_at))
+                    self._condition.notify()
+
+    def _checkout(self, connection, started: float):
+        self._stats["acquired"] += 1
+        self._stats["wait_seconds"] += time.monotonic() - started
+        return connection
+
+    def release(self, connection):
+        """
+        빌린 연결을 반납합니다. 끝나지 않은 transaction 은 rollback 합니다.
+        """
+        with self._condition:
+            created_at = self._created_at.get(id(connection))
+        if created_at is None:
+            logger.warning("Released connection does not belong to this pool")
+            return
+        try:
+            connection.rollback()
+            healthy = True
+        except Exception:
+            healthy = False
+
+        with self._condition:
+            self._stats["released"] += 1
+            discarded = self._closed or not healthy or self._expired(created_at)
+            if discarded:
+                if healthy and not self._closed:
+                    self._stats["recycled"] += 1
+                self._discard(connection)
+            else:
+                self._idle.append((connection, created_at))
+            self._condition.notify()
+        if discarded:
+            self._replenish()
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = -1):
+        connection = self.acquire(timeout)
+        try:
+            yield connection
+        finally:
+            self.release(connection)
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._condition:
+            metrics = dict(self._stats)
+            metrics.update(
+                size=self.size,
+                idle=len(self._idle),
+                in_use=self.size - len(self._idle),
+                min_size=self.min_size,
+                max_size=self.max_size,
+            )
+        metrics["average_wait_seconds"] = (
+            metrics["wait_seconds"] / metrics["acquired"] if metrics["acquired"] else 0.0
+        )
+        return metrics
+
+    def close(self):
+        """
+        쉬고 있는 연결을 닫습니다. 빌려준 연결은 반납될 때 닫힙니다.
+        """
+        with self._condition:
+            self._closed = True
+            while self._idle:
+                connection, _ = self._idle.pop()
+                self._discard(connection)
+            self._condition.notify_all()
+
+
+def mysql_connect(config: Dict[str, Any]):
+    """
+    db_config 형식(host, user, password, database, port)의 설정으로 pymysql 연결을 만듭니다.
+    """
+    import pymysql
+
+    return pymysql.connect(
+        host=config['host'],
+        user=config['user'],
+        password=config['password'],
+        db=config['database'],
+        port=config['port'],
+        cursorclass=pymysql.cursors.DictCursor,
+        # 다음 줄을 추가하여 쿼리 로그를 활성화합니다.
+        client_flag=pymysql.constants.CLIENT.MULTI_STATEMENTS,
+        # LOAD DATA LOCAL INFILE 사용 여부
+        local_infile=config.get('local_infile', False)
+    )
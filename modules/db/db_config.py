@@ -7,3 +7,11 @@ db_config = {
     'name': 'MYSQL'
 }
 
+
+# ConnectionPool 설정 (modules.db.connection_pool 참고)
+pool_config = {
+    'min_size': 1,
+    'max_size': 10,
+    'recycle': 3600,  # 초
+    'timeout': 30,  # 초
+}
@@ -1,20 +1,15 @@
-import pymysql
 from abc import ABC, abstractmethod
-from modules.db.db_config import db_config
+from typing import Optional
+from modules.db.connection_pool import ConnectionPool
 
 class DBConnector(ABC):
 
-    def __init__(self):
-        self.connection = pymysql.connect(
-            host=db_config['host'],
-            user=db_config['user'],
-            password=db_config['password'],
-            db=db_config['database'],
-            port=db_config['port'],
-            cursorclass=pymysql.cursors.DictCursor,
-            # 다음 줄을 추가하여 쿼리 로그를 활성화합니다.
-            client_flag=pymysql.constants.CLIENT.MULTI_STATEMENTS
-        )
+    def __init__(self, pool: Optional[ConnectionPool] = None):
+        """
+        :param pool: 연결을 빌려올 pool. None 이면 db_config 의 기본 pool
+        """
+        self._pool = pool or ConnectionPool.get_instance()
+        self.connection = self._pool.acquire()
 
     def execute_query(self, query, params=None):
         with self.connection.cursor() as cursor:
@@ -35,5 +30,18 @@ class DBConnector(ABC):
         pass
 
     def close(self):
+        # 연결을 닫지 않고 pool 에 반납
         if self.connection:
-            self.connection.close()
+            self._pool.release(self.connection)
+            self.connection = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __del__(self):
+        # close 하지 않은 연결이 pool 에서 새지 않도록 반납
+        if getattr(self, "connection", None) is not None and getattr(self, "_pool", None) is not None:
+            self.close()
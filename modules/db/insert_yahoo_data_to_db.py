@@ -1,21 +1,6 @@
 import os
 import pandas as pd
-from aggregated_dataset_db import AggregatedDatasetDB
-
-def batch_insert(db, data, symbol, batch_size=1000):
-    """
-    데이터를 배치로 나누어 데이터베이스에 삽입.
-    
-    :param db: 데이터베이스 연결 객체
-    :param data: 삽입할 데이터 DataFrame
-    :param symbol: 심볼 이름
-    :param batch_size: 배치 크기
-    """
-    for start in range(0, len(data), batch_size):
-        end = start + batch_size
-        batch_data = data.iloc[start:end]
-        db.insert(batch_data, symbol)
-        print(f"Inserted batch {start} to {end} for symbol {symbol}")
+from aggregated_dataset_db import AggregatedDatasetDB, batch_insert
 
 def get_last_date(db, symbol):
     """
@@ -53,9 +53,17 @@ class StrategyDBConnector(DBConnector):
             self.connection.rollback()
 
     def insert_strategy_result(self, data: dict):
+        """
+        전략 결과 저장. 같은 (실행일, 국가, 투자 유형) 결과가 있으면 교체하므로 재실행해도 중복되지 않습니다.
+        """
         data = prepare_data(data)
         try:
             with self.connection.cursor() as cursor:
+                cursor.execute(
+                    "DELETE FROM Strategy_pool "
+                    "WHERE DATE(execute_date) = %s AND national = %s AND invest_type = %s",
+                    (data.get("execute_date"), data.get("national"), data.get("invest_type")),
+                )
                 columns = ", ".join(data.keys())
                 values = ", ".join(["%s"] * len(data))
                 sql = f"INSERT INTO Strategy_pool ({columns}) VALUES ({values})"
@@ -0,0 +1,70 @@
+import os
+import json
+import hashlib
+import pandas as pd
+from typing import Any, Iterable, Union
+from modules.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def fingerprint_params(params: Any) -> str:
+    """
+    파라미터(dict, list 등)의 내용 기반 fingerprint
+    :param params: JSON 으로 직렬화 가능한 객체 (불가능한 값은 str 로 변환)
+    :return: sha1 hex digest
+    """
+    payload = json.dumps(params, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def fingerprint_frame(data: Union[pd.DataFrame, pd.Series]) -> str:
+    """
+    DataFrame 의 인덱스, 컬럼, 값 기반 fingerprint
+    :param data: 대상 DataFrame / Series
+    :return: sha1 hex digest
+    """
+    digest = hashlib.sha1()
+    if isinstance(data, pd.DataFrame):
+        digest.update(",".join(map(str, data.columns)).encode("utf-8"))
+    digest.update(str(data.shape).encode("utf-8"))
+    digest.update(
+        pd.util.hash_pandas_object(data, index=True).values.tobytes()
+    )
+    return digest.hexdigest()
+
+
+def fingerprint_files(paths: Iterable[str], content: bool = False) -> str:
+    """
+    파일/디렉토리 목록의 fingerprint.
+    기본은 (경로, 크기, 수정시각) 기반이며, content=True 이면 파일 내용까지 해싱한다.
+    :param paths: 파일 또는 디렉토리 경로 목록
+    :param content: 파일 내용 해싱 여부
+    :return: sha1 hex digest
+    """
+    digest = hashlib.sha1()
+    for path in sorted(paths):
+        if os.path.isdir(path):
+            files = sorted(
+                os.path.join(root, file)
+                for root, _, names in os.walk(path)
+                for file in names
+                if not file.endswith(".lock")
+            )
+        elif os.path.exists(path):
+            files = [path]
+        else:
+            logger.debug(f"Fingerprint target does not exist: {path}")
+            digest.update(f"{path}:missing".encode("utf-8"))
+            continue
+
+        for file in files:
+            stat = os.stat(file)
+            digest.update(f"{file}:{stat.st_size}".encode("utf-8"))
+            if content:
+                with open(file, "rb") as f:
+                    for block in iter(lambda: f.read(1 << 20), b""):
+                        digest.update(block)
+            else:
+                digest.update(str(stat.st_mtime_ns).encode("utf-8"))
+    return digest.hexdigest()
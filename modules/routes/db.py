@@ -0,0 +1,10 @@
+from flask import Blueprint, jsonify
+from modules.db.connection_pool import ConnectionPool
+
+db_bp = Blueprint("db", __name__)
+
+
+@db_bp.route("/db/pool-metrics", methods=["GET"])
+def get_pool_metrics():
+    # 아직 DB 를 쓰지 않았으면 metrics 조회만으로 연결을 만들지 않음
+    return jsonify(ConnectionPool.instance_metrics())
@@ -0,0 +1,41 @@
+from flask import Blueprint, request, jsonify
+from modules.strategy.service import StrategyService
+
+# 전략 pool 을 시작할 때 읽어 메모리에 유지하는 서비스 전용 blueprint.
+# app.py 에는 등록하지 않고 runners/run_strategy_service.py 의 로컬 서버에서만 사용합니다.
+strategy_bp = Blueprint("strategy", __name__)
+
+
+@strategy_bp.route("/strategy/pools", methods=["GET"])
+def get_pools():
+    return jsonify(StrategyService.get_instance().status())
+
+
+@strategy_bp.route("/strategy/select", methods=["POST"])
+def select_strategy():
+    """
+    body: {"pool": "kor", "date": "2024-07-01" (생략 시 현재), "preference": "balanced"}
+    """
+    data = request.get_json(silent=True) or {}
+    pool = data.get("pool")
+    if not pool:
+        return jsonify({"error": "pool 이 제공되지 않았습니다."}), 400
+    try:
+        result = StrategyService.get_instance().select(
+            pool, data.get("date"), data.get("preference", "balanced")
+        )
+    except KeyError:
+        return jsonify({"error": f"등록되지 않은 pool 입니다: {pool}"}), 404
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify(result)
+
+
+@strategy_bp.route("/strategy/refresh", methods=["POST"])
+def refresh_strategy():
+    data = request.get_json(silent=True) or {}
+    try:
+        added = StrategyService.get_instance().refresh(data.get("pool"))
+    except KeyError:
+        return jsonify({"error": f"등록되지 않은 pool 입니다: {data.get('pool')}"}), 404
+    return jsonify({"added_sessions": added})
@@ -0,0 +1,214 @@
+import warnings
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Optional, Union
+from datetime import datetime
+from modules.data.calendar import TradingDayIndex
+from modules.strategy.core import ValueBasedStrategy
+from modules.strategy.metrics import batch_metrics
+from modules.strategy.selection import select_matrix
+from modules.strategy.utils import portfolio_metrics
+from modules.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def rebalance_positions(
+    index: pd.DatetimeIndex,
+    rebalance: Union[int, str],
+    start: int = 0,
+) -> np.ndarray:
+    """
+    리밸런싱 날짜의 행 위치 목록
+    :param index: 거래일 인덱스
+    :param rebalance: 정수면 N 거래일마다, 문자열이면 기간 단위(ex: "W", "M", "Q")의 첫 거래일
+    :param start: 첫 리밸런싱이 가능한 행 위치
+    """
+    if isinstance(rebalance, (int, np.integer)):
+        if rebalance < 1:
+            raise ValueError(f"rebalance must be >= 1, input : {rebalance}")
+        return np.arange(start, len(index), rebalance)
+
+    local_index = index.tz_localize(None) if index.tz is not None else index
+    periods = local_index.to_period(rebalance)
+    first_of_period = np.flatnonzero(np.r_[True, periods[1:] != periods[:-1]])
+    return first_of_period[first_of_period >= start]
+
+
+def _as_index_timestamp(date: datetime, index: pd.DatetimeIndex) -> pd.Timestamp:
+    date = pd.Timestamp(date)
+    if index.tz is not None and date.tz is None:
+        return date.tz_localize(index.tz)
+    if index.tz is None and date.tz is not None:
+        return date.tz_convert(None)
+    return date
+
+
+class WalkForwardBacktest:
+    def __init__(
+        self,
+        strategy: ValueBasedStrategy,
+        rebalance: Union[int, str] = "M",
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ):
+        """
+        리밸런싱 날짜마다 그 날짜를 실행일로 전략을 실행했을 때와 같은 학습 구간
+        (set_dates 와 같은 TradingDayIndex.window_bounds 구간)으로 종목을 고르고
+        다음 리밸런싱 날짜까지 동일 비중으로 보유하는 walk-forward 백테스트.
+        정렬된 가격 데이터와 알고리즘의 rolling_values 를 전체 기간에 대해 한 번만 계산해
+        모든 리밸런싱 단계에서 재사용합니다.
+        :param strategy: 실행할 전략 (select_stocks 로 종목 선택)
+        :param rebalance: 정수면 N 거래일마다, 문자열이면 기간 단위(ex: "W", "M", "Q")의 첫 거래일
+        :param start_date: 백테스트 시작일. None 이면 학습 구간이 확보되는 첫 날짜
+        :param end_date: 백테스트 종료일. None 이면 데이터 마지막 날짜
+        """
+        self.strategy = strategy
+        self.rebalance = rebalance
+        self.start_date = start_date
+        self.end_date = end_date
+
+    def get_params(self) -> Dict[str, Any]:
+        return {
+            "strategy": self.strategy.get_params(),
+            "rebalance": self.rebalance,
+            "start_date": self.start_date,
+            "end_date": self.end_date,
+        }
+
+    def _train_bounds(self, data: pd.DataFrame, positions: np.ndarray) -> np.ndarray:
+        """
+        리밸런싱 날짜별 학습 구간 [start, stop) 행 위치 (리밸런싱 날짜 수 x 2).
+        리밸런싱 날짜는 이미 거래일 라벨이므로 달력 변환 없이 위치를 찾습니다.
+        """
+        day_index = TradingDayIndex(data.index)
+        train_period, valid_period = self.strategy.train_period, self.strategy.valid_period
+        return np.array(
+            [day_index.window_bounds(data.index[position], train_period, valid_period)[0] for position in positions],
+            dtype=int,
+        ).reshape(-1, 2)
+
+    def _check_selection(self, data: pd.DataFrame, position: int, selected) -> bool:
+        """
+        position 의 선택이 전략 실행과 같은 경로(학습 구간 prepare_data -> calculate_values -> select_stocks)의
+        선택과 같은지 확인합니다. 다르면 경고를 남깁니다.
+        """
+        algo = self.strategy.algo
+        (start, stop), = self._train_bounds(data, np.array([position]))
+        values = algo.calculate_values(algo.prepare_data(data.iloc[start:stop]))
+        expected = self.strategy.select_stocks(values.dropna()) if values.notna().any() else []
+        if list(expected) != list(selected):
+            logger.warning(
+                f"Backtest selection on {data.index[position]} differs from strategy execution: "
+                f"{list(selected)} != {list(expected)}"
+            )
+            return False
+        return True
+
+    def _scores(self, data: pd.DataFrame, positions: np.ndarray) -> pd.DataFrame:
+        """
+        각 리밸런싱 날짜의 학습 구간으로 계산한 점수 (리밸런싱 날짜 x 종목)
+        """
+        algo = self.strategy.algo
+        bounds = self._train_bounds(data, positions)
+        if hasattr(algo, "rolling_values"):
+            # 학습 구간 마지막 행으로 끝나는 rolling_values 행 (학습 구간 길이는 train_period + 1)
+            scores = algo.rolling_values(data, self.strategy.train_period + 1)
+            return scores.iloc[bounds[:, 1] - 1].set_axis(data.index[positions])
+
+        rows = [algo.calculate_values(algo.prepare_data(data.iloc[start:stop])) for start, stop in bounds]
+        return pd.DataFrame(rows, index=data.index[positions])
+
+    def _select(self, scores: pd.DataFrame) -> pd.Series:
+        """
+        모든 리밸런싱 날짜의 선택 종목. 선택 규칙 파라미터가 있는 전략은 한 번의 행렬 연산으로 계산
+        """
+        strategy = self.strategy
+        if all(hasattr(strategy, key) for key in ("selection_method", "selection_param", "min_stocks", "max_stocks")):
+            return select_matrix(
+                scores,
+                strategy.selection_method,
+                strategy.selection_param,
+                strategy.min_stocks,
+                strategy.max_stocks,
+            )
+        return pd.Series(
+            [
+                strategy.select_stocks(values.dropna()) if values.notna().any() else []
+                for _, values in scores.iterrows()
+            ],
+            index=scores.index,
+            dtype=object,
+        )
+
+    def run(self) -> Dict[str, Any]:
+        """
+        :return: {
+            "selections": 리밸런싱 날짜 -> 선택 종목 목록 (Series),
+            "returns": 일별 포트폴리오 수익률,
+            "equity_curve": 누적 자산 곡선 (시작 1.0),
+            "performance": 성과 지표,
+            "period_performance": 리밸런싱 구간별 성과 지표 (DataFrame),
+        }
+        """
+        if self.strategy.data is None:
+            self.strategy.set_data()
+        data = self.strategy.data
+        if self.end_date is not None:
+            data = data.loc[: _as_index_timestamp(self.end_date, data.index)]
+
+        train_period = self.strategy.train_period
+        # 검증 구간(valid_period + 1)과 학습 구간(train_period + 1)이 모두 확보되는 첫 행
+        first = train_period + self.strategy.valid_period + 2
+        if self.start_date is not None:
+            first = max(first, int(data.index.searchsorted(_as_index_timestamp(self.start_date, data.index))))
+        if first >= len(data):
+            raise ValueError(
+                f"Not enough data for train_period {train_period}: {len(data)} rows"
+            )
+
+        positions = rebalance_positions(data.index, self.rebalance, start=first)
+        scores = self._scores(data, positions)
+
+        returns = data.pct_change(fill_method=None).to_numpy(dtype=float)
+        column_index = pd.Index(data.columns)
+        portfolio_returns = np.zeros(len(data))
+        selections = {}
+
+        bounds = np.r_[positions, len(data)]
+        selected_matrix = self._select(scores)
+        if len(positions) and hasattr(self.strategy.algo, "rolling_values"):
+            # rolling_values 경로가 전략 실행 경로와 같은 선택을 하는지 마지막 리밸런싱 날짜로 확인
+            self._check_selection(data, positions[-1], selected_matrix.iloc[-1])
+        for start, end, (date, selected) in zip(bounds[:-1], bounds[1:], selected_matrix.items()):
+            selections[date] = selected
+            if not selected:
+                logger.warning(f"No scores on {date}, holding cash")
+                continue
+            held = returns[start:end, column_index.get_indexer(selected)]
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", category=RuntimeWarning)
+                period_returns = np.nanmean(held, axis=1) if held.size else np.zeros(end - start)
+            portfolio_returns[start:end] = np.nan_to_num(period_returns)
+
+        # 구간별 수익률을 (일 x 구간) 행렬로 모아 성과 지표를 한 번에 계산
+        period_returns = np.full((len(data) - bounds[0], len(positions)), np.nan)
+        for k, (start, end) in enumerate(zip(bounds[:-1], bounds[1:])):
+            period_returns[start - bounds[0]:end - bounds[0], k] = portfolio_returns[start:end]
+        period_performance = batch_metrics(period_returns).set_axis(data.index[positions])
+
+        portfolio_returns = pd.Series(
+            portfolio_returns[positions[0]:], index=data.index[positions[0]:]
+        ) if len(positions) else pd.Series(dtype=float)
+        equity_curve = (1 + portfolio_returns).cumprod()
+        logger.info(
+            f"Walk-forward backtest finished: {len(positions)} rebalances, "
+            f"{len(portfolio_returns)} days"
+        )
+        return {
+            "selections": pd.Series(selections, dtype=object),
+            "returns": portfolio_returns,
+            "equity_curve": equity_curve,
+            "performance": portfolio_metrics(portfolio_returns),
+            "period_performance": period_performance,
+        }
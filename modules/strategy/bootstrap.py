@@ -0,0 +1,79 @@
+import warnings
+import numpy as np
+import pandas as pd
+from typing import Optional, Union
+from modules.strategy.metrics import batch_metrics
+
+BOOTSTRAP_METRICS = ("sharpe_ratio", "mdd")
+
+
+def block_bootstrap(
+    returns: Union[pd.DataFrame, pd.Series, np.ndarray],
+    n_samples: int = 2000,
+    block_size: int = 5,
+    confidence: float = 0.9,
+    seed: Optional[int] = None,
+    chunk_size: int = 500,
+) -> pd.DataFrame:
+    """
+    순환 block bootstrap 으로 포트폴리오별 Sharpe / MDD 신뢰구간을 계산합니다.
+    block_size 길이의 연속 구간을 복원 추출해 원래 길이의 수익률 경로를 만들고
+    (표본 x 포트폴리오) 경로를 batch_metrics 로 한 번에 평가합니다.
+    메모리는 chunk_size x T x P 로 제한됩니다.
+    :param returns: (T x P) 일별 수익률 (Series 면 포트폴리오 1개). NaN 은 0 으로 간주
+    :param n_samples: bootstrap 표본 수
+    :param block_size: block 길이 (자기상관 보존)
+    :param confidence: 신뢰수준 (ex: 0.9 -> 5% ~ 95% 분위수)
+    :param seed: 난수 seed (같은 seed 면 같은 결과)
+    :param chunk_size: 한 번에 생성할 표본 수
+    :return: (P x [metric_mean, metric_low, metric_high]) DataFrame
+    """
+    if isinstance(returns, pd.Series):
+        returns = returns.to_frame()
+    if isinstance(returns, pd.DataFrame):
+        columns = returns.columns
+        values = returns.to_numpy(dtype=np.float64)
+    else:
+        values = np.asarray(returns, dtype=np.float64)
+        if values.ndim == 1:
+            values = values[:, None]
+        columns = pd.RangeIndex(values.shape[1])
+    if not 0 < confidence < 1:
+        raise ValueError(f"confidence must be in (0, 1), input : {confidence}")
+    if block_size < 1 or n_samples < 1 or chunk_size < 1:
+        raise ValueError("n_samples, block_size and chunk_size must be >= 1")
+
+    n_rows, n_portfolios = values.shape
+    result_columns = [
+        f"{metric}_{stat}" for metric in BOOTSTRAP_METRICS for stat in ("mean", "low", "high")
+    ]
+    if n_rows == 0:
+        return pd.DataFrame(np.nan, index=columns, columns=result_columns)
+
+    values = np.nan_to_num(values, nan=0.0)
+    rng = np.random.default_rng(seed)
+    n_blocks = -(-n_rows // block_size)
+    offsets = np.arange(block_size)
+
+    samples = {metric: [] for metric in BOOTSTRAP_METRICS}
+    for start in range(0, n_samples, chunk_size):
+        size = min(chunk_size, n_samples - start)
+        starts = rng.integers(0, n_rows, size=(size, n_blocks))
+        # (표본 x T) 행 위치. block 이 끝을 넘으면 처음으로 순환
+        rows = ((starts[:, :, None] + offsets) % n_rows).reshape(size, -1)[:, :n_rows]
+        paths = values[rows]  # (표본 x T x P)
+        metrics = batch_metrics(paths.transpose(1, 0, 2).reshape(n_rows, size * n_portfolios))
+        for metric in BOOTSTRAP_METRICS:
+            samples[metric].append(metrics[metric].to_numpy().reshape(size, n_portfolios))
+
+    alpha = (1 - confidence) / 2
+    result = {}
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        for metric in BOOTSTRAP_METRICS:
+            values = np.concatenate(samples[metric])
+            values[~np.isfinite(values)] = np.nan
+            result[f"{metric}_mean"] = np.nanmean(values, axis=0)
+            result[f"{metric}_low"] = np.nanquantile(values, alpha, axis=0)
+            result[f"{metric}_high"] = np.nanquantile(values, 1 - alpha, axis=0)
+    return pd.DataFrame(result, index=columns, columns=result_columns)
@@ -1,11 +1,17 @@
 import pytz
 import pandas as pd
 from abc import ABC, abstractmethod
-from pandas.tseries.offsets import BDay
-from typing import List, Dict, Union, Any
+from typing import List, Dict, Union, Any, Optional, Literal, Tuple
 from datetime import datetime
 from modules.data.core import DataPipeline
 from modules.algo.core import ValueBasedAlgo
+from modules.data.calendar import TradingDayIndex
+from modules.data.dtypes import log_memory
+from modules.strategy.screen import screen_mask, validate_screen
+from modules.utils import build_panels, get_calendar_for, iter_process, process_data, read_data
+from modules.logger import get_logger
+
+logger = get_logger(__name__)
 
 
 class ValueBasedStrategy(ABC):
@@ -15,20 +21,37 @@ class ValueBasedStrategy(ABC):
         algo: ValueBasedAlgo,
         train_period: int,  # num of days
         valid_period: int,  # num of datys
+        fill_method: Literal["ffill", "none"] = "ffill",
+        fill_limit: Optional[int] = None,
+        screen: Optional[Dict[str, Any]] = None,
         **kwargs
     ):
+        """
+        :param screen: 점수 계산 전 종목 사전 필터 (modules.strategy.screen.screen_mask 참고)
+                       ex: {"min_history": 250, "min_avg_volume": 10000, "max_staleness": 5, "min_price": 1000}
+        """
         self._dps = dps
         self._algo = algo
         self._train_period = train_period
         self._valid_period = valid_period
+        self.fill_method = fill_method
+        self.fill_limit = fill_limit
+        self.screen = validate_screen(screen)
 
         self.additional_params = kwargs
 
+        self._data: Optional[pd.DataFrame] = None
+        self._volume: Optional[pd.DataFrame] = None
+        self._history_days: Optional[int] = None  # 데이터가 최근 몇 일만 담고 있는지 (None 이면 전체 이력)
+
         self._execute_date = None
         self._train_start_date = None
         self._train_end_date = None
         self._valid_start_date = None
         self._valid_end_date = None
+        self._day_index: Optional[TradingDayIndex] = None
+        self._train_bounds: Tuple[int, int] = (0, 0)  # 학습 구간 [start, stop) 행 위치
+        self._valid_bounds: Tuple[int, int] = (0, 0)  # 검증 구간 [start, stop) 행 위치
 
     @property
     def dps(self) -> List[DataPipeline]:
@@ -38,6 +61,10 @@ class ValueBasedStrategy(ABC):
     def dps(self, dps: List[DataPipeline]):
         self._dps = dps
 
+    @property
+    def data(self) -> Optional[pd.DataFrame]:
+        return self._data
+
     @property
     def algo(self) -> ValueBasedAlgo:
         return self._algo
@@ -91,6 +118,27 @@ class ValueBasedStrategy(ABC):
     def valid_end_date(self) -> datetime:
         return self._valid_end_date
 
+    @property
+    def train_data(self) -> pd.DataFrame:
+        """학습 구간 데이터 (위치 슬라이스 view)"""
+        return self._data.iloc[self._train_bounds[0]:self._train_bounds[1]]
+
+    @property
+    def valid_data(self) -> pd.DataFrame:
+        """검증 구간 데이터 (위치 슬라이스 view)"""
+        return self._data.iloc[self._valid_bounds[0]:self._valid_bounds[1]]
+
+    @property
+    def day_index(self) -> TradingDayIndex:
+        """
+        거래일 인덱스. 데이터가 있으면 데이터의 거래일, 없으면 거래소 달력의 거래일
+        """
+        if self._data is not None and len(self._data.index):
+            if self._day_index is None or self._day_index.sessions is not self._data.index:
+                self._day_index = TradingDayIndex(self._data.index, get_calendar_for(self.dps))
+            return self._day_index
+        return get_calendar_for(self.dps).day_index()
+
     @abstractmethod
     def select_stocks(self, calculated_values: pd.DataFrame, **kwargs) -> List[str]:
         pass
@@ -99,28 +147,106 @@ class ValueBasedStrategy(ABC):
     def calculate_performance(self, **kwargs) -> Dict[str, float]:
         pass
 
+    def backtest_series(self) -> Tuple[pd.Series, pd.DataFrame]:
+        """
+        마지막 실행의 (포트폴리오 누적 수익률, 선택 종목 정규화 가격). 보고서 생성에 사용
+        """
+        raise NotImplementedError(f"{self.__class__.__name__} does not provide backtest series")
+
     def update_dps(self):
         for dp in self.dps:
             dp.update_to_latest()
 
+    @property
+    def symbols(self) -> List[str]:
+        return [dp.data_provider.symbol for dp in self.dps]
+
+    def history_days(self) -> Optional[int]:
+        """
+        실행에 필요한 최근 데이터 일 수. None 이면 전체 이력 (증분 실행 상태가 있는 전략이 재정의)
+        """
+        return None
+
+    def set_data(
+        self,
+        data: Optional[pd.DataFrame] = None,
+        volume: Optional[pd.DataFrame] = None,
+        n_days_before: Optional[int] = None,
+        update: bool = True,
+    ):
+        """
+        전략에 사용할 (거래일 x 종목) 가격 데이터 설정
+        :param data: 이미 준비된 가격 데이터. 주어지면 전략의 종목만 골라 사용하고,
+                     없으면 종목별 데이터를 불러오는 대로 정렬 준비를 하며 패널을 만든다
+        :param volume: data 와 함께 쓸 거래량 데이터 (screen 의 min_avg_volume / max_staleness 에 사용)
+        :param n_days_before: 최근 이 일 수의 데이터만 사용 (data 가 없으면 이 일 수만 읽고,
+                              있으면 data 가 이 일 수만 담고 있음을 뜻함). None 이면 전체 이력
+        :param update: data 가 없을 때 데이터를 최신화(update_to_latest)한 뒤 읽을지 여부
+        """
+        self._history_days = n_days_before
+        if data is not None:
+            # 데이터 파이프라인 없이 만든 전략 (ex: 파라미터 sweep) 은 데이터의 모든 종목 사용
+            symbols = [s for s in self.symbols if s in data.columns] if self.dps else data.columns
+            # 종목이 같으면 복사하지 않고 공유 데이터를 그대로 사용 (읽기 전용)
+            self._data = data if data.columns.equals(pd.Index(symbols)) else data.loc[:, symbols]
+            if volume is not None and not (
+                volume.index.equals(self._data.index) and volume.columns.equals(self._data.columns)
+            ):
+                volume = volume.reindex(index=self._data.index, columns=self._data.columns)
+            self._volume = volume
+            return
+
+        columns = ("close", "volume") if self.screen else ("close",)
+        panels = build_panels(
+            iter_process(process_data if update else read_data, self.dps, n_days_before),
+            calendar=get_calendar_for(self.dps),
+            fill_method=self.fill_method,
+            fill_limit=self.fill_limit,
+            columns=columns,
+        )
+        self._data = panels["close"]
+        self._volume = (
+            panels["volume"].reindex(index=self._data.index, columns=self._data.columns)
+            if "volume" in panels else None
+        )
+        log_memory("set_data", self._data)
+
+    def eligible_symbols(self) -> pd.Index:
+        """
+        학습 구간 마지막 거래일 기준으로 screen 조건을 만족하는 종목 (set_dates 이후 호출)
+        """
+        if not self.screen:
+            return self._data.columns
+        stop = self._train_bounds[1]
+        mask = screen_mask(
+            self._data.iloc[:stop],
+            self._volume.iloc[:stop] if self._volume is not None else None,
+            **self.screen,
+        )
+        logger.info(f"Screen kept {int(mask.sum())} / {len(mask)} symbols")
+        return self._data.columns[mask]
+
     def set_dates(self, execute_date: datetime = None):
         if execute_date is None:
             execute_date = datetime.now(tz=pytz.UTC)
         self._execute_date = execute_date
 
-        self._valid_end_date = self._execute_date - BDay(1)
-        self._valid_start_date = self._valid_end_date - BDay(self._valid_period)
-        self._train_end_date = self._valid_start_date - BDay(1)
-        self._train_start_date = self._train_end_date - BDay(self._train_period)
-
-        if (
-            self._train_start_date >= self._train_end_date
-            or self._valid_start_date >= self._valid_end_date
-        ):
+        day_index = self.day_index
+        self._train_bounds, self._valid_bounds = day_index.window_bounds(
+            self._execute_date, self._train_period, self._valid_period
+        )
+        (train_start, train_stop), (valid_start, valid_stop) = self._train_bounds, self._valid_bounds
+        if train_start >= train_stop or valid_start >= valid_stop:
             raise ValueError(
                 "Invalid date ranges. Please check train_period and valid_period."
             )
 
+        sessions = day_index.sessions
+        self._train_start_date = sessions[train_start]
+        self._train_end_date = sessions[train_stop - 1]
+        self._valid_start_date = sessions[valid_start]
+        self._valid_end_date = sessions[valid_stop - 1]
+
     @abstractmethod
     def execute(
         self, execute_date: datetime = None, **kwargs
@@ -135,6 +261,8 @@ class ValueBasedStrategy(ABC):
             "valid_period": self.valid_period,
             "execute_date": self.execute_date,
         }
+        if self.screen:
+            params["screen"] = self.screen
         params.update(self.additional_params)
         return params
 
@@ -0,0 +1,96 @@
+import os
+import concurrent.futures
+from typing import Any, Dict, List, Optional, Union
+from modules.algo.cache import IndicatorCache
+from modules.strategy.result_store import PoolResultStore
+from modules.strategy.strategy_pool import StrategyPool
+from modules.strategy.utils import retrieve_selected_stocks
+from modules.utils import create_strategy, create_symbol_mapper, read_config
+from modules.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def run_market(
+    national: str,
+    config_paths: List[str],
+    preferences: List[str],
+    executor: Optional[concurrent.futures.Executor] = None,
+    store: Optional[PoolResultStore] = None,
+) -> Dict[str, Union[Dict[str, Any], str]]:
+    """
+    한 국가의 전략 pool 을 평가해 preference 별 선택 결과를 반환합니다.
+    데이터 로딩과 전략 실행은 모두 executor 에서 실행됩니다.
+    :param national: 투자 국가 (ex: kor)
+    :param config_paths: 전략 설정 YAML 경로
+    :param preferences: trading_preferences 목록
+    :return: preference -> retrieve_selected_stocks 결과 (선택된 전략이 없으면 사유 문자열)
+    """
+    configs = [read_config(path) for path in config_paths]
+    strategies = [strategy for strategy in map(create_strategy, configs) if strategy is not None]
+    if not strategies:
+        raise ValueError(f"No strategies for {national}")
+
+    # 공유 패널은 pool 이 실행 전에 전략들의 fill 설정(fill_method, fill_limit)별로 한 번씩 만듦
+    pool = StrategyPool(strategies, executor=executor, store=store)
+    pool_results = pool.select_all(preferences)
+
+    symbol_mapper = create_symbol_mapper(configs)
+    results = {}
+    for preference, pool_result in pool_results.items():
+        if isinstance(pool_result, str):
+            results[preference] = pool_result
+            continue
+        result = retrieve_selected_stocks(pool_result, symbol_mapper)
+        result["n_of_strategies"] = len(strategies)  # 검토한 전략의 수
+        result["national"] = national.upper()  # 투자 국가
+        results[preference] = result
+    return results
+
+
+def run_markets(
+    market_configs: Dict[str, List[str]],
+    preferences: List[str],
+    max_workers: Optional[int] = None,
+    store_root: Optional[str] = None,
+    cache_dir: Optional[str] = None,
+) -> Dict[str, Dict[str, Union[Dict[str, Any], str]]]:
+    """
+    여러 국가의 전략 pool 을 한 프로세스에서 동시에 평가합니다.
+    국가별 실행은 각자의 thread 에서 진행하고, 데이터 로딩/전략 실행 작업은 공유 executor 하나에 넣으므로
+    한 국가의 데이터 로딩(I/O)과 다른 국가의 전략 계산이 겹쳐 실행됩니다.
+    :param market_configs: 국가 -> 전략 설정 YAML 경로 목록
+    :param preferences: trading_preferences 목록
+    :param max_workers: 공유 executor 의 thread 수
+    :param store_root: 주어지면 {store_root}/{국가} 에 평가 결과를 저장하고 재사용
+    :param cache_dir: 주어지면 지표 캐시(IndicatorCache)의 디스크 캐시 경로. 실행 간에 지표 결과를 재사용
+    :return: 국가 -> run_market 결과. 실패한 국가는 결과에서 제외
+    """
+    if cache_dir:
+        IndicatorCache.configure(disk_path=cache_dir)
+    results = {}
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=max_workers or min(32, os.cpu_count() + 4)
+    ) as executor, concurrent.futures.ThreadPoolExecutor(
+        max_workers=len(market_configs) or 1
+    ) as drivers:
+        # 국가별 실행은 executor 의 작업을 기다리므로 별도 thread 에서 실행 (공유 executor 고갈 방지)
+        futures = {
+            drivers.submit(
+                run_market,
+                national,
+                config_paths,
+                preferences,
+                executor,
+                PoolResultStore(os.path.join(store_root, national)) if store_root else None,
+            ): national
+            for national, config_paths in market_configs.items()
+        }
+        for future in concurrent.futures.as_completed(futures):
+            national = futures[future]
+            try:
+                results[national] = future.result()
+                logger.info(f"{national}: evaluated")
+            except Exception as e:
+                logger.error(f"{national}: failed to evaluate strategy pool: {e}")
+    return {national: results[national] for national in market_configs if national in results}
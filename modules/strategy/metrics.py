@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+from typing import Union
+
+TRADING_DAYS = 252
+
+METRICS = ("cumulative_return", "annual_return", "annual_volatility", "sharpe_ratio", "mdd")
+
+
+def batch_metrics(returns: Union[pd.DataFrame, np.ndarray]) -> pd.DataFrame:
+    """
+    여러 포트폴리오(또는 리밸런싱 구간)의 일별 수익률 행렬로 성과 지표를 한 번에 계산합니다.
+    NaN 은 해당 포트폴리오의 관측이 없는 날로 보고 제외합니다.
+    (각 열의 결과는 NaN 을 제거한 Series 에 대한 portfolio_metrics 와 같습니다)
+    :param returns: (T x P) 일별 수익률 행렬
+    :return: (P x METRICS) 성과 지표
+    """
+    if isinstance(returns, pd.DataFrame):
+        columns = returns.columns
+        values = returns.to_numpy(dtype=float)
+    else:
+        values = np.asarray(returns, dtype=float)
+        if values.ndim == 1:
+            values = values[:, None]
+        columns = pd.RangeIndex(values.shape[1])
+
+    valid = ~np.isnan(values)
+    n = valid.sum(axis=0)
+    filled = np.where(valid, values, 0.0)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = filled.sum(axis=0) / n
+        deviation = np.where(valid, values - mean, 0.0)
+        std = np.sqrt((deviation ** 2).sum(axis=0) / (n - 1))
+        std[n < 2] = np.nan
+
+        growth = np.cumprod(1 + filled, axis=0)
+        cumulative_return = growth[-1] - 1 if len(growth) else np.zeros(values.shape[1])
+
+        # 관측이 없는 날은 고점 계산에서 제외 (fmax 는 NaN 을 무시)
+        observed_growth = np.where(valid, growth, np.nan)
+        peak = np.fmax.accumulate(observed_growth, axis=0)
+        drawdown = observed_growth / peak - 1
+        mdd = (
+            np.where(n > 0, np.nanmin(np.where(valid, drawdown, np.inf), axis=0), np.nan)
+            if len(drawdown) else np.full(values.shape[1], np.nan)
+        )
+
+        metrics = {
+            "cumulative_return": cumulative_return,
+            "annual_return": (1 + mean) ** TRADING_DAYS - 1,
+            "annual_volatility": std * np.sqrt(TRADING_DAYS),
+            "sharpe_ratio": np.sqrt(TRADING_DAYS) * mean / std,
+            "mdd": mdd,
+        }
+    return pd.DataFrame(metrics, index=columns, columns=list(METRICS))
@@ -0,0 +1,184 @@
+import os
+import html
+import concurrent.futures
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, Optional, Tuple, Union
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from modules.strategy.core import ValueBasedStrategy
+from modules.logger import get_logger
+
+logger = get_logger(__name__)
+
+IMAGE_FORMATS = ("png", "svg")
+
+
+def downsample(
+    data: Union[pd.Series, pd.DataFrame], max_points: int = 1000
+) -> Union[pd.Series, pd.DataFrame]:
+    """
+    그래프용으로 행 수를 max_points 이하로 줄입니다.
+    처음/끝 행과 구간별 최저/최고 행(첫 번째 컬럼 기준)을 남기므로 낙폭 같은 극값이 사라지지 않습니다.
+    """
+    if max_points < 4:
+        raise ValueError(f"max_points must be >= 4, input : {max_points}")
+    n_rows = len(data)
+    if n_rows <= max_points:
+        return data
+
+    values = np.asarray(data if isinstance(data, pd.Series) else data.iloc[:, 0], dtype=np.float64)
+    n_buckets = max_points // 2
+    edges = np.linspace(0, n_rows, n_buckets + 1).astype(np.int64)
+    positions = [0, n_rows - 1]
+    for start, stop in zip(edges[:-1], edges[1:]):
+        bucket = values[start:stop]
+        if stop <= start or np.isnan(bucket).all():
+            positions.append(start)
+            continue
+        positions.extend((start + np.nanargmin(bucket), start + np.nanargmax(bucket)))
+    return data.iloc[np.unique(positions)]
+
+
+def draw_backtest(fig: Figure, equity: pd.Series, prices: pd.DataFrame, title: Optional[str] = None):
+    """
+    포트폴리오 누적 수익률과 종목별 정규화 가격 그래프를 fig 에 그립니다.
+    """
+    ax1, ax2 = fig.subplots(2, 1, sharex=True)
+
+    # 포트폴리오 누적 수익률 그래프
+    ax1.plot(equity.index, equity.values, label="Portfolio")
+    ax1.set_title(title or "Cumulative Portfolio Returns")
+    ax1.set_ylabel("Cumulative Returns")
+    ax1.legend()
+    ax1.grid(True)
+
+    # 개별 주식 가격 움직임 그래프
+    for stock in prices.columns:
+        ax2.plot(prices.index, prices[stock].values, label=stock)
+
+    ax2.set_title("Individual Stock Price Movements (Normalized)")
+    ax2.set_xlabel("Date")
+    ax2.set_ylabel("Normalized Price")
+    ax2.legend(bbox_to_anchor=(1.05, 1), loc="upper left")
+    ax2.grid(True)
+    fig.tight_layout()
+
+
+def _render(task: Dict[str, Any]) -> str:
+    """
+    process pool worker. pyplot 없이 Agg canvas 에 그려 파일로 저장합니다.
+    """
+    fig = Figure(figsize=task["figsize"], dpi=task["dpi"])
+    FigureCanvasAgg(fig)
+    draw_backtest(fig, task["equity"], task["prices"], task["title"])
+    fig.savefig(task["path"])
+    return task["path"]
+
+
+def _report_task(
+    i: int,
+    portfolio: Dict[str, Any],
+    strategy: ValueBasedStrategy,
+    output_dir: str,
+    max_points: int,
+    image_format: str,
+    figsize: tuple,
+    dpi: int,
+) -> Dict[str, Any]:
+    if portfolio.get("from_store"):
+        raise ValueError("result was loaded from the pool result store, strategy was not executed")
+    equity, prices = strategy.backtest_series()
+    name = strategy.__class__.__name__
+    return {
+        "index": i,
+        "name": name,
+        "title": f"{name} #{i}",
+        "params": {
+            key: value for key, value in strategy.get_params().items() if key not in ("dps", "execute_date")
+        },
+        "execute_date": portfolio.get("execute_date"),
+        "selected_stocks": portfolio.get("selected_stocks", []),
+        "performance": portfolio.get("performance", {}),
+        "equity": downsample(equity, max_points),
+        "prices": downsample(prices, max_points),
+        "path": os.path.join(output_dir, f"{i:03d}_{name}.{image_format}"),
+        "figsize": figsize,
+        "dpi": dpi,
+    }
+
+
+def render_reports(
+    portfolios: List[Tuple[Dict[str, Any], ValueBasedStrategy]],
+    output_dir: str,
+    max_points: int = 1000,
+    max_workers: Optional[int] = None,
+    image_format: str = "png",
+    figsize: tuple = (15, 15),
+    dpi: int = 80,
+) -> List[Dict[str, Any]]:
+    """
+    실행이 끝난 전략들의 백테스트 그래프를 process pool 에서 이미지로 그리고 index.html 을 만듭니다.
+    그래프 데이터는 max_points 로 줄인 뒤 worker 에 넘깁니다.
+    그래프 데이터가 없는 전략은 건너뜁니다.
+    :param portfolios: [(포트폴리오 결과, 전략), ...] (ex: StrategyPool.run_strategies 결과)
+    :param output_dir: 이미지와 index.html 을 저장할 디렉토리
+    :param max_points: 그래프별 최대 점 수
+    :param max_workers: process 수
+    :param image_format: png 또는 svg
+    :return: 전략별 {"index", "name", "params", "execute_date", "selected_stocks", "performance", "path"} 목록
+    """
+    if image_format not in IMAGE_FORMATS:
+        raise ValueError(f"Invalid image_format: {image_format}. Use one of {IMAGE_FORMATS}")
+    os.makedirs(output_dir, exist_ok=True)
+
+    tasks = []
+    for i, (portfolio, strategy) in enumerate(portfolios):
+        try:
+            tasks.append(_report_task(i, portfolio, strategy, output_dir, max_points, image_format, figsize, dpi))
+        except (ValueError, NotImplementedError) as e:
+            logger.warning(f"Skipping report for strategy {i} ({strategy.__class__.__name__}): {e}")
+    if not tasks:
+        logger.warning("No executed strategies to report")
+        return []
+
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=min(max_workers or os.cpu_count(), len(tasks))
+    ) as executor:
+        list(executor.map(_render, tasks))
+
+    reports = [
+        {key: task[key] for key in ("index", "name", "params", "execute_date", "selected_stocks", "performance", "path")}
+        for task in tasks
+    ]
+    write_index(reports, os.path.join(output_dir, "index.html"))
+    logger.info(f"Rendered {len(reports)} strategy reports to {output_dir}")
+    return reports
+
+
+def write_index(reports: List[Dict[str, Any]], path: str):
+    """
+    전략별 성과 표와 그래프를 모은 HTML 파일
+    """
+    sections = []
+    for report in reports:
+        rows = "".join(
+            f"<tr><th>{html.escape(str(key))}</th><td>{value:.4f}</td></tr>"
+            if isinstance(value, (int, float)) else
+            f"<tr><th>{html.escape(str(key))}</th><td>{html.escape(str(value))}</td></tr>"
+            for key, value in report["performance"].items()
+        )
+        sections.append(
+            f"<section><h2>{html.escape(report['name'])} #{report['index']}</h2>"
+            f"<p>{html.escape(str(report['execute_date']))} : "
+            f"{html.escape(', '.join(map(str, report['selected_stocks'])))}</p>"
+            f"<p><code>{html.escape(str(report['params']))}</code></p>"
+            f"<table>{rows}</table>"
+            f"<img src=\"{html.escape(os.path.basename(report['path']))}\" width=\"900\"></section>"
+        )
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(
+            "<!DOCTYPE html><html><head><meta charset=\"utf-8\"><title>Backtest Report</title>"
+            "<style>table{border-collapse:collapse}th,td{border:1px solid #ccc;padding:2px 8px}</style>"
+            "</head><body><h1>Backtest Report</h1>" + "".join(sections) + "</body></html>"
+        )
@@ -0,0 +1,96 @@
+import os
+import json
+import pandas as pd
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from modules.fingerprint import fingerprint_frame, fingerprint_params
+from modules.strategy.core import ValueBasedStrategy
+from modules.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def strategy_fingerprint(strategy: ValueBasedStrategy) -> str:
+    """
+    전략 설정 내용 기반 fingerprint (실행일, 데이터 파이프라인 객체 제외)
+    """
+    params = {
+        key: value
+        for key, value in strategy.get_params().items()
+        if key not in ("dps", "execute_date")
+    }
+    return fingerprint_params([strategy.__class__.__name__, params, strategy.symbols])
+
+
+def data_watermark(
+    strategies: List[ValueBasedStrategy], data: Optional[pd.DataFrame] = None
+) -> str:
+    """
+    전략들이 사용할 데이터의 상태.
+    공유 데이터가 있으면 그 내용, 없으면 데이터 파이프라인별 저장 파일 메타데이터
+    (chunk 파일 수, 마지막 chunk 파일의 크기/수정시각) 기반이므로 데이터를 읽지 않고 계산합니다.
+    """
+    if data is not None:
+        last_date = str(data.index[-1]) if len(data.index) else None
+        return fingerprint_params([last_date, data.shape, fingerprint_frame(data)])
+    dps = {dp.base_path: dp for strategy in strategies for dp in strategy.dps}
+    states = []
+    for base_path, dp in sorted(dps.items()):
+        files = dp.chunk_files()
+        if not files:
+            states.append([base_path, 0])
+            continue
+        stat = os.stat(files[-1])
+        states.append([base_path, len(files), os.path.basename(files[-1]), stat.st_size, stat.st_mtime_ns])
+    return fingerprint_params(states)
+
+
+class PoolResultStore:
+    def __init__(self, path: str):
+        """
+        StrategyPool 평가 결과 저장소.
+        (실행일, 전략 설정 hash, 데이터 watermark) 가 같으면 저장된 결과를 재사용합니다.
+        :param path: 결과 JSON 파일을 저장할 디렉토리
+        """
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def make_key(
+        self,
+        execute_date: datetime,
+        strategies: List[ValueBasedStrategy],
+        data: Optional[pd.DataFrame] = None,
+    ) -> str:
+        return fingerprint_params(
+            [
+                pd.Timestamp(execute_date).strftime("%Y-%m-%d"),
+                [strategy_fingerprint(strategy) for strategy in strategies],
+                data_watermark(strategies, data),
+            ]
+        )
+
+    def _file(self, key: str) -> str:
+        return os.path.join(self.path, f"{key}.json")
+
+    def load(self, key: str) -> Optional[List[Tuple[int, Dict[str, Any]]]]:
+        """
+        :return: [(전략 index, 포트폴리오 결과), ...]. 없으면 None
+        """
+        if not os.path.exists(self._file(key)):
+            return None
+        try:
+            with open(self._file(key), "r", encoding="utf-8") as file:
+                records = json.load(file)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to load pool result {key}: {e}")
+            return None
+        logger.info(f"Loaded stored pool result {key}")
+        return [(record["index"], record["portfolio"]) for record in records]
+
+    def save(self, key: str, results: List[Tuple[int, Dict[str, Any]]]):
+        records = [{"index": index, "portfolio": portfolio} for index, portfolio in results]
+        tmp_path = self._file(key) + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(records, file, ensure_ascii=False, default=float)
+        os.replace(tmp_path, self._file(key))
+        logger.info(f"Saved pool result {key}")
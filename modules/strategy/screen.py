@@ -0,0 +1,81 @@
+import warnings
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Optional
+from modules.logger import get_logger
+
+logger = get_logger(__name__)
+
+SCREEN_KEYS = ("min_history", "min_avg_volume", "max_staleness", "min_price", "volume_window")
+
+
+def validate_screen(screen: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    screen = dict(screen or {})
+    unknown = set(screen) - set(SCREEN_KEYS)
+    if unknown:
+        raise ValueError(f"Unknown screen options: {sorted(unknown)}. Use {SCREEN_KEYS}")
+    return screen
+
+
+def screen_mask(
+    prices: pd.DataFrame,
+    volume: Optional[pd.DataFrame] = None,
+    min_history: Optional[int] = None,
+    min_avg_volume: Optional[float] = None,
+    max_staleness: Optional[int] = None,
+    min_price: Optional[float] = None,
+    volume_window: int = 20,
+) -> np.ndarray:
+    """
+    기준일(prices 의 마지막 행)에 선택 가능한 종목 mask 를 종목 방향 벡터 연산으로 계산합니다.
+    :param prices: 기준일까지의 (거래일 x 종목) 가격
+    :param volume: prices 와 같은 모양의 거래량 (관측되지 않은 날은 NaN)
+    :param min_history: 최소 가격 관측 수
+    :param min_avg_volume: 최근 volume_window 거래일 평균 거래량 하한
+    :param max_staleness: 마지막 실제 관측 이후 지난 최대 거래일 수.
+                          거래량이 있으면 거래량 관측, 없으면 가격이 바뀐 날을 관측으로 봅니다.
+    :param min_price: 기준일 가격 하한
+    :param volume_window: 평균 거래량 계산 구간
+    :return: 길이 N 의 bool 배열
+    """
+    values = prices.to_numpy(dtype=np.float64)
+    n_rows, n_cols = values.shape
+    eligible = np.ones(n_cols, dtype=bool)
+    if n_rows == 0:
+        return eligible
+
+    if min_history is not None:
+        eligible &= (~np.isnan(values)).sum(axis=0) >= min_history
+
+    if min_price is not None:
+        with np.errstate(invalid="ignore"):
+            eligible &= values[-1] >= min_price
+
+    volume_values = None
+    if volume is not None:
+        if not (volume.index.equals(prices.index) and volume.columns.equals(prices.columns)):
+            volume = volume.reindex(index=prices.index, columns=prices.columns)
+        volume_values = volume.to_numpy(dtype=np.float64)
+
+    if min_avg_volume is not None:
+        if volume_values is None:
+            logger.warning("min_avg_volume screen skipped: no volume data")
+        else:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", category=RuntimeWarning)
+                average = np.nanmean(volume_values[-volume_window:], axis=0)
+            eligible &= average >= min_avg_volume
+
+    if max_staleness is not None:
+        # 최근 max_staleness + 1 거래일 안에 실제 관측이 있어야 함
+        tail = max_staleness + 1
+        if volume_values is not None:
+            observed = ~np.isnan(volume_values[-tail:])
+        else:
+            window = values[-(tail + 1):]
+            with np.errstate(invalid="ignore"):
+                changed = np.vstack([~np.isnan(window[:1]), window[1:] != window[:-1]])
+            observed = (changed & ~np.isnan(window))[-tail:]
+        eligible &= observed.any(axis=0)
+
+    return eligible
@@ -0,0 +1,103 @@
+import warnings
+import numpy as np
+import pandas as pd
+from typing import List, Tuple, Union
+
+SELECTION_METHODS = ("top_n", "threshold", "relative")
+
+
+def selection_counts(
+    scores: np.ndarray,
+    selection_method: str = "top_n",
+    selection_param: Union[int, float] = 10,
+    min_stocks: int = 5,
+    max_stocks: int = 20,
+) -> np.ndarray:
+    """
+    시점(행)별로 선택할 종목 수.
+    top_n 은 selection_param 을 [min_stocks, max_stocks] 로 clip 한 수,
+    threshold (평균 + selection_param x 표준편차) / relative (평균) 는 기준을 넘는 종목 수를
+    [min_stocks, max_stocks] 로 clip 한 수이며, 모두 점수가 있는 종목 수를 넘지 않습니다.
+    :param scores: (D x N) 점수 행렬 (NaN 은 선택 불가)
+    :return: 길이 D 의 정수 배열
+    """
+    if selection_method not in SELECTION_METHODS:
+        raise ValueError("Invalid selection method")
+    valid = (~np.isnan(scores)).sum(axis=1)
+
+    if selection_method == "top_n":
+        counts = np.full(len(scores), int(np.clip(selection_param, min_stocks, max_stocks)))
+    else:
+        with warnings.catch_warnings(), np.errstate(invalid="ignore"):
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            threshold = np.nanmean(scores, axis=1)
+            if selection_method == "threshold":
+                threshold = threshold + selection_param * np.nanstd(scores, axis=1, ddof=1)
+            above = (scores > threshold[:, None]).sum(axis=1)
+        counts = np.clip(above, min_stocks, max_stocks)
+    return np.minimum(counts, valid)
+
+
+def select_indices(
+    scores: np.ndarray,
+    selection_method: str = "top_n",
+    selection_param: Union[int, float] = 10,
+    min_stocks: int = 5,
+    max_stocks: int = 20,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (D x N) 점수 행렬의 모든 행에 대해 선택 규칙을 한 번에 적용합니다.
+    argpartition 으로 행별 상위 k_max 개만 고른 뒤 그 안에서만 정렬합니다. O(D x N + D x k log k)
+    :return: (indices, counts). indices 는 (D x k_max) 열 위치 (점수 내림차순),
+             각 행의 앞 counts[d] 개가 선택 종목
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    if scores.ndim == 1:
+        scores = scores[None, :]
+    counts = selection_counts(scores, selection_method, selection_param, min_stocks, max_stocks)
+    k_max = int(counts.max(initial=0))
+    if k_max == 0:
+        return np.empty((len(scores), 0), dtype=np.int64), counts
+
+    ranked = np.where(np.isnan(scores), -np.inf, scores)
+    if k_max < ranked.shape[1]:
+        top = np.argpartition(-ranked, k_max - 1, axis=1)[:, :k_max]
+    else:
+        top = np.broadcast_to(np.arange(ranked.shape[1]), ranked.shape)
+    # 점수 내림차순, 같은 점수는 앞 열 우선 (nlargest 와 같은 순서)
+    top_scores = np.take_along_axis(ranked, top, axis=1)
+    order = np.lexsort((top, -top_scores), axis=1)
+    top = np.take_along_axis(top, order, axis=1)
+    top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+    # 경계(counts 번째) 점수와 같은 종목이 여럿이면 argpartition 은 임의로 고르므로
+    # nlargest(keep="first") 처럼 앞 열부터 채움
+    selected = counts > 0
+    boundary = np.take_along_axis(top_scores, np.maximum(counts - 1, 0)[:, None], axis=1)
+    n_greater = (top_scores > boundary).sum(axis=1)
+    equal = (ranked == boundary) & selected[:, None]
+    rank = np.cumsum(equal, axis=1)
+    rows, cols = np.nonzero(equal & (rank <= (counts - n_greater)[:, None]))
+    top[rows, n_greater[rows] + rank[rows, cols] - 1] = cols
+    return top, counts
+
+
+def select_matrix(
+    scores: pd.DataFrame,
+    selection_method: str = "top_n",
+    selection_param: Union[int, float] = 10,
+    min_stocks: int = 5,
+    max_stocks: int = 20,
+) -> pd.Series:
+    """
+    (date x symbol) 점수 행렬에서 날짜별 선택 종목 목록
+    :return: date -> 선택 종목 list (점수 내림차순)
+    """
+    indices, counts = select_indices(
+        scores.to_numpy(dtype=np.float64), selection_method, selection_param, min_stocks, max_stocks
+    )
+    columns = np.asarray(scores.columns)
+    selections: List[List] = [
+        columns[row[:count]].tolist() for row, count in zip(indices, counts)
+    ]
+    return pd.Series(selections, index=scores.index, dtype=object)
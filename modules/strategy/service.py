@@ -0,0 +1,270 @@
+import os
+import pytz
+import threading
+import concurrent.futures
+import pandas as pd
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from modules.strategy.core import ValueBasedStrategy
+from modules.strategy.strategy_pool import StrategyPool, select_portfolio
+from modules.strategy.utils import retrieve_selected_stocks
+from modules.utils import (
+    build_panels,
+    build_strategy_panels,
+    create_strategy,
+    create_symbol_mapper,
+    get_calendar_for,
+    iter_process,
+    process_data,
+    read_config,
+    read_data,
+)
+from modules.logger import get_logger
+
+logger = get_logger(__name__)
+
+# refresh 때 마지막 거래일보다 이만큼 앞에서부터 다시 읽음 (거래소 시간대 차이로 라벨이 바뀌는 경우 대비)
+REFRESH_MARGIN_DAYS = 7
+
+
+def _as_utc_datetime(date) -> datetime:
+    date = pd.Timestamp(date)
+    date = date.tz_localize("UTC") if date.tz is None else date.tz_convert("UTC")
+    return date.to_pydatetime()
+
+
+class StrategyService:
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls):
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        timeout: Optional[float] = None,
+        max_results: int = 256,
+    ):
+        """
+        상주형 전략 서비스.
+        pool 별로 정렬된 (거래일 x 종목) 패널과 전략 객체(지표 상태 포함)를 메모리에 유지하고,
+        새 거래일이 생기면 패널 끝에 그 행만 붙입니다.
+        (pool, 실행일, 데이터 버전) 별 평가 결과를 기억해 두므로 같은 요청은 선택만 다시 합니다.
+        :param max_workers: 데이터 로딩과 전략 실행에 공유할 thread 수
+        :param timeout: 전략별 실행 제한 시간(초)
+        :param max_results: 메모리에 유지할 평가 결과 수 (LRU)
+        """
+        self.timeout = timeout
+        self.max_results = max_results
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers or min(32, os.cpu_count() + 4)
+        )
+        self._pools: Dict[str, Dict[str, Any]] = {}
+        self._results: "OrderedDict[tuple, List]" = OrderedDict()
+        self._lock = threading.Lock()  # self._pools / self._results 보호
+
+    def register(
+        self,
+        name: str,
+        strategies: List[ValueBasedStrategy],
+        symbol_mapper: Optional[Dict[str, str]] = None,
+        fill_method: str = "ffill",
+        fill_limit: Optional[int] = None,
+        update: bool = False,
+    ):
+        """
+        전략 pool 을 등록하고 전략들이 공유할 패널을 한 번 만듭니다.
+        :param name: pool 이름 (ex: kor)
+        :param symbol_mapper: symbol -> 종목명
+        :param update: True 면 데이터를 최신화(update_to_latest)한 뒤 읽음
+        """
+        strategies = [strategy for strategy in strategies if strategy is not None]
+        if not strategies:
+            raise ValueError(f"No strategies to register for pool '{name}'")
+
+        dps = list({dp.data_provider.symbol: dp for s in strategies for dp in s.dps}.values())
+        panels = build_strategy_panels(
+            strategies, update, fill_method, fill_limit, executor=self._executor
+        )
+        if panels["close"].empty:
+            raise ValueError(f"No data loaded for pool '{name}'")
+
+        pool = StrategyPool(
+            strategies,
+            executor=self._executor,
+            timeout=self.timeout,
+            data=panels["close"],
+            volume=panels.get("volume"),
+        )
+        with self._lock:
+            self._pools[name] = {
+                "pool": pool,
+                "dps": dps,
+                "calendar": get_calendar_for(dps),
+                "columns": tuple(panels),
+                "fill_method": fill_method,
+                "fill_limit": fill_limit,
+                "symbol_mapper": symbol_mapper or {},
+                "panels": panels,
+                "version": 0,
+                "lock": threading.Lock(),  # 전략 객체는 thread-safe 하지 않으므로 pool 단위로 직렬화
+            }
+        logger.info(
+            f"Registered pool '{name}': {len(strategies)} strategies, "
+            f"{panels['close'].shape[1]} symbols, last session {panels['close'].index[-1]}"
+        )
+
+    def load_configs(self, name: str, config_paths: List[str], **kwargs):
+        """
+        전략 설정 YAML 들로 pool 을 등록합니다. kwargs 는 register 에 전달
+        """
+        configs = [read_config(path) for path in config_paths]
+        strategies = [create_strategy(config) for config in configs]
+        self.register(name, strategies, create_symbol_mapper(configs), **kwargs)
+
+    def _entry(self, name: str) -> Dict[str, Any]:
+        with self._lock:
+            if name not in self._pools:
+                raise KeyError(f"Unknown pool: {name}")
+            return self._pools[name]
+
+    @property
+    def pools(self) -> List[str]:
+        with self._lock:
+            return list(self._pools)
+
+    def refresh(self, name: Optional[str] = None, update: bool = True) -> Dict[str, int]:
+        """
+        마지막 거래일 이후의 데이터만 읽어 패널 끝에 붙입니다.
+        ffill 은 기존 마지막 행에서 이어서 적용합니다. (fill_limit 은 이어 붙인 구간 안에서만 셉니다)
+        :param name: 갱신할 pool. None 이면 전부
+        :param update: True 면 데이터를 최신화(update_to_latest)한 뒤 읽음
+        :return: pool -> 추가된 거래일 수
+        """
+        added = {}
+        for pool_name in ([name] if name is not None else self.pools):
+            entry = self._entry(pool_name)
+            with entry["lock"]:
+                added[pool_name] = self._append_sessions(entry, update)
+        return added
+
+    def _append_sessions(self, entry: Dict[str, Any], update: bool) -> int:
+        panels = entry["panels"]
+        close = panels["close"]
+        last_session = close.index[-1]
+        n_days_before = (pd.Timestamp.now(tz="UTC") - last_session).days + REFRESH_MARGIN_DAYS
+        new_panels = build_panels(
+            iter_process(
+                process_data if update else read_data,
+                entry["dps"],
+                n_days_before,
+                executor=self._executor,
+            ),
+            calendar=entry["calendar"],
+            fill_method="none",
+            columns=entry["columns"],
+        )
+        new_close = new_panels["close"]
+        if new_close.empty or new_close.index[-1] <= last_session:
+            return 0
+
+        new_sessions = new_close.index[new_close.index > last_session]
+        appended = {}
+        for column, panel in panels.items():
+            new_rows = new_panels.get(column)
+            if new_rows is None or new_rows.empty:
+                new_rows = pd.DataFrame(index=new_sessions, columns=panel.columns, dtype=float)
+            new_rows = new_rows.reindex(index=new_sessions, columns=panel.columns)
+            combined = pd.concat([panel, new_rows.astype(panel.dtypes.to_dict())])
+            if column == "close" and entry["fill_method"] == "ffill":
+                seam = combined.iloc[len(panel) - 1:].ffill(limit=entry["fill_limit"])
+                combined.iloc[len(panel):] = seam.iloc[1:].to_numpy()
+            appended[column] = combined
+
+        n_new = len(appended["close"]) - len(close)
+        pool = entry["pool"]
+        entry["panels"] = appended
+        entry["version"] += 1
+        pool.data = appended["close"]
+        pool.volume = appended.get("volume")
+        logger.info(f"Appended {n_new} sessions (last session {appended['close'].index[-1]})")
+        return n_new
+
+    def evaluate(self, name: str, execute_date=None) -> List:
+        """
+        pool 의 후보 포트폴리오 (StrategyPool.evaluate 결과). 같은 실행일/데이터 버전이면 기억된 결과 사용
+        """
+        entry = self._entry(name)
+        execute_date = (
+            _as_utc_datetime(execute_date) if execute_date is not None else datetime.now(tz=pytz.UTC)
+        )
+        with entry["lock"]:
+            key = (name, entry["version"], execute_date.strftime("%Y-%m-%d"))
+            with self._lock:
+                portfolios = self._results.get(key)
+                if portfolios is not None:
+                    self._results.move_to_end(key)
+                    return portfolios
+
+            pool = entry["pool"]
+            portfolios = pool.evaluate(execute_date)
+            if pool.errors:
+                # 일부 전략이 실패한 결과는 기억하지 않음
+                return portfolios
+            with self._lock:
+                self._results[key] = portfolios
+                while len(self._results) > self.max_results:
+                    self._results.popitem(last=False)
+        return portfolios
+
+    def select(self, name: str, execute_date=None, preference: str = "balanced") -> Dict[str, Any]:
+        """
+        pool 에서 preference 기준 최적 포트폴리오를 선택합니다.
+        :return: retrieve_selected_stocks 결과. 조건에 맞는 전략이 없으면 {"message": ...}
+        """
+        pool_result = select_portfolio(self.evaluate(name, execute_date), preference)
+        if isinstance(pool_result, str):
+            return {"message": pool_result}
+        result = retrieve_selected_stocks(pool_result, self._entry(name)["symbol_mapper"])
+        result["pool"] = name
+        result["preference"] = preference
+        return result
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            entries = dict(self._pools)
+        return {
+            name: {
+                "strategies": len(entry["pool"].strategies),
+                "symbols": entry["panels"]["close"].shape[1],
+                "last_session": str(entry["panels"]["close"].index[-1].date()),
+                "version": entry["version"],
+            }
+            for name, entry in entries.items()
+        }
+
+    def start_refresh(self, interval: float, stop_event: threading.Event) -> threading.Thread:
+        """
+        interval 초마다 모든 pool 을 refresh 하는 daemon thread 를 시작합니다.
+        """
+        def run():
+            while not stop_event.wait(interval):
+                try:
+                    added = self.refresh()
+                    if any(added.values()):
+                        logger.info(f"Refreshed pools: {added}")
+                except Exception as e:
+                    logger.error(f"Failed to refresh pools: {e}")
+
+        thread = threading.Thread(target=run, name="strategy-service-refresh", daemon=True)
+        thread.start()
+        return thread
+
+    def close(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
@@ -1,12 +1,21 @@
+import os
+import pickle
 import numpy as np
 import pandas as pd
-from typing import Literal, Union, List, Dict, Any, Optional
+from typing import Literal, Union, List, Dict, Any, Optional, Tuple
 from datetime import datetime
+from filelock import FileLock
 import matplotlib.pyplot as plt
 from modules.data.core import DataPipeline
 from modules.algo.core import ValueBasedAlgo
+from modules.algo.momentum import MomentumAlgo, MomentumState
+from modules.fingerprint import fingerprint_params
 from modules.strategy.core import ValueBasedStrategy
-from modules.utils import read_config, process_data, parallel_process, prepare_data
+from modules.data.dtypes import log_memory
+from modules.strategy.bootstrap import block_bootstrap
+from modules.strategy.report import draw_backtest
+from modules.strategy.selection import select_matrix
+from modules.strategy.utils import portfolio_metrics
 from modules.logger import get_logger
 
 logger = get_logger(__name__)
@@ -23,100 +32,154 @@ class MomentumStrategy(ValueBasedStrategy):
         selection_param: Union[int, float] = 10,  # top_n's default number
         min_stocks: int = 5,
         max_stocks: int = 20,
+        fill_method: Literal["ffill", "none"] = "ffill",
+        fill_limit: Optional[int] = None,
+        screen: Optional[Dict[str, Any]] = None,
+        bootstrap: Optional[Dict[str, Any]] = None,
+        state_dir: Optional[str] = None,
         **kwargs,
     ):
-        super().__init__(dps, algo, train_period, valid_period, **kwargs)
+        """
+        :param bootstrap: 검증 구간 수익률의 block bootstrap 설정 (block_bootstrap 인자).
+                          주어지면 성과에 Sharpe / MDD 신뢰구간을 추가합니다. ex: {"n_samples": 2000, "seed": 0}
+        :param state_dir: 증분 실행 상태를 저장할 디렉토리. 주어지고 algo 가 MomentumAlgo 이면
+                          매일 실행할 때 직전 상태에 새 거래일만 반영합니다.
+        """
+        super().__init__(
+            dps,
+            algo,
+            train_period,
+            valid_period,
+            fill_method=fill_method,
+            fill_limit=fill_limit,
+            screen=screen,
+            **kwargs,
+        )
         self.selection_method = selection_method
         self.selection_param = selection_param
         self.min_stocks = min_stocks
         self.max_stocks = max_stocks
+        self.bootstrap = bootstrap
+        self.state_dir = state_dir
+        self._state: Optional[MomentumState] = None
 
-        self._data: Optional[pd.DataFrame] = None
         self._selected_stocks: List[str] = []
         self._portfolio_returns: pd.Series = pd.Series()
         self._valid_data: pd.DataFrame = pd.DataFrame()
 
-    def set_data(self):
-        """
-        It depends on strategy
-        :return:
-
-        """
-        data_list = parallel_process(process_data, self.dps)
-        self._data = prepare_data(data_list)
-
     def execute(
         self, execute_date: datetime = None, **kwargs
     ) -> Dict[str, Union[List[str], Dict[str, float]]]:
 
         if self._data is None:
-            self.set_data()
+            self.set_data(n_days_before=self.history_days())
         logger.info(f"Executing momentum strategy on {execute_date}")
         logger.info(f"Executing momentum strategy with {self._data.shape} size dataset")
 
         try:
+            if self._history_days is not None and not self._covers_recent(execute_date):
+                # 최근 데이터로 학습 구간을 채울 수 없고 저장된 상태도 이어갈 수 없으면 전체 이력으로 다시 실행
+                logger.info("Recent data does not cover the incremental state, loading the full history")
+                self.set_data(update=False)
             self.set_dates(execute_date=execute_date)
-            train_data = self._data.loc[self.train_start_date : self.train_end_date]
-            self._valid_data = self._data.loc[
-                self.valid_start_date: self.valid_end_date
-            ]
-            prepared_data = self.algo.prepare_data(train_data)
-            calculated_values = self.algo.calculate_values(prepared_data)
+            train_data = self.train_data
+            if self.screen:
+                # 선택될 수 없는 종목은 점수 계산에서 제외
+                train_data = train_data.loc[:, self.eligible_symbols()]
+            self._valid_data = self.valid_data
+            if self._incremental():
+                calculated_values = self._incremental_values(train_data)
+            else:
+                prepared_data = self.algo.prepare_data(train_data)
+                log_memory("algo.prepare_data", prepared_data)
+                calculated_values = self.algo.calculate_values(prepared_data)
             self._selected_stocks = self.select_stocks(calculated_values)
             performance = self.calculate_performance()
             return {
-                "execute_date": execute_date.strftime("%Y-%m-%d"),
+                "execute_date": self.execute_date.strftime("%Y-%m-%d"),
                 "selected_stocks": self._selected_stocks,
                 "performance": performance,
             }
         except Exception as e:
             logger.error(e)
 
+    def _state_path(self) -> str:
+        """상태 파일 경로 (확장자 제외. MomentumState.save 참고)"""
+        key = fingerprint_params(
+            [self.algo.get_params(), self.algo.min_periods, self.train_period, self.valid_period, self.symbols]
+        )
+        return os.path.join(self.state_dir, f"{self.__class__.__name__}_{key}")
+
+    def _incremental(self) -> bool:
+        return bool(self.state_dir) and isinstance(self.algo, MomentumAlgo) and not self.screen
+
+    def history_days(self) -> Optional[int]:
+        """
+        저장된 증분 상태를 이어가는 데 필요한 최근 데이터 일 수.
+        상태의 이동평균 구간(tail) 시작일부터 읽으며, 거래소 시간대와 채우기(ffill) 여유로 7일을 더합니다.
+        """
+        if not self._incremental():
+            return None
+        state = MomentumState.load(self._state_path())
+        if state is None:
+            return None
+        self._state = state
+        return (pd.Timestamp.now(tz="UTC") - state.tail_index[0]).days + 7
+
+    def _covers_recent(self, execute_date: datetime) -> bool:
+        """
+        최근 데이터만 있을 때 실행할 수 있는지. 학습 구간 전체가 들어 있거나 저장된 상태를 이어갈 수 있어야 함
+        """
+        try:
+            self.set_dates(execute_date=execute_date)
+        except ValueError:
+            return False
+        if self._train_bounds[0] > 0:
+            return True
+        return self._incremental() and self._state is not None and self._state.can_advance(self.train_data)
+
+    def _incremental_values(self, train_data: pd.DataFrame) -> pd.Series:
+        """
+        저장된 MomentumState 에 새 거래일만 반영해 점수를 계산합니다.
+        파라미터가 바뀌었거나(상태 파일 키가 다름) 이음매의 과거 데이터가 바뀌었으면 전체 재계산합니다.
+        """
+        state_path = self._state_path()
+        os.makedirs(self.state_dir, exist_ok=True)
+        with FileLock(state_path + ".lock", timeout=60):
+            try:
+                state = MomentumState.load(state_path)
+            except (OSError, ValueError, pickle.PickleError, EOFError) as e:
+                logger.warning(f"Failed to load strategy state {state_path}: {e}")
+                state = None
+
+            if state is not None and state.can_advance(train_data):
+                logger.info(f"Advancing momentum state to {train_data.index[-1]}")
+                MomentumState.invalidate(state_path)
+                state.advance(train_data)
+            else:
+                logger.info(f"Recomputing momentum state for {train_data.index[0]} ~ {train_data.index[-1]}")
+                state = MomentumState.from_frame(self.algo, train_data)
+            state.save(state_path)
+        self._state = state
+        return state.values()
+
     def select_stocks(self, calculated_values: pd.Series, **kwargs) -> List[str]:
         if not isinstance(calculated_values, pd.Series):
             raise ValueError(f"Expected a pandas Series, input : {type(calculated_values)}")
-        if self.selection_method == "top_n":
-            n = np.clip(self.selection_param, self.min_stocks, self.max_stocks)
-            selected = calculated_values.nlargest(n)
-        elif self.selection_method == "threshold":
-            threshold = (
-                calculated_values.mean()
-                + self.selection_param * calculated_values.std()
-            )
-            selected = calculated_values[calculated_values > threshold]
-            if len(selected) < self.min_stocks:
-                selected = calculated_values.nlargest(self.min_stocks)
-            elif len(selected) > self.max_stocks:
-                selected = selected.nlargest(self.max_stocks)
-        elif self.selection_method == "relative":
-            market_average = calculated_values.mean()
-            selected = calculated_values[calculated_values > market_average]
-            if len(selected) < self.min_stocks:
-                selected = calculated_values.nlargest(self.min_stocks)
-            elif len(selected) > self.max_stocks:
-                selected = selected.nlargest(self.max_stocks)
-        else:
-            raise ValueError("Invalid selection method")
-
-        selected_stocks = selected.index.tolist()
+        selected_stocks = select_matrix(
+            calculated_values.to_frame().T,
+            self.selection_method,
+            self.selection_param,
+            self.min_stocks,
+            self.max_stocks,
+        ).iloc[0]
 
         if not selected_stocks:
             logger.warning(
                 f"No stocks were selected using the {self.selection_method} method."
             )
-        elif len(selected_stocks) < self.min_stocks:
-            logger.info(
-                f"Only {len(selected_stocks)} stocks were selected. Using top {self.min_stocks} stocks instead."
-            )
-            selected_stocks = calculated_values.nlargest(self.min_stocks).index.tolist()
-        elif len(selected_stocks) > self.max_stocks:
-            logger.info(
-                f"{len(selected_stocks)} stocks were selected. Limiting to top {self.max_stocks} stocks."
-            )
-            selected_stocks = calculated_values.nlargest(self.max_stocks).index.tolist()
-
         logger.info(
-            f"Selected {len(selected_stocks)} stocks: {', '.join(selected_stocks)}"
+            f"Selected {len(selected_stocks)} stocks: {', '.join(map(str, selected_stocks))}"
         )
         return selected_stocks
 
@@ -125,56 +188,30 @@ class MomentumStrategy(ValueBasedStrategy):
         returns = portfolio.pct_change().dropna()
 
         self._portfolio_returns = returns.mean(axis=1)
+        log_memory("calculate_performance", returns)
 
-        cumulative_return = (1 + self._portfolio_returns).prod() - 1
-        annual_return = (1 + self._portfolio_returns.mean()) ** 252 - 1
-        annual_volatility = self._portfolio_returns.std() * np.sqrt(252)
-        sharpe_ratio = (
-            np.sqrt(252)
-            * self._portfolio_returns.mean()
-            / self._portfolio_returns.std()
-        )
-
-        cumulative = (1 + self._portfolio_returns).cumprod()
-        peak = cumulative.expanding(min_periods=1).max()
-        drawdown = (cumulative / peak) - 1
-        mdd = drawdown.min()
-
-        return {
-            "cumulative_return": cumulative_return,
-            "annual_return": annual_return,
-            "annual_volatility": annual_volatility,
-            "sharpe_ratio": sharpe_ratio,
-            "mdd": mdd,
-        }
+        performance = portfolio_metrics(self._portfolio_returns)
+        if self.bootstrap:
+            performance.update(
+                block_bootstrap(self._portfolio_returns, **self.bootstrap).iloc[0].to_dict()
+            )
+        return performance
 
-    def plot_backtest(self):
+    def backtest_series(self) -> Tuple[pd.Series, pd.DataFrame]:
+        """
+        검증 구간 포트폴리오 누적 수익률과 선택 종목의 정규화 가격
+        """
         if self._data is None or not self._selected_stocks:
             raise ValueError("Execute the strategy first before plotting.")
 
         cumulative_returns = (1 + self._portfolio_returns).cumprod()
+        prices = self._valid_data.loc[:, self._selected_stocks]
+        return cumulative_returns, prices / prices.iloc[0]
 
-        fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(15, 15), sharex=True)
-
-        # 포트폴리오 누적 수익률 그래프
-        ax1.plot(cumulative_returns.index, cumulative_returns.values, label="Portfolio")
-        ax1.set_title("Cumulative Portfolio Returns")
-        ax1.set_ylabel("Cumulative Returns")
-        ax1.legend()
-        ax1.grid(True)
-
-        # 개별 주식 가격 움직임 그래프
-        for stock in self._selected_stocks:
-            normalized_price = self._valid_data[stock] / self._valid_data[stock].iloc[0]
-            ax2.plot(self._valid_data.index, normalized_price, label=stock)
-
-        ax2.set_title("Individual Stock Price Movements (Normalized)")
-        ax2.set_xlabel("Date")
-        ax2.set_ylabel("Normalized Price")
-        ax2.legend(bbox_to_anchor=(1.05, 1), loc="upper left")
-        ax2.grid(True)
-
-        plt.tight_layout()
+    def plot_backtest(self):
+        cumulative_returns, normalized_prices = self.backtest_series()
+        fig = plt.figure(figsize=(15, 15))
+        draw_backtest(fig, cumulative_returns, normalized_prices)
         plt.show()
 
     def get_params(self) -> Dict[str, Any]:
@@ -183,6 +220,11 @@ class MomentumStrategy(ValueBasedStrategy):
             {
                 "selection_method": self.selection_method,
                 "selection_param": self.selection_param,
+                "min_stocks": self.min_stocks,
+                "max_stocks": self.max_stocks,
+                "bootstrap": self.bootstrap,
+                "fill_method": self.fill_method,
+                "fill_limit": self.fill_limit,
             }
         )
         return params
@@ -1,54 +1,221 @@
+import os
+import time
+import itertools
 import pytz
+import concurrent.futures
+import pandas as pd
 from datetime import datetime
-from typing import List, Optional, Dict, Tuple, Union
+from typing import Iterator, List, Optional, Dict, Tuple, Union
 from modules.strategy.core import ValueBasedStrategy
+from modules.strategy.result_store import PoolResultStore
+from modules.utils import iter_strategy_panel_groups
+from modules.logger import get_logger
+
+logger = get_logger(__name__)
 
 
 def filter_portfolios(portfolios: List[Tuple[Dict, ValueBasedStrategy]]) -> List[
     Tuple[Dict, ValueBasedStrategy]]:
+    # bootstrap 신뢰구간이 있으면 Sharpe 하한으로 판단
     return [
         (portfolio, strategy) for portfolio, strategy in portfolios
         if portfolio['performance']['cumulative_return'] > 0
-           and portfolio['performance']['sharpe_ratio'] > 0
+           and portfolio['performance'].get('sharpe_ratio_low', portfolio['performance']['sharpe_ratio']) > 0
         # additional filtering here
     ]
 
 
+def select_portfolio(
+        portfolios: List[Tuple[Dict, ValueBasedStrategy]],
+        trading_preferences: str = 'balanced',
+) -> Union[Tuple[Dict, ValueBasedStrategy], str]:
+    """
+    필터링된 후보 포트폴리오 중 trading_preferences 기준 최적 포트폴리오
+    """
+    if not portfolios:
+        return "No suitable strategy found based on the given criteria."
+
+    if trading_preferences == 'aggressive':
+        return max(portfolios, key=lambda x: x[0]['performance']['cumulative_return'])
+    elif trading_preferences == 'conservative':
+        return min(portfolios, key=lambda x: x[0]['performance']['mdd'])
+    elif trading_preferences == 'sharp':
+        return max(portfolios, key=lambda x: x[0]['performance']['sharpe_ratio'])
+    elif trading_preferences == 'low_volatility':
+        return min(portfolios, key=lambda x: x[0]['performance']['annual_volatility'])
+    else:  # balanced (default)
+        return max(portfolios, key=lambda x: x[0]['performance']['sharpe_ratio'])
+
+
 class StrategyPool:
 
     def __init__(
             self,
             strategies: List[ValueBasedStrategy],
             trading_preferences: Optional[str] = None,
+            executor: Optional[concurrent.futures.Executor] = None,
+            max_workers: Optional[int] = None,
+            timeout: Optional[float] = None,
+            data: Optional[pd.DataFrame] = None,
+            volume: Optional[pd.DataFrame] = None,
+            store: Optional[PoolResultStore] = None,
     ):
+        """
+        :param strategies: 평가할 전략 목록
+        :param trading_preferences: 포트폴리오 선택 기준
+        :param executor: 전략 실행에 사용할 executor. None 이면 execute 마다 ThreadPoolExecutor 생성
+        :param max_workers: executor 를 새로 만들 때의 worker 수
+        :param timeout: 전략별 실행 제한 시간(초). 초과한 전략은 결과에서 제외
+        :param data: 모든 전략이 공유할 (거래일 x 종목) 가격 데이터 (읽기 전용).
+                     None 이면 데이터가 없는 전략들의 패널을 실행 전에 load_data 로 한 번 만듦
+        :param volume: data 와 함께 공유할 거래량 데이터 (전략 screen 에 사용)
+        :param store: 평가 결과 저장소. 주어지면 같은 실행일/설정/데이터의 결과를 재사용
+        """
         self.strategies = strategies
         self.trading_preferences = trading_preferences or 'balanced'
+        self.executor = executor
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.data = data
+        self.volume = volume
+        self.store = store
+        self.errors: Dict[int, str] = {}  # 전략 index -> 실패 사유
+        self._shared: Optional[Tuple[pd.DataFrame, Optional[pd.DataFrame]]] = None  # 전략들에 set_data 한 (data, volume)
 
     def execute(self, execute_date: datetime = None) -> Tuple[Dict, ValueBasedStrategy]:
+        return select_portfolio(self.evaluate(execute_date), self.trading_preferences)
+
+    def load_data(self, update: bool = True):
+        """
+        데이터가 없는 전략들의 패널을 실행 전에 한 번만 만들어 set_data 합니다.
+        전략마다 execute 안에서 set_data 를 하면 여러 thread 가 같은 종목 파일을 동시에 update_to_latest 하므로
+        (같은 행이 두 번 append 될 수 있음) 종목별 최신화/읽기는 여기서 한 번만 하고,
+        fill 설정이 같고 종목이 겹치는 전략끼리 패널을 공유합니다.
+        :param update: True 면 데이터를 최신화(update_to_latest)한 뒤 읽음
+        """
+        for _ in self._iter_load(update):
+            pass
+
+    def _iter_load(self, update: bool = True) -> Iterator[List[ValueBasedStrategy]]:
+        """
+        load_data 와 같지만 패널이 준비된 전략 묶음을 준비되는 순서대로 내보냅니다. (iter_strategy_panel_groups)
+        묶음의 전략이 모두 최근 데이터만으로 실행할 수 있으면(history_days) 그 기간만 읽습니다.
+        """
+        missing = [strategy for strategy in self.strategies if strategy.data is None]
+        if not missing:
+            return
+        for group, panels, n_days_before in iter_strategy_panel_groups(missing, update, self.executor):
+            for strategy in group:
+                strategy.set_data(panels["close"], panels.get("volume"), n_days_before=n_days_before)
+            yield group
+
+    def run_strategies(self, execute_date: datetime) -> List[Tuple[Dict, ValueBasedStrategy]]:
+        """
+        전략들을 executor 에서 동시에 실행합니다.
+        데이터가 없는 전략은 공유 패널을 만들면서(load_data 참고) 패널이 준비된 묶음부터 실행하므로,
+        먼저 준비된 전략의 계산과 나머지 종목의 데이터 로딩이 겹칩니다.
+        실패하거나 timeout 을 넘긴 전략은 self.errors 에 기록하고 결과에서 제외합니다.
+        (실행 중인 thread 는 중단할 수 없으므로 timeout 된 전략의 결과는 버려집니다)
+        """
+        self.errors = {}
+        own_executor = self.executor is None
+        executor = self.executor or concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.max_workers or min(len(self.strategies), os.cpu_count() + 4) or 1
+        )
+        indices = {id(strategy): i for i, strategy in enumerate(self.strategies)}
+        futures: Dict[concurrent.futures.Future, int] = {}
+        results: Dict[int, Dict] = {}
+        started: Dict[concurrent.futures.Future, float] = {}
+        timed_out = False
+        try:
+            ready = [strategy for strategy in self.strategies if strategy.data is not None]
+            for group in itertools.chain([ready], self._iter_load()):
+                for strategy in group:
+                    futures[executor.submit(strategy.execute, execute_date)] = indices[id(strategy)]
+            pending = set(futures)
+            while pending:
+                done, pending = concurrent.futures.wait(
+                    pending,
+                    timeout=None if self.timeout is None else 0.1,
+                    return_when=concurrent.futures.FIRST_COMPLETED,
+                )
+                for future in done:
+                    i = futures[future]
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        result = None
+                        self.errors[i] = f"{type(e).__name__}: {e}"
+                    if result is None:
+                        self.errors.setdefault(i, "Strategy execution returned no result")
+                    else:
+                        results[i] = result
+
+                if self.timeout is not None:
+                    now = time.monotonic()
+                    for future in list(pending):
+                        if future.running():
+                            started.setdefault(future, now)
+                        if future in started and now - started[future] > self.timeout:
+                            self.errors[futures[future]] = f"Timed out after {self.timeout}s"
+                            future.cancel()
+                            pending.discard(future)
+                            timed_out = True
+        finally:
+            if own_executor:
+                executor.shutdown(wait=not timed_out, cancel_futures=True)
+
+        for i, error in sorted(self.errors.items()):
+            logger.error(f"Strategy {i} ({self.strategies[i].__class__.__name__}) failed: {error}")
+        return [(results[i], self.strategies[i]) for i in sorted(results)]
+
+    def evaluate(self, execute_date: datetime = None) -> List[Tuple[Dict, ValueBasedStrategy]]:
+        """
+        모든 전략을 한 번만 실행해 선택 후보 포트폴리오 목록을 반환합니다.
+        결과를 select_portfolio 에 넘기면 trading_preferences 별 선택을 다시 계산 없이 할 수 있습니다.
+        store 에 저장된 결과를 쓰면 데이터를 읽지 않고 전략도 실행하지 않으므로,
+        포트폴리오에 from_store=True 를 표시합니다. (이 전략 객체로는 backtest_series / 보고서를 만들 수 없음)
+        """
         if execute_date is None:
             execute_date = datetime.now(tz=pytz.UTC)
 
-        portfolios = []
-        for strategy in self.strategies:
-            portfolios.append((strategy.execute(execute_date), strategy))
+        if self.store is not None:
+            stored = self.store.load(self.store.make_key(execute_date, self.strategies, self.data))
+            if stored is not None:
+                return filter_portfolios(
+                    [(dict(portfolio, from_store=True), self.strategies[i]) for i, portfolio in stored]
+                )
+
+        if self.data is not None and (
+            self._shared is None or self._shared[0] is not self.data or self._shared[1] is not self.volume
+        ):
+            # 공유 데이터가 바뀌었을 때만 전략별 종목 선택을 다시 함 (같은 데이터로 반복 평가할 때 패널을 복사하지 않음)
+            for strategy in self.strategies:
+                strategy.set_data(self.data, self.volume)
+            self._shared = (self.data, self.volume)
 
-        return self.select_best_portfolio(portfolios)
+        portfolios = self.run_strategies(execute_date)
+        if self.store is not None and not self.errors:
+            # 실행 중 데이터가 최신화되었을 수 있으므로 실행 후의 watermark 로 저장
+            indices = {id(strategy): i for i, strategy in enumerate(self.strategies)}
+            self.store.save(
+                self.store.make_key(execute_date, self.strategies, self.data),
+                [(indices[id(strategy)], portfolio) for portfolio, strategy in portfolios],
+            )
+        return filter_portfolios(portfolios)
+
+    def select_all(
+            self,
+            preferences: List[str],
+            execute_date: datetime = None,
+    ) -> Dict[str, Union[Tuple[Dict, ValueBasedStrategy], str]]:
+        """
+        한 번의 평가로 여러 trading_preferences 의 최적 포트폴리오를 선택합니다.
+        :return: preference -> select_best_portfolio 결과
+        """
+        portfolios = self.evaluate(execute_date)
+        return {preference: select_portfolio(portfolios, preference) for preference in preferences}
 
     def select_best_portfolio(self, portfolios: List[Tuple[Dict, ValueBasedStrategy]]) -> Union[
         Tuple[Dict, ValueBasedStrategy], str]:
-        filtered_portfolios = filter_portfolios(portfolios)
-
-        if not filtered_portfolios:
-            return "No suitable strategy found based on the given criteria."
-
-        if self.trading_preferences == 'aggressive':
-            return max(filtered_portfolios, key=lambda x: x[0]['performance']['cumulative_return'])
-        elif self.trading_preferences == 'conservative':
-            return min(filtered_portfolios, key=lambda x: x[0]['performance']['mdd'])
-        elif self.trading_preferences == 'sharp':
-            return max(filtered_portfolios, key=lambda x: x[0]['performance']['sharpe_ratio'])
-        elif self.trading_preferences == 'low_volatility':
-            return min(filtered_portfolios, key=lambda x: x[0]['performance']['annual_volatility'])
-        else:  # balanced (default)
-            return max(filtered_portfolios, key=lambda x: x[0]['performance']['sharpe_ratio'])
-
+        return select_portfolio(filter_portfolios(portfolios), self.trading_preferences)
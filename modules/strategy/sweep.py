@@ -0,0 +1,234 @@
+import os
+import json
+import itertools
+import concurrent.futures
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+from modules.algo.cache import IndicatorCache
+from modules.fingerprint import fingerprint_frame, fingerprint_params
+from modules.strategy.backtest import WalkForwardBacktest
+from modules.utils import load_module, CONFIG_KEY_STRATEGY, CONFIG_KEY_ALGORITHM
+from modules.logger import get_logger
+
+logger = get_logger(__name__)
+
+SWEEP_SECTIONS = (CONFIG_KEY_STRATEGY, CONFIG_KEY_ALGORITHM)
+
+# 워커 프로세스 전역 상태 (initializer 에서 설정)
+_worker_data: Optional[pd.DataFrame] = None
+_worker_config: Optional[Dict[str, Any]] = None
+
+
+def expand_grid(grid: Dict[str, Dict[str, List[Any]]]) -> List[Dict[str, Dict[str, Any]]]:
+    """
+    설정 파일과 같은 구조의 파라미터 grid 를 모든 조합으로 펼칩니다.
+    (ex: {"strategy": {"train_period": [120, 240]}, "algorithm": {"window": [10, 20]}} -> 4개 조합)
+    """
+    keys = [(section, key) for section in SWEEP_SECTIONS for key in grid.get(section, {})]
+    values = [grid[section][key] for section, key in keys]
+    return [_nest(keys, combination) for combination in itertools.product(*values)]
+
+
+def sample_params(
+    space: Dict[str, Dict[str, Union[List[Any], Tuple[float, float]]]],
+    n_samples: int,
+    seed: Optional[int] = None,
+) -> List[Dict[str, Dict[str, Any]]]:
+    """
+    random search 용 파라미터 조합 샘플링.
+    list 는 그 중 하나를 고르고, (low, high) tuple 은 구간에서 균등 샘플링합니다. (둘 다 int 면 정수)
+    """
+    rng = np.random.default_rng(seed)
+    keys = [(section, key) for section in SWEEP_SECTIONS for key in space.get(section, {})]
+    samples = []
+    for _ in range(n_samples):
+        combination = []
+        for section, key in keys:
+            values = space[section][key]
+            if isinstance(values, tuple):
+                low, high = values
+                if isinstance(low, int) and isinstance(high, int):
+                    combination.append(int(rng.integers(low, high + 1)))
+                else:
+                    combination.append(float(rng.uniform(low, high)))
+            else:
+                combination.append(values[rng.integers(len(values))])
+        samples.append(_nest(keys, combination))
+    return samples
+
+
+def _nest(keys: List[Tuple[str, str]], values) -> Dict[str, Dict[str, Any]]:
+    params = {section: {} for section in SWEEP_SECTIONS}
+    for (section, key), value in zip(keys, values):
+        params[section][key] = value.item() if isinstance(value, np.generic) else value
+    return params
+
+
+def _init_worker(
+    matrix_path: str,
+    index: pd.DatetimeIndex,
+    columns: pd.Index,
+    config: Dict[str, Any],
+    cache_dir: Optional[str],
+):
+    """
+    워커마다 한 번 실행. 가격 행렬은 memory-map 으로 열어 프로세스 간에 복사 없이 공유합니다.
+    """
+    global _worker_data, _worker_config
+    values = np.load(matrix_path, mmap_mode="r")
+    _worker_data = pd.DataFrame(values, index=index, columns=columns, copy=False)
+    _worker_config = config
+    if cache_dir:
+        IndicatorCache.configure(disk_path=cache_dir)
+
+
+def evaluate_params(
+    params: Dict[str, Dict[str, Any]],
+    data: pd.DataFrame,
+    config: Dict[str, Any],
+) -> Dict[str, Any]:
+    """
+    파라미터 조합 하나를 평가합니다.
+    config 의 "rebalance" 가 있으면 walk-forward 백테스트, 없으면 execute_date 기준 단일 실행.
+    """
+    strategy_class = load_module(config, CONFIG_KEY_STRATEGY)
+    algorithm_class = load_module(config, CONFIG_KEY_ALGORITHM)
+    strategy_params = {**config[CONFIG_KEY_STRATEGY].get("params", {}), **params[CONFIG_KEY_STRATEGY]}
+    algorithm_params = {**config[CONFIG_KEY_ALGORITHM].get("params", {}), **params[CONFIG_KEY_ALGORITHM]}
+
+    strategy = strategy_class(dps=[], algo=algorithm_class(**algorithm_params), **strategy_params)
+    strategy.set_data(data)
+
+    if config.get("rebalance") is not None:
+        result = WalkForwardBacktest(
+            strategy,
+            rebalance=config["rebalance"],
+            start_date=config.get("start_date"),
+            end_date=config.get("end_date"),
+        ).run()
+        return {"performance": result["performance"], "n_rebalances": len(result["selections"])}
+
+    result = strategy.execute(config.get("execute_date"))
+    if result is None:
+        raise ValueError("Strategy execution returned no result")
+    return {"performance": result["performance"], "selected_stocks": result["selected_stocks"]}
+
+
+def _evaluate_in_worker(key: str, params: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    record = {"key": key, "params": params}
+    try:
+        record.update(evaluate_params(params, _worker_data, _worker_config))
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+    return record
+
+
+class ParameterSweep:
+    def __init__(
+        self,
+        data: pd.DataFrame,
+        config: Dict[str, Any],
+        output_path: str,
+        execute_date: Optional[datetime] = None,
+        rebalance: Optional[Union[int, str]] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        max_workers: Optional[int] = None,
+    ):
+        """
+        MomentumStrategy / MomentumAlgo 파라미터 조합을 프로세스 풀에서 평가합니다.
+        가격 행렬은 output 디렉토리에 .npy 로 한 번 저장해 모든 워커가 memory-map 으로 공유하고,
+        지표 캐시는 같은 디렉토리의 디스크 캐시를 워커끼리 공유합니다.
+        결과는 완료되는 대로 JSON Lines 파일에 기록되며, 다시 실행하면 이미 평가한 조합은 건너뜁니다.
+        :param data: (거래일 x 종목) 가격 데이터
+        :param config: 전략 설정 (strategy / algorithm 섹션. params 는 조합의 기본값)
+        :param output_path: 결과 JSON Lines 파일 경로
+        :param execute_date: 단일 실행 기준일 (rebalance 가 None 일 때). None 이면 data 의 마지막 거래일 다음 날
+        :param rebalance: 주어지면 walk-forward 백테스트로 평가 (WalkForwardBacktest 참고)
+        :param start_date: walk-forward 시작일
+        :param end_date: walk-forward 종료일
+        :param max_workers: 프로세스 수. None 이면 CPU 수
+        """
+        if execute_date is None and rebalance is None and len(data.index):
+            # 마지막 거래일까지 검증 구간에 포함되도록 그 다음 날을 실행일로 사용
+            execute_date = data.index[-1] + pd.Timedelta(days=1)
+        self.data = data
+        self.config = {
+            CONFIG_KEY_STRATEGY: config[CONFIG_KEY_STRATEGY],
+            CONFIG_KEY_ALGORITHM: config[CONFIG_KEY_ALGORITHM],
+            "execute_date": execute_date,
+            "rebalance": rebalance,
+            "start_date": start_date,
+            "end_date": end_date,
+        }
+        self.output_path = output_path
+        self.work_dir = os.path.splitext(output_path)[0] + "_work"
+        self.max_workers = max_workers or os.cpu_count()
+
+    def _write_matrix(self) -> str:
+        os.makedirs(self.work_dir, exist_ok=True)
+        matrix_path = os.path.join(self.work_dir, "prices.npy")
+        np.save(matrix_path, np.ascontiguousarray(self.data.to_numpy()))
+        return matrix_path
+
+    def _done_keys(self) -> set:
+        if not os.path.exists(self.output_path):
+            return set()
+        with open(self.output_path, "r", encoding="utf-8") as file:
+            return {json.loads(line)["key"] for line in file if line.strip()}
+
+    def run(self, combinations: List[Dict[str, Dict[str, Any]]]) -> Iterator[Dict[str, Any]]:
+        """
+        조합들을 평가하고 완료되는 순서대로 결과를 기록하며 내보냅니다.
+        :param combinations: expand_grid / sample_params 결과
+        """
+        # 같은 평가 설정(기본 파라미터, 실행일, 리밸런싱 주기), 같은 데이터, 같은 조합이면 같은 키
+        # (새 거래일이 추가되거나 데이터가 바뀌면 이전 결과를 재사용하지 않음)
+        data_key = [str(self.data.index[-1]) if len(self.data.index) else None, fingerprint_frame(self.data)]
+        keyed = {fingerprint_params([self.config, data_key, params]): params for params in combinations}
+        done = self._done_keys()
+        pending = {key: params for key, params in keyed.items() if key not in done}
+        logger.info(
+            f"Parameter sweep: {len(keyed)} combinations, {len(keyed) - len(pending)} already done, "
+            f"{len(pending)} to evaluate on {self.max_workers} workers"
+        )
+        if not pending:
+            return
+
+        matrix_path = self._write_matrix()
+        os.makedirs(os.path.dirname(os.path.abspath(self.output_path)), exist_ok=True)
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            initializer=_init_worker,
+            initargs=(
+                matrix_path,
+                self.data.index,
+                self.data.columns,
+                self.config,
+                os.path.join(self.work_dir, "indicator_cache"),
+            ),
+        ) as executor, open(self.output_path, "a", encoding="utf-8") as output:
+            futures = [
+                executor.submit(_evaluate_in_worker, key, params)
+                for key, params in pending.items()
+            ]
+            for n_done, future in enumerate(concurrent.futures.as_completed(futures), start=1):
+                record = future.result()
+                output.write(json.dumps(record, default=str) + "\n")
+                output.flush()
+                if "error" in record:
+                    logger.warning(f"Sweep combination {record['params']} failed: {record['error']}")
+                if n_done % 100 == 0:
+                    logger.info(f"Parameter sweep progress: {n_done}/{len(pending)}")
+                yield record
+
+
+def load_results(output_path: str) -> pd.DataFrame:
+    """
+    sweep 결과 파일을 (조합 x 파라미터/성과 지표) DataFrame 으로 읽습니다.
+    """
+    with open(output_path, "r", encoding="utf-8") as file:
+        records = [json.loads(line) for line in file if line.strip()]
+    return pd.json_normalize(records)
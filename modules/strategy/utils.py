@@ -1,5 +1,7 @@
 import numpy as np
+import pandas as pd
 from typing import Tuple, Dict
+from modules.strategy.metrics import batch_metrics
 from modules.logger import get_logger, setup_global_logging
 
 
@@ -38,3 +40,11 @@ def retrieve_selected_stocks(pool_result: Tuple, symbol_mapper: Dict) -> Dict:
         "sharpe_ratio": np.round(performances['sharpe_ratio'], 5),
         "mdd": f"{performances['mdd']:.2%}",
     }
+
+
+def portfolio_metrics(returns: pd.Series) -> Dict[str, float]:
+    """
+    일별 포트폴리오 수익률로 성과 지표 계산
+    :param returns: 일별 수익률
+    """
+    return batch_metrics(returns.to_frame()).iloc[0].to_dict()
@@ -7,8 +7,10 @@ import threading
 import pytz
 import importlib
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any, Callable
+from typing import List, Optional, Dict, Any, Callable, Iterable, Iterator, Tuple
 from modules.data.data_pipeline import ProviderDataPipeline, DataProvider
+from modules.data.calendar import TradingCalendar, PanelBuilder, get_calendar
+from modules.data.dtypes import log_memory
 from modules.logger import get_logger
 
 logger = get_logger(__name__)
@@ -22,6 +24,7 @@ CONFIG_KEY_NAME = "name"
 CONFIG_KEY_STOCKS = "stocks"
 CONFIG_KEY_BASE_PATH = "base_path"
 CONFIG_KEY_STOCKS_FILE = "stocks_file"
+CONFIG_KEY_COMPACT = "compact"
 
 
 def find_project_root(current_path: str) -> str:
@@ -214,15 +217,25 @@ def process_data(
         return None
 
 
+def read_data(
+    dp: ProviderDataPipeline, n_days_before: Optional[int] = None
+) -> Optional[Dict[str, pd.DataFrame]]:
+    """
+    process_data 와 같지만 최신화(update_to_latest) 없이 저장된 데이터만 읽습니다.
+    """
+    return {dp.data_provider.symbol: load_data(dp, n_days_before)}
+
+
 def create_pipelines(config: Dict[str, Any]) -> List[ProviderDataPipeline]:
     logger.info("Creating data pipelines")
     providers = create_data_providers(config)
     base_path = config[CONFIG_KEY_DATA_PIPELINES][CONFIG_KEY_BASE_PATH]
+    compact = bool(config[CONFIG_KEY_DATA_PIPELINES].get(CONFIG_KEY_COMPACT, False))
     pipelines = []
     for provider in providers:
         symbol_base_path = os.path.join(base_path, provider.symbol)
         pipeline = ProviderDataPipeline(
-            data_provider=provider, base_path=symbol_base_path
+            data_provider=provider, base_path=symbol_base_path, compact=compact
         )
         pipelines.append(pipeline)
         logger.debug(f"Created pipeline for symbol: {provider.symbol}")
@@ -231,23 +244,40 @@ def create_pipelines(config: Dict[str, Any]) -> List[ProviderDataPipeline]:
     return pipelines
 
 
-def parallel_process(
-    func: Callable, items: List[Any], n_days_before: Optional[int] = None
-) -> List[Dict[str, pd.DataFrame]]:
-    logger.info("Starting parallel processing")
-    results = []
-    with concurrent.futures.ThreadPoolExecutor(
-        max_workers=min(32, os.cpu_count() + 4)
-    ) as executor:
+def iter_process(
+    func: Callable,
+    items: List[Any],
+    n_days_before: Optional[int] = None,
+    executor: Optional[concurrent.futures.Executor] = None,
+) -> Iterator[Dict[str, pd.DataFrame]]:
+    """
+    parallel_process 와 같지만 완료되는 순서대로 결과를 바로 내보냅니다.
+    :param executor: 사용할 executor. None 이면 새 ThreadPoolExecutor 생성
+    """
+    own_executor = executor is None
+    if own_executor:
+        executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(32, os.cpu_count() + 4)
+        )
+    try:
         futures = [executor.submit(func, item, n_days_before) for item in items]
-
         for future in concurrent.futures.as_completed(futures):
             try:
                 result = future.result()
                 if result is not None:
-                    results.append(result)
+                    yield result
             except Exception as e:
                 logger.error(f"An error occurred during parallel processing: {e}")
+    finally:
+        if own_executor:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+def parallel_process(
+    func: Callable, items: List[Any], n_days_before: Optional[int] = None
+) -> List[Dict[str, pd.DataFrame]]:
+    logger.info("Starting parallel processing")
+    results = list(iter_process(func, items, n_days_before))
 
     logger.info("All data processing completed.")
     logger.info(f"Successfully processed {len(results)} items.")
@@ -339,48 +369,241 @@ def create_strategy(config: Dict[str, Any]):
     return strategy_class(**strategy_params)
 
 
-def prepare_data(dp_result: List) -> pd.DataFrame:
+def get_calendar_for(dps: List[ProviderDataPipeline]) -> TradingCalendar:
+    markets = {getattr(dp.data_provider, "market", None) for dp in dps}
+    if len(markets) > 1:
+        logger.warning(f"여러 거래소의 종목이 섞여 있습니다: {markets}. 첫 번째 거래소 달력을 사용합니다.")
+    return get_calendar(next(iter(markets), None))
 
-    logger.info("Preparing data for strategy execution")
 
-    aggregated_data = []
-    for data in dp_result:
-        for k, df in data.items():
-            if df is None:
-                logger.warning(f"데이터가 없습니다: {k}")
-                continue
-            if df.empty:
-                logger.warning(f"빈 데이터프레임입니다: {k}")
-                continue
-            if "close" not in df.columns:
-                logger.warning(f"'close' 컬럼이 없습니다: {k}")
-                continue
-
-            close_price = df["close"]
-            if close_price.empty:
-                logger.warning(f"'close' 가격 데이터가 비어 있습니다: {k}")
-                continue
-
-            close_price.name = k
-            aggregated_data.append(close_price)
-            logger.info(f"{k}: shape {close_price.shape}")
-
-    # 중복된 인덱스를 제거합니다.
-    for i, data in enumerate(aggregated_data):
-        if data.index.duplicated().any():
-            logger.warning(f"중복된 인덱스를 제거합니다: {data.name}")
-            aggregated_data[i] = data[~data.index.duplicated(keep='first')]
-
-    all_data = pd.concat(aggregated_data, axis=1)
-
-    if not isinstance(all_data.index, pd.DatetimeIndex):
-        all_data.index = pd.to_datetime(all_data.index)
-        logger.info("인덱스를 datetime 형식으로 변환했습니다.")
-
-    all_data = all_data.resample("1D").last().bfill().ffill()
-    all_data = all_data.sort_index()
-    return all_data
+def extract_column(symbol: str, df: Optional[pd.DataFrame], column: str = "close") -> Optional[pd.Series]:
+    if df is None:
+        logger.warning(f"데이터가 없습니다: {symbol}")
+        return None
+    if df.empty:
+        logger.warning(f"빈 데이터프레임입니다: {symbol}")
+        return None
+    if column not in df.columns:
+        logger.warning(f"'{column}' 컬럼이 없습니다: {symbol}")
+        return None
+
+    values = df[column]
+    if values.empty:
+        logger.warning(f"'{column}' 데이터가 비어 있습니다: {symbol}")
+        return None
+
+    logger.info(f"{symbol}: {column} shape {values.shape}")
+    return values
+
+
+def extract_close(symbol: str, df: Optional[pd.DataFrame]) -> Optional[pd.Series]:
+    return extract_column(symbol, df, "close")
+
+
+def build_panels(
+    dp_results: Iterable[Dict[str, pd.DataFrame]],
+    calendar: Optional[TradingCalendar] = None,
+    fill_method: str = "ffill",
+    fill_limit: Optional[int] = None,
+    columns: Iterable[str] = ("close",),
+) -> Dict[str, pd.DataFrame]:
+    """
+    데이터 로딩 결과를 받는 대로 종목별 정렬 준비를 하고, 마지막에 컬럼별 거래일 x 종목 행렬을 만듭니다.
+    첫 번째 컬럼(가격)에만 fill_method 를 적용하고 나머지(ex: volume)는 관측값만 남깁니다.
+    :param dp_results: process_data 결과 (리스트 또는 iter_process 제너레이터)
+    :param columns: 행렬로 만들 컬럼
+    :return: 컬럼 -> (거래일 x 종목) 행렬
+    """
+    builders = _panel_builders(calendar, fill_method, fill_limit, columns)
+    for data in dp_results:
+        _add_to_builders(builders, data)
+    return _finish_panels(builders)
+
+
+def _panel_builders(
+    calendar: Optional[TradingCalendar],
+    fill_method: str,
+    fill_limit: Optional[int],
+    columns: Iterable[str],
+) -> Dict[str, PanelBuilder]:
+    return {
+        column: PanelBuilder(
+            calendar,
+            fill_method=fill_method if i == 0 else "none",
+            fill_limit=fill_limit,
+        )
+        for i, column in enumerate(columns)
+    }
+
+
+def _add_to_builders(builders: Dict[str, PanelBuilder], data: Dict[str, pd.DataFrame]):
+    for k, df in data.items():
+        for column, builder in builders.items():
+            values = extract_column(k, df, column)
+            if values is not None:
+                builder.add(k, values)
+
+
+def _finish_panels(builders: Dict[str, PanelBuilder]) -> Dict[str, pd.DataFrame]:
+    # 거래일 달력 기준으로 한 번에 정렬합니다. (주말/휴일 행 없음, 과거 방향 채우기 없음)
+    panels = {column: builder.build() for column, builder in builders.items()}
+
+    coverage = next(iter(builders.values())).coverage
+    if not coverage.empty:
+        low_coverage = coverage[coverage["coverage"] < 0.95]
+        if not low_coverage.empty:
+            logger.warning(f"거래일 대비 관측 비율이 낮은 종목:\n{low_coverage.to_string()}")
+    for column, panel in panels.items():
+        log_memory(f"prepare_data ({column})", panel)
+    return panels
+
+
+def build_panel(
+    dp_results: Iterable[Dict[str, pd.DataFrame]],
+    calendar: Optional[TradingCalendar] = None,
+    fill_method: str = "ffill",
+    fill_limit: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    종가 (거래일 x 종목) 행렬. build_panels 참고
+    :param dp_results: process_data 결과 (리스트 또는 iter_process 제너레이터)
+    """
+    return build_panels(dp_results, calendar, fill_method, fill_limit, columns=("close",))["close"]
+
+
+def build_strategy_panels(
+    strategies: List,
+    update: bool = True,
+    fill_method: str = "ffill",
+    fill_limit: Optional[int] = None,
+    executor: Optional[concurrent.futures.Executor] = None,
+    n_days_before: Optional[int] = None,
+) -> Dict[str, pd.DataFrame]:
+    """
+    여러 전략이 공유할 패널을 한 번에 만듭니다. 종목은 전략들의 데이터 파이프라인 합집합이며,
+    screen 을 쓰는 전략이 있으면 거래량 패널도 만듭니다.
+    :param update: True 면 데이터를 최신화(update_to_latest)한 뒤 읽음
+    :param executor: 데이터 로딩에 사용할 executor. None 이면 새 ThreadPoolExecutor 생성
+    :param n_days_before: 최근 이 일 수만 읽음. None 이면 전체 이력
+    :return: 컬럼 -> (거래일 x 종목) 행렬
+    """
+    dps = list({dp.data_provider.symbol: dp for s in strategies for dp in s.dps}.values())
+    columns = ("close", "volume") if any(s.screen for s in strategies) else ("close",)
+    return build_panels(
+        iter_process(process_data if update else read_data, dps, n_days_before, executor=executor),
+        calendar=get_calendar_for(dps),
+        fill_method=fill_method,
+        fill_limit=fill_limit,
+        columns=columns,
+    )
+
+
+def fill_settings(strategy) -> Tuple[str, Optional[int]]:
+    """전략의 (fill_method, fill_limit). 같은 값의 전략끼리는 패널을 공유할 수 있음"""
+    return getattr(strategy, "fill_method", "ffill"), getattr(strategy, "fill_limit", None)
+
+
+def strategy_load_groups(strategies: List) -> List[List]:
+    """
+    패널을 공유할 전략 묶음. fill 설정이 같고 종목이 겹치는 전략끼리 한 묶음(종목 합집합 패널)이 되며,
+    종목 수가 적은 묶음부터 반환합니다.
+    """
+    groups: List[Tuple[Tuple[str, Optional[int]], set, List]] = []  # (fill 설정, 종목, 전략)
+    for strategy in strategies:
+        settings = fill_settings(strategy)
+        symbols = {dp.data_provider.symbol for dp in strategy.dps}
+        members = [strategy]
+        for group in [g for g in groups if g[0] == settings and g[1] & symbols]:
+            groups.remove(group)
+            symbols |= group[1]
+            members = group[2] + members
+        groups.append((settings, symbols, members))
+    return [members for _, _, members in sorted(groups, key=lambda group: len(group[1]))]
+
+
+def iter_strategy_panel_groups(
+    strategies: List,
+    update: bool = True,
+    executor: Optional[concurrent.futures.Executor] = None,
+) -> Iterator[Tuple[List, Dict[str, pd.DataFrame], Optional[int]]]:
+    """
+    전략 묶음(strategy_load_groups)별 공유 패널을 데이터가 도착하는 대로 만듭니다.
+    종목별 최신화(update_to_latest)와 읽기는 전략 수와 관계없이 한 번만 하며, 작은 묶음의 종목부터 읽습니다.
+    묶음의 종목이 모두 도착하면 나머지 종목을 읽는 동안 그 묶음을 바로 내보내므로,
+    호출하는 쪽은 먼저 준비된 전략을 실행하면서 다음 묶음의 데이터를 받을 수 있습니다.
+    :param update: True 면 데이터를 최신화한 뒤 읽음
+    :param executor: 데이터 로딩에 사용할 executor. None 이면 새 ThreadPoolExecutor 생성
+    :return: (묶음 전략, 컬럼 -> (거래일 x 종목) 행렬, n_days_before) 를 준비되는 순서대로.
+             n_days_before 는 묶음 전략들의 history_days 중 가장 긴 값 (하나라도 None 이면 전체 이력)
+    """
+    groups = strategy_load_groups(strategies)
+    group_days = []
+    for group in groups:
+        history_days = [strategy.history_days() for strategy in group]
+        group_days.append(None if None in history_days else max(history_days))
+
+    dps: Dict[str, ProviderDataPipeline] = {}
+    symbol_groups: Dict[str, List[int]] = {}  # 종목 -> 그 종목이 필요한 묶음
+    builders, pending = [], []
+    for i, group in enumerate(groups):
+        group_dps = {dp.data_provider.symbol: dp for s in group for dp in s.dps}
+        for symbol, dp in group_dps.items():
+            dps.setdefault(symbol, dp)
+            symbol_groups.setdefault(symbol, []).append(i)
+        fill_method, fill_limit = fill_settings(group[0])
+        builders.append(
+            _panel_builders(
+                get_calendar_for(list(group_dps.values())),
+                fill_method,
+                fill_limit,
+                ("close", "volume") if any(s.screen for s in group) else ("close",),
+            )
+        )
+        pending.append(set(group_dps))
+
+    # 여러 묶음이 쓰는 종목은 가장 긴 기간으로 한 번 읽음
+    symbol_days = {
+        symbol: None if any(group_days[i] is None for i in indices) else max(group_days[i] for i in indices)
+        for symbol, indices in symbol_groups.items()
+    }
+    func = process_data if update else read_data
+
+    def load(dp: ProviderDataPipeline, _) -> Dict[str, pd.DataFrame]:
+        # 실패한 종목도 도착으로 처리되도록 빈 결과를 돌려줌
+        symbol = dp.data_provider.symbol
+        return func(dp, symbol_days[symbol]) or {symbol: None}
+
+    def finish(i: int):
+        pending[i] = None
+        logger.info(f"Loaded shared panel for {len(groups[i])} strategies")
+        return groups[i], _finish_panels(builders[i]), group_days[i]
+
+    for i in range(len(groups)):
+        if not pending[i]:
+            yield finish(i)
+    for data in iter_process(load, list(dps.values()), executor=executor):
+        for symbol, df in data.items():
+            for i in symbol_groups.get(symbol, []):
+                if pending[i] is None:
+                    continue
+                _add_to_builders(builders[i], {symbol: df})
+                pending[i].discard(symbol)
+                if not pending[i]:
+                    yield finish(i)
+    for i in range(len(groups)):
+        if pending[i] is not None:
+            yield finish(i)
+
+
+def prepare_data(
+    dp_result: List,
+    calendar: Optional[TradingCalendar] = None,
+    fill_method: str = "ffill",
+    fill_limit: Optional[int] = None,
+) -> pd.DataFrame:
 
+    logger.info("Preparing data for strategy execution")
+    return build_panel(dp_result, calendar, fill_method=fill_method, fill_limit=fill_limit)
 
 
 def create_symbol_mapper(configs: List[Dict]) -> Dict[str, str]:
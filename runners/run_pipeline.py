@@ -0,0 +1,167 @@
+import os
+import sys
+import glob
+import logging
+from datetime import datetime
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+sys.path.append(project_root)
+
+from modules.dag import DAGRunner, Stage
+from modules.data.aggregation import Aggregation
+from modules.fingerprint import fingerprint_files, fingerprint_params
+from modules.utils import (
+    read_config,
+    create_pipelines,
+    create_strategy,
+    create_symbol_mapper,
+    build_panels,
+    get_calendar_for,
+    parallel_process,
+    fill_settings,
+    read_data,
+    CONFIG_KEY_DATA_PIPELINES,
+    CONFIG_KEY_BASE_PATH,
+)
+from modules.strategy.strategy_pool import StrategyPool
+from modules.strategy.utils import retrieve_selected_stocks
+from modules.logger import get_logger, setup_global_logging
+
+# 로거 설정
+logger = get_logger(__name__)
+
+# 국가별 데이터 파이프라인 설정
+DATA_CONFIGS = {
+    "kor": "fdr_config.yaml",
+    "usa": "yahoo_config.yaml",
+}
+
+# StrategyPool trading_preferences -> 투자 유형
+INVEST_TYPES = {
+    "aggressive": "공격투자형",
+    "conservative": "방어투자형",
+    "balanced": "중립투자형",
+}
+
+
+def update_pipeline(dp, n_days_before=None):
+    dp.update_to_latest()
+    return dp.data_provider.symbol
+
+
+def compact_pipeline(dp, n_days_before=None):
+    return {dp.data_provider.symbol: dp.compact()}
+
+
+def build_stages(national: str) -> list:
+    data_config = read_config(
+        os.path.join(project_root, "configs", "datapipelines", DATA_CONFIGS[national])
+    )
+    config_file_list = glob.glob(
+        os.path.join(project_root, "configs", "strategies", national, "*.yaml")
+    )
+    configs = [read_config(config_file) for config_file in sorted(config_file_list)]
+
+    base_path = data_config[CONFIG_KEY_DATA_PIPELINES][CONFIG_KEY_BASE_PATH]
+    dps = create_pipelines(data_config)
+    execute_date = datetime.now().strftime("%Y-%m-%d")
+
+    def ingest():
+        return parallel_process(update_pipeline, dps)
+
+    def compact(ingest):
+        return parallel_process(compact_pipeline, dps)
+
+    def storage_fingerprint(**_):
+        return fingerprint_files([base_path])
+
+    def aggregate(compact):
+        return Aggregation(
+            root_path=base_path,
+            save_path=os.path.join(project_root, "data", "aggregated", national.upper()),
+            calendar=get_calendar_for(dps),
+        ).run()
+
+    strategy_list = [strategy for strategy in map(create_strategy, configs) if strategy is not None]
+    # 전략들의 (fill_method, fill_limit). 같은 설정의 전략끼리 패널을 공유
+    settings_list = list(dict.fromkeys(map(fill_settings, strategy_list)))
+    columns = ("close", "volume") if any(strategy.screen for strategy in strategy_list) else ("close",)
+
+    def panel(compact):
+        # 종목 데이터는 한 번만 읽고 fill 설정별로 패널을 만듦
+        results = parallel_process(read_data, dps)
+        return {
+            (fill_method, fill_limit): build_panels(
+                results,
+                calendar=get_calendar_for(dps),
+                fill_method=fill_method,
+                fill_limit=fill_limit,
+                columns=columns,
+            )
+            for fill_method, fill_limit in settings_list
+        }
+
+    def panel_fingerprint(**_):
+        return [storage_fingerprint(), settings_list, columns]
+
+    def strategies(panel):
+        for strategy in strategy_list:
+            panels = panel[fill_settings(strategy)]
+            strategy.set_data(panels["close"], panels.get("volume"))
+
+        symbol_mapper = create_symbol_mapper(configs)
+        results = {}
+        pool_results = StrategyPool(strategy_list).select_all(list(INVEST_TYPES))
+        for preference, invest_type in INVEST_TYPES.items():
+            pool_result = pool_results[preference]
+            if isinstance(pool_result, str):
+                logger.warning(f"{preference}: {pool_result}")
+                continue
+            result = retrieve_selected_stocks(pool_result, symbol_mapper)
+            result["n_of_strategies"] = len(strategy_list)  # 검토한 전략의 수
+            result["national"] = national.upper()  # 투자 국가
+            result["invest_type"] = invest_type  # 투자 유형
+            results[preference] = result
+        return results
+
+    def strategies_fingerprint(panel):
+        return [storage_fingerprint(), fingerprint_params(configs), execute_date]
+
+    return [
+        Stage("ingest", ingest),
+        Stage("compact", compact, deps=["ingest"], fingerprint=storage_fingerprint),
+        Stage("aggregate", aggregate, deps=["compact"], fingerprint=storage_fingerprint),
+        Stage("panel", panel, deps=["compact"], fingerprint=panel_fingerprint, cache=True),
+        Stage(
+            "strategies",
+            strategies,
+            deps=["panel"],
+            fingerprint=strategies_fingerprint,
+            cache=True,
+        ),
+    ]
+
+
+if __name__ == "__main__":
+    # 전역 로깅 설정
+    setup_global_logging(
+        log_dir=os.path.join(project_root, "logs"),
+        log_level=logging.INFO,
+        file_level=logging.DEBUG,
+        stream_level=logging.INFO,
+        # telegram_token과 telegram_chat_id는 필요한 경우 추가
+    )
+
+    logger.info("Starting script")
+
+    national = "kor"
+
+    runner = DAGRunner(
+        build_stages(national),
+        state_dir=os.path.join(project_root, "data", ".dag", national),
+    )
+    outputs = runner.run()
+    print(outputs.get("strategies"))
+
+    logger.info("Script completed")
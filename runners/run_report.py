@@ -0,0 +1,50 @@
+import os
+import sys
+import glob
+import logging
+import pytz
+from datetime import datetime
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+sys.path.append(project_root)
+
+from modules.algo.cache import IndicatorCache
+from modules.utils import read_config, create_strategy
+from modules.strategy.strategy_pool import StrategyPool
+from modules.strategy.report import render_reports
+from modules.logger import get_logger, setup_global_logging
+
+# 로거 설정
+logger = get_logger(__name__)
+
+
+if __name__ == "__main__":
+    # 전역 로깅 설정
+    setup_global_logging(
+        log_dir=os.path.join(project_root, "logs"),
+        log_level=logging.INFO,
+        file_level=logging.DEBUG,
+        stream_level=logging.INFO,
+    )
+
+    # run_strategies 와 같은 디스크 캐시를 사용해 같은 날 계산한 지표를 재사용
+    IndicatorCache.configure(disk_path=os.path.join(project_root, "data", "indicator_cache"))
+
+    national = sys.argv[1] if len(sys.argv) > 1 else "kor"
+    execute_date = datetime.now(tz=pytz.UTC)
+
+    config_files = sorted(
+        glob.glob(os.path.join(project_root, "configs", "strategies", national, "*.yaml"))
+    )
+    strategies = [create_strategy(read_config(config_file)) for config_file in config_files]
+    strategies = [strategy for strategy in strategies if strategy is not None]
+
+    # 전략들이 공유할 패널을 fill 설정별로 한 번만 만들고 모든 전략의 결과를 보고서로 저장
+    pool = StrategyPool(strategies)
+    pool.load_data(update=False)
+    portfolios = pool.run_strategies(execute_date)
+
+    output_dir = os.path.join(project_root, "reports", national, execute_date.strftime("%Y-%m-%d"))
+    reports = render_reports(portfolios, output_dir)
+    print(f"{len(reports)} reports: {os.path.join(output_dir, 'index.html')}")
@@ -17,9 +17,7 @@ print("sys.path:", sys.path)
 
 # 모듈 불러오기 테스트
 try:
-    from modules.utils import read_config, create_strategy, create_symbol_mapper
-    from modules.strategy.utils import retrieve_selected_stocks
-    from modules.strategy.strategy_pool import StrategyPool
+    from modules.strategy.markets import run_markets
     from modules.logger import get_logger, setup_global_logging
     from modules.db.strategy_pool_db import StrategyDBConnector
     print("Modules imported successfully!")
@@ -41,53 +39,34 @@ if __name__ == "__main__":
 
     logger.info("Starting script")
 
-    national = "kor"
-
-    config_file_list = glob.glob(f"../configs/strategies/{national}/*.yaml")
-    configs = [read_config(config_file) for config_file in config_file_list]
-    strategies = [create_strategy(config) for config in configs]
-
-    symbol_mapper = create_symbol_mapper(configs)
-    n_of_strategies = len(strategies)
-
-    pool = StrategyPool(strategies, "aggressive")  # 위험선호형
-    r = pool.execute()
-
-    r1_result = retrieve_selected_stocks(r, symbol_mapper)
-    r1_result['n_of_strategies'] = n_of_strategies   # 검토한 전략의 수
-    r1_result['national'] = national.upper()         # 투자 국가
-    r1_result['invest_type'] = "공격투자형"          # 투자 유형
-
-    print(r1_result)
-    
-    db_address = 'project-db-campus.smhrd.com'
-    user_id = 'InvestGenius'
-    pw = '12345'
-    db_name = 'InvestGenius'
-    port = 3307
-
-    db = StrategyDBConnector()
-    db.insert_strategy_result(r1_result)
-    db.close()
-
-    pool2 = StrategyPool(strategies, "conservative")
-    r2 = pool2.execute()
-    r2_result = retrieve_selected_stocks(r2, symbol_mapper)
-    r2_result['n_of_strategies'] = n_of_strategies   # 검토한 전략의 수
-    r2_result['national'] = national.upper()         # 투자 국가
-    r2_result['invest_type'] = "방어투자형"           # 투자 유형
-
-    db = StrategyDBConnector()
-    db.insert_strategy_result(r2_result)
-    db.close()
-
-    pool3 = StrategyPool(strategies)  # 위험회피형
-    r3 = pool3.execute()
-    r3_result = retrieve_selected_stocks(r3, symbol_mapper)
-    r3_result['n_of_strategies'] = n_of_strategies   # 검토한 전략의 수
-    r3_result['national'] = national.upper()         # 투자 국가
-    r3_result['invest_type'] = "중립투자형"           # 투자 유형
+    # 여러 국가를 한 프로세스에서 평가 (ex: python run_strategies.py kor usa)
+    nationals = sys.argv[1:] or ["kor"]
+
+    # 전략 평가는 국가별로 한 번만 하고 투자 유형별로 선택만 다시 함
+    invest_types = {
+        "aggressive": "공격투자형",    # 위험선호형
+        "conservative": "방어투자형",
+        "balanced": "중립투자형",      # 위험회피형
+    }
+    market_configs = {
+        national: sorted(glob.glob(os.path.join(project_root, "configs", "strategies", national, "*.yaml")))
+        for national in nationals
+    }
+    market_results = run_markets(
+        market_configs,
+        list(invest_types),
+        store_root=os.path.join(project_root, "data", "pool_results"),
+        cache_dir=os.path.join(project_root, "data", "indicator_cache"),
+    )
 
     db = StrategyDBConnector()
-    db.insert_strategy_result(r3_result)
+    for national, pool_results in market_results.items():
+        for preference, invest_type in invest_types.items():
+            result = pool_results[preference]
+            if isinstance(result, str):
+                logger.warning(f"{national} {preference}: {result}")
+                continue
+            result['invest_type'] = invest_type           # 투자 유형
+            print(result)
+            db.insert_strategy_result(result)
     db.close()
@@ -0,0 +1,55 @@
+import os
+import sys
+import glob
+import logging
+import threading
+from flask import Flask
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+sys.path.append(project_root)
+
+from modules.algo.cache import IndicatorCache
+from modules.routes.strategy import strategy_bp
+from modules.strategy.service import StrategyService
+from modules.logger import get_logger, setup_global_logging
+
+# 로거 설정
+logger = get_logger(__name__)
+
+NATIONALS = ["kor"]
+REFRESH_INTERVAL = int(os.getenv("STRATEGY_REFRESH_INTERVAL", 600))  # 초
+
+app = Flask(__name__)
+app.register_blueprint(strategy_bp)
+
+
+if __name__ == "__main__":
+    # 전역 로깅 설정
+    setup_global_logging(
+        log_dir=os.path.join(project_root, "logs"),
+        log_level=logging.WARNING,
+        file_level=logging.DEBUG,
+        stream_level=logging.INFO,
+    )
+
+    # 지표 결과를 디스크에도 저장해 재시작 후에도 재사용
+    IndicatorCache.configure(disk_path=os.path.join(project_root, "data", "indicator_cache"))
+
+    strategy_service = StrategyService.get_instance()
+
+    # 시작할 때 한 번만 데이터를 읽고 이후에는 새 거래일만 반영
+    for national in NATIONALS:
+        config_files = sorted(
+            glob.glob(os.path.join(project_root, "configs", "strategies", national, "*.yaml"))
+        )
+        strategy_service.load_configs(national, config_files, update=True)
+
+    stop_event = threading.Event()
+    strategy_service.start_refresh(REFRESH_INTERVAL, stop_event)
+    try:
+        # 로컬에서만 접근
+        app.run(host="127.0.0.1", port=int(os.getenv("STRATEGY_SERVICE_PORT", 30001)))
+    finally:
+        stop_event.set()
+        strategy_service.close()
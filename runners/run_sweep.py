@@ -0,0 +1,58 @@
+import os
+import sys
+import logging
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+sys.path.append(project_root)
+
+from modules.utils import (
+    read_config,
+    create_pipelines,
+    get_calendar_for,
+    parallel_process,
+    prepare_data,
+    read_data,
+)
+from modules.strategy.sweep import ParameterSweep, expand_grid, load_results
+from modules.logger import get_logger, setup_global_logging
+
+# 로거 설정
+logger = get_logger(__name__)
+
+# 탐색할 파라미터 grid (configs/strategies 의 YAML 과 같은 구조)
+PARAM_GRID = {
+    "strategy": {
+        "train_period": [120, 240, 480, 720, 1200],
+        "valid_period": [20, 60],
+        "selection_method": ["top_n", "threshold", "relative"],
+    },
+    "algorithm": {
+        "window": [5, 10, 20, 60],
+    },
+}
+
+
+if __name__ == "__main__":
+    # 전역 로깅 설정
+    setup_global_logging(
+        log_dir=os.path.join(project_root, "logs"),
+        log_level=logging.INFO,
+        file_level=logging.DEBUG,
+        stream_level=logging.INFO,
+    )
+
+    national = "kor"
+    config = read_config(
+        os.path.join(project_root, "configs", "strategies", national, "momentum_kor_1.yaml")
+    )
+    dps = create_pipelines(config)
+    data = prepare_data(parallel_process(read_data, dps), calendar=get_calendar_for(dps))
+
+    output_path = os.path.join(project_root, "data", "sweeps", f"momentum_{national}.jsonl")
+    sweep = ParameterSweep(data, config, output_path, rebalance="M")
+    for record in sweep.run(expand_grid(PARAM_GRID)):
+        logger.debug(record)
+
+    results = load_results(output_path)
+    print(results.sort_values("performance.sharpe_ratio", ascending=False).head(20))